@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,14 +14,88 @@ class Settings(BaseSettings):
 
     TEMP_DIR: str = "/tmp/biasbuster_uploads"
     MAX_CSV_SIZE_BYTES: int = 50 * 1024 * 1024
+    MAX_MODEL_SIZE_BYTES: int = 1024 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024  # streamed to disk in these pieces
+    CSV_CHUNK_ROWS: int = 100_000  # rows per chunk when validating/converting
+    # uploads are stored once per content hash; unreferenced files older
+    # than this are removed by the upload garbage collector
+    UPLOAD_GC_GRACE_SECONDS: int = 3600
 
     MIN_GROUP_SIZE: int = 30
     MIN_GROUP_PROPORTION: float = 0.05  # 5%
     PREDICTION_SKEW_THRESHOLD: float = 0.95
-    
+
+    # evaluate_bias violation thresholds
+    DPD_THRESHOLD: float = 0.10
+    EOD_THRESHOLD: float = 0.10
+    DIR_THRESHOLD: float = 0.80
+
     ENABLE_BOOTSTRAP_CI: bool = True
-    BOOTSTRAP_SAMPLES: int = 100
+    BOOTSTRAP_SAMPLES: int = 1000
+    BOOTSTRAP_CONFIDENCE: float = 95
+    BOOTSTRAP_SEED: Optional[int] = None  # fixed seed -> reproducible CIs
+    BOOTSTRAP_BATCH_SIZE: int = 1000  # replicates drawn per vectorized batch
+    # cap on replicates x groups x 4 cells per batch (~8 bytes each); many
+    # groups (intersectional subgroups) mean smaller batches
+    BOOTSTRAP_MAX_BATCH_CELLS: int = 4_000_000
+    BOOTSTRAP_WORKERS: int = 1  # >1 splits batches across processes
+
+    # CPU-bound audit/upload work runs in this pool, off the event loop.
+    # "thread" suits GIL-releasing pandas/numpy work, "process" isolates
+    # predict + metrics completely.
+    WORKER_POOL_KIND: str = "thread"
+    WORKER_POOL_SIZE: int = 4
+    WORKER_MAX_CONCURRENT_TASKS: int = 4
+    WORKER_MAX_QUEUED_TASKS: int = 16  # beyond this requests get 503
+
+    # background audit jobs (POST /api/bias/jobs)
+    JOB_WORKERS: int = 2
+    JOB_QUEUE_MAX_SIZE: int = 100
+    JOB_PROGRESS_POLL_SECONDS: float = 0.25
+
+    # audit result cache: in-process LRU in front of a database tier
+    ENABLE_AUDIT_CACHE: bool = True
+    AUDIT_CACHE_MEMORY_MAX_BYTES: int = 64 * 1024 * 1024
+    AUDIT_CACHE_DB_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # per-upload y_pred (+ predict_proba scores) stored as .npy files
+    ENABLE_PREDICTION_CACHE: bool = True
+    # scores cost a second predict_proba pass on every audit; when off they
+    # are computed (and cached) the first time a threshold sweep needs them
+    CACHE_PREDICTION_SCORES: bool = False
+
+    # in-process model cache (joblib artifacts), budgeted by size on disk
+    MODEL_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    MODEL_MMAP_MODE: Optional[str] = "r"  # None disables memory-mapped loading
+    MODEL_CACHE_WARMUP_COUNT: int = 0  # recent models preloaded at startup
+
+    # datasets at least this large are audited chunk by chunk (out-of-core)
+    OUT_OF_CORE_THRESHOLD_BYTES: int = 1024 * 1024 * 1024
+    OUT_OF_CORE_CHUNK_ROWS: int = 250_000
+
+    # intersectional audits (sex x race x age_group, ...)
+    INTERSECTIONAL_TOP_K: int = 10  # most disadvantaged subgroups reported
+    INTERSECTIONAL_MAX_SUBGROUPS: int = 1_000_000  # product of group counts
+
+    # batch audits: one dataset, many candidate models
+    BATCH_MAX_MODELS: int = 30
+    BATCH_PREDICT_WORKERS: int = 1  # >1 predicts models in parallel processes
+
+    # model inference runs over row blocks; >1 worker spreads the blocks
+    # over "process" (forked, sharing the loaded model) or "thread" workers
+    PREDICT_BLOCK_ROWS: int = 100_000
+    PREDICT_WORKERS: int = 1
+    PREDICT_POOL_KIND: str = "process"
+
+    # bias mitigation (ThresholdOptimizer / ExponentiatedGradient)
+    MITIGATION_WORKERS: int = 1  # >1 fits constraints in parallel processes
+    MITIGATION_SEED: Optional[int] = 0  # randomized mitigated predictions + split
+    # share of rows held out (stratified by target) to report before/after
+    # metrics on; 0 fits and reports on all rows (in-sample)
+    MITIGATION_TEST_SIZE: float = 0.3
 
+    # per-stage wall/CPU/RSS timings in audit responses + Server-Timing header
+    ENABLE_PROFILING: bool = True
 
     model_config = {"env_file": Path.cwd() / ".env"}
 
@@ -1,4 +1,5 @@
 from typing import AsyncGenerator
+from sqlalchemy import inspect, literal
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
@@ -10,6 +11,40 @@ AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=F
 Base = declarative_base()
 
 
+def upgrade_schema(sync_conn):
+    """
+    Idempotent schema upgrade for databases created by an older version:
+    create_all only creates missing tables, so columns (and their indexes)
+    added to existing tables since are added here with ALTER TABLE.
+    Run after create_all, through AsyncConnection.run_sync.
+    """
+    inspector = inspect(sync_conn)
+    dialect = sync_conn.dialect
+    preparer = dialect.identifier_preparer
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = (
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=dialect)}"
+            )
+            # existing rows get the column default (new columns stay nullable)
+            if column.default is not None and column.default.is_scalar:
+                value = literal(column.default.arg, column.type)
+                ddl += f" DEFAULT {value.compile(dialect=dialect, compile_kwargs={'literal_binds': True})}"
+            sync_conn.exec_driver_sql(ddl)
+
+        indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(sync_conn)
+
+
 # dependency for routes
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
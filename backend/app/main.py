@@ -1,17 +1,45 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from .db import engine
+from .db import engine, AsyncSessionLocal, upgrade_schema
+from .services.executor import shutdown_executor, worker_pool_stats
+from .services.jobs import start_job_workers, stop_job_workers
+from .services.audit_cache import purge_stale_audit_cache
+from .services.model_warmup import warm_model_cache
+from .services.storage import collect_garbage
+from .services.metrics import observe_request, render_metrics
+from .utils.model_loader import model_cache_stats
 from . import models
 from .routers.upload import router as upload_router
 from .routers.bias import router as bias_router
+from .routers.mitigation import router as mitigation_router
+from .routers.monitoring import router as monitoring_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup: create DB tables
     async with engine.begin() as conn:
         await conn.run_sync(models.Base.metadata.create_all)
+        # startup: add columns introduced since the database was created
+        await conn.run_sync(upgrade_schema)
+    # startup: drop cached audits computed under different thresholds
+    async with AsyncSessionLocal() as session:
+        await purge_stale_audit_cache(session)
+        # startup: remove uploads nothing references any more
+        await collect_garbage(session)
+    # startup: background audit job workers
+    await start_job_workers()
+    # startup: preload recently used models in the background
+    warmup = asyncio.create_task(warm_model_cache())
     yield
+    # shutdown: stop warm-up and job workers, then the CPU worker pool
+    warmup.cancel()
+    await asyncio.gather(warmup, return_exceptions=True)
+    await stop_job_workers()
+    shutdown_executor()
 
 
 app = FastAPI(title="BiasBuster API", lifespan=lifespan)
@@ -22,14 +50,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # label by route template (/api/bias/audits/{state_id}), not raw path
+    route = request.scope.get("route")
+    observe_request(
+        request.method,
+        route.path if route is not None else "unmatched",
+        response.status_code,
+        time.perf_counter() - started,
+    )
+    return response
+
+
 # routers
 app.include_router(upload_router)
 app.include_router(bias_router)
+app.include_router(mitigation_router)
+app.include_router(monitoring_router)
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "worker_pool": worker_pool_stats(),
+        "model_cache": model_cache_stats(),
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,4 +1,17 @@
-from .models import UploadRecord  # adjust filename if different
+from .models import UploadRecord, StoredFile  # adjust filename if different
+from .bias import AuditJob, AuditCacheEntry, AuditState, MitigatedModel
+from .monitoring import PredictionLog, MonitoringRun, MonitoringWindow
 from ..db import Base
 
-__all__ = ["UploadRecord", "Base"]
+__all__ = [
+    "UploadRecord",
+    "StoredFile",
+    "AuditJob",
+    "AuditCacheEntry",
+    "AuditState",
+    "MitigatedModel",
+    "PredictionLog",
+    "MonitoringRun",
+    "MonitoringWindow",
+    "Base",
+]
@@ -0,0 +1,79 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Float, ForeignKey
+from sqlalchemy.sql import func
+from ..db import Base
+
+
+class AuditJob(Base):
+    __tablename__ = "audit_jobs"
+
+    id = Column(String(32), primary_key=True, index=True)  # uuid4 hex
+    upload_id = Column(Integer, ForeignKey("upload_records.id"), nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued")  # queued|running|succeeded|failed
+    request = Column(JSON, nullable=False)
+    current_step = Column(Integer, default=0)
+    step_name = Column(String)
+    progress = Column(Float, default=0.0)
+    result = Column(JSON)
+    error = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+
+class AuditCacheEntry(Base):
+    __tablename__ = "audit_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 of the cache key payload
+    dataset_sha256 = Column(String(64), index=True)
+    model_sha256 = Column(String(64), index=True)
+    settings_fingerprint = Column(String(64), index=True)
+    result = Column(JSON, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_accessed_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class AuditState(Base):
+    """Per-group sufficient statistics of an audit, so appended rows can be
+    folded in without re-reading the full history."""
+
+    __tablename__ = "audit_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(Integer, ForeignKey("upload_records.id"), nullable=False, index=True)
+    request_key = Column(String(64), nullable=False, index=True)  # sha256 of the request
+    target_column = Column(String, nullable=False)
+    sensitive_columns = Column(JSON, nullable=False)
+    target_info = Column(JSON, nullable=False)  # includes the target classes
+    sensitive_info = Column(JSON, nullable=False)
+    dataset_health = Column(JSON)  # of the original upload
+    group_tables = Column(JSON, nullable=False)  # column -> {labels, counts [[tn, fp, fn, tp]]}
+    intersectional_table = Column(JSON)  # observed subgroups of intersectional audits
+    total_rows = Column(Integer, nullable=False)
+    predicted_positives = Column(Integer, nullable=False)
+    appended_rows = Column(Integer, default=0)
+    append_count = Column(Integer, default=0)
+    version = Column(Integer, nullable=False, default=0)  # bumped by every append
+    result = Column(JSON)  # latest audit result
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class MitigatedModel(Base):
+    __tablename__ = "mitigated_models"
+
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(Integer, ForeignKey("upload_records.id"), nullable=False, index=True)
+    method = Column(String, nullable=False)  # threshold_optimizer|exponentiated_gradient
+    constraint = Column(String, nullable=False)
+    objective = Column(String)
+    target_column = Column(String, nullable=False)
+    sensitive_columns = Column(JSON, nullable=False)  # as passed to predict()
+    sensitive_bins = Column(JSON)  # fitted bins producing the binned columns' labels
+    model_filename = Column(String, nullable=False)
+    model_sha256 = Column(String(64), index=True)
+    metrics_before = Column(JSON)
+    metrics_after = Column(JSON)
+    evaluation = Column(JSON)  # rows the metrics were computed on
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, JSON, Boolean, UniqueConstraint
 from sqlalchemy.sql import func
 from ..db import Base
 
@@ -12,6 +12,30 @@ class UploadRecord(Base):
     dataset_rows = Column(Integer)
     dataset_columns = Column(Integer)
     dataset_columns_list = Column(JSON)
+    dataset_dtypes = Column(JSON)  # column -> pandas dtype inferred at upload
+    dataset_health = Column(JSON)  # DatasetProfiler result (health + column profiles)
+    dataset_columnar_filename = Column(String)  # Parquet copy, None if CSV-only
     model_type = Column(String)
     model_supports_predict_proba = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    dataset_sha256 = Column(String(64), index=True)
+    model_sha256 = Column(String(64), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class StoredFile(Base):
+    """An uploaded dataset or model stored once per content hash, with the
+    validation result reused by identical uploads and a reference count of
+    the upload records pointing at it."""
+
+    __tablename__ = "stored_files"
+    __table_args__ = (UniqueConstraint("kind", "sha256"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # dataset|model
+    sha256 = Column(String(64), nullable=False, index=True)
+    filename = Column(String, nullable=False)  # <sha256><ext>
+    size_bytes = Column(BigInteger)  # uploads can exceed 2 GiB
+    info = Column(JSON)  # summarize_csv_file / describe_model_file result
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Float, Boolean, ForeignKey
+from sqlalchemy.sql import func
+from ..db import Base
+
+
+class PredictionLog(Base):
+    """Scored prediction log (timestamp, sensitive columns, label, prediction)."""
+
+    __tablename__ = "prediction_logs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(Integer, ForeignKey("upload_records.id"), index=True)  # monitored model
+    filename = Column(String, nullable=False)  # stored beside uploaded datasets
+    columnar_filename = Column(String)
+    rows = Column(Integer)
+    column_names = Column(JSON)
+    dtypes = Column(JSON)
+    sha256 = Column(String(64), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MonitoringRun(Base):
+    __tablename__ = "monitoring_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    log_id = Column(Integer, ForeignKey("prediction_logs.id"), nullable=False, index=True)
+    request = Column(JSON, nullable=False)
+    window_count = Column(Integer, default=0)
+    alert_count = Column(Integer, default=0)
+    dropped_rows = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MonitoringWindow(Base):
+    """One time window x sensitive attribute of a monitoring run."""
+
+    __tablename__ = "monitoring_windows"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("monitoring_runs.id"), nullable=False, index=True)
+    sensitive_column = Column(String, nullable=False)
+    window_start = Column(DateTime(timezone=True), nullable=False, index=True)
+    window_end = Column(DateTime(timezone=True), nullable=False)
+    rows = Column(Integer, nullable=False)
+    positive_rate = Column(Float)
+    accuracy = Column(Float)
+    dpd = Column(Float)
+    eod = Column(Float)
+    dir = Column(Float)
+    severity_score = Column(Float)
+    alert = Column(Boolean, default=False, index=True)
+    violations = Column(JSON)
+    selection_rate = Column(JSON)  # group -> rate
+    group_counts = Column(JSON)  # group -> rows
+    groups_skipped = Column(Integer, default=0)  # groups below MIN_GROUP_SIZE
@@ -1,8 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_session
-from app.schemas.bias import BiasDetectRequest
-from app.services.bias_service import run_bias_detection
+from app.schemas.bias import (
+    BatchBiasDetectRequest,
+    BiasDetectRequest,
+    ThresholdSweepRequest,
+    AuditJobOut,
+    AuditJobSubmitted,
+)
+from app.services.bias_service import (
+    run_batch_bias_detection,
+    run_bias_detection,
+    run_threshold_sweep,
+)
+from app.services.audit_state import get_audit_state
+from app.services.executor import WorkerPoolBusyError
+from app.services.incremental_audit import append_to_audit
+from app.services.jobs import JobQueueFullError, get_audit_job, submit_audit_job
+from app.utils.profiling import server_timing_header
 
 router = APIRouter(prefix="/api/bias", tags=["Bias Detection"])
 
@@ -10,12 +25,126 @@ router = APIRouter(prefix="/api/bias", tags=["Bias Detection"])
 @router.post("/detect")
 async def detect_bias(
     payload: BiasDetectRequest,
+    response: Response,
     session: AsyncSession = Depends(get_session),
 ):
     try:
         result = await run_bias_detection(payload, session)
+        if "timings" in result:
+            response.headers["Server-Timing"] = server_timing_header(result["timings"])
         return result
+    except WorkerPoolBusyError as busy:
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Bias detection failed: {e}")
+
+
+@router.post("/detect/batch")
+async def detect_bias_batch(
+    payload: BatchBiasDetectRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        return await run_batch_bias_detection(payload, session)
+    except WorkerPoolBusyError as busy:
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch bias detection failed: {e}")
+
+
+@router.post("/thresholds")
+async def sweep_thresholds(
+    payload: ThresholdSweepRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        return await run_threshold_sweep(payload, session)
+    except WorkerPoolBusyError as busy:
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Threshold analysis failed: {e}")
+
+
+@router.get("/audits/{state_id}")
+async def get_bias_audit_state(
+    state_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    state = await get_audit_state(state_id, session)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Audit not found")
+    return {
+        "audit_state_id": state.id,
+        "upload_id": state.upload_id,
+        "total_rows": state.total_rows,
+        "appended_rows": state.appended_rows,
+        "append_count": state.append_count,
+        "updated_at": state.updated_at,
+        "result": state.result,
+    }
+
+
+@router.post("/audits/{state_id}/append")
+async def append_bias_audit(
+    state_id: int,
+    rows_file: UploadFile = File(...),
+    session: AsyncSession = Depends(get_session),
+):
+    state = await get_audit_state(state_id, session)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Audit not found")
+
+    try:
+        return await append_to_audit(state, rows_file, session)
+    except WorkerPoolBusyError as busy:
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Incremental audit failed: {e}")
+
+
+@router.post("/jobs", status_code=202, response_model=AuditJobSubmitted)
+async def submit_bias_job(
+    payload: BiasDetectRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        job = await submit_audit_job(payload, session)
+    except JobQueueFullError as full:
+        raise HTTPException(
+            status_code=503, detail=str(full), headers={"Retry-After": "30"}
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"{router.prefix}/jobs/{job.id}",
+    }
+
+
+@router.get("/jobs/{job_id}", response_model=AuditJobOut)
+async def get_bias_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_session),
+):
+    job = await get_audit_job(job_id, session)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Audit job not found")
+    return job
@@ -0,0 +1,62 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_session
+from app.schemas.mitigation import MitigatedModelOut, MitigationRequest
+from app.services.executor import WorkerPoolBusyError
+from app.services.mitigation_service import (
+    get_mitigated_model,
+    list_mitigated_models,
+    run_mitigation,
+)
+from app.utils.model_loader import MODEL_DIR
+
+router = APIRouter(prefix="/api/mitigation", tags=["Bias Mitigation"])
+
+
+@router.post("")
+async def mitigate_bias(
+    payload: MitigationRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        return await run_mitigation(payload, session)
+    except WorkerPoolBusyError as busy:
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bias mitigation failed: {e}")
+
+
+@router.get("/{upload_id}", response_model=List[MitigatedModelOut])
+async def get_mitigated_models(
+    upload_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    return await list_mitigated_models(upload_id, session)
+
+
+@router.get("/models/{model_id}/download")
+async def download_mitigated_model(
+    model_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    mitigated = await get_mitigated_model(model_id, session)
+    if mitigated is None:
+        raise HTTPException(status_code=404, detail="Mitigated model not found")
+
+    path = MODEL_DIR / mitigated.model_filename
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Mitigated model file is missing")
+
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        filename=f"mitigated_{mitigated.id}_{mitigated.constraint}.joblib",
+    )
@@ -0,0 +1,71 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_session
+from app.schemas.monitoring import MonitoringRequest
+from app.services.executor import WorkerPoolBusyError
+from app.services.monitoring_service import (
+    get_monitoring_run,
+    run_monitoring,
+    store_prediction_log,
+)
+
+router = APIRouter(prefix="/api/monitoring", tags=["Fairness Monitoring"])
+
+
+@router.post("/logs")
+async def upload_prediction_log(
+    log_file: UploadFile = File(...),
+    upload_id: Optional[int] = Form(None),
+    session: AsyncSession = Depends(get_session),
+):
+    if not log_file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Prediction log must be a .csv file")
+
+    try:
+        log = await store_prediction_log(log_file, upload_id, session)
+    except WorkerPoolBusyError as busy:
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    return {
+        "status": "success",
+        "log_id": log.id,
+        "rows": log.rows,
+        "column_names": log.column_names,
+        "next_step": "run_monitoring",
+    }
+
+
+@router.post("/runs")
+async def create_monitoring_run(
+    payload: MonitoringRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        return await run_monitoring(payload, session)
+    except WorkerPoolBusyError as busy:
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Monitoring failed: {e}")
+
+
+@router.get("/runs/{run_id}")
+async def get_monitoring_run_windows(
+    run_id: int,
+    alerts_only: bool = False,
+    session: AsyncSession = Depends(get_session),
+):
+    run = await get_monitoring_run(run_id, alerts_only, session)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Monitoring run not found")
+    return run
@@ -1,57 +1,100 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Any
+from typing import Any, List
 from pathlib import Path
-from ..utils.file_validation import save_upload_file, validate_csv_file
-from ..utils.model_validation import safe_load_model_from_path
+from ..utils.file_validation import store_upload_file, summarize_csv_file
+from ..utils.model_validation import describe_model_file
+from ..services.executor import WorkerPoolBusyError
+from ..services.storage import acquire_file, delete_upload, discard_untracked, release_file
+from ..services.metrics import observe_stages
+from ..utils.profiling import StageProfiler, server_timing_header
 from ..db import get_session
+from ..config import settings
 from app.models.models import UploadRecord
 
 router = APIRouter(prefix="/api")
 
+
+async def _discard(session: AsyncSession, acquired: list, *stored):
+    # undo the references a failed upload took; files that were never
+    # validated go right away, shared ones stay with their other uploads
+    for kind, filename, refs in acquired:
+        await release_file(session, kind, filename, refs)
+    for kind, path in stored:
+        await discard_untracked(session, kind, path)
+
+
+def _check_extensions(dataset_file: UploadFile, model_files: list[UploadFile]):
+    if Path(dataset_file.filename).suffix.lower() != ".csv":
+        raise HTTPException(status_code=400, detail="Dataset must be a .csv file")
+    for model_file in model_files:
+        if Path(model_file.filename).suffix.lower() not in {".pkl", ".joblib"}:
+            raise HTTPException(status_code=400, detail="Model must be a .pkl or .joblib file")
+
+
 @router.post("/upload", response_model=Any)
 async def upload_files(
     dataset_file: UploadFile = File(...),
     model_file: UploadFile = File(...),
     session: AsyncSession = Depends(get_session),
 ):
-    ds_ext = Path(dataset_file.filename).suffix.lower()
-    md_ext = Path(model_file.filename).suffix.lower()
-
-    if ds_ext != ".csv":
-        raise HTTPException(status_code=400, detail="Dataset must be a .csv file")
-    if md_ext not in {".pkl", ".joblib"}:
-        raise HTTPException(status_code=400, detail="Model must be a .pkl or .joblib file")
+    _check_extensions(dataset_file, [model_file])
+    profiler = StageProfiler()
+    stored, acquired = [], []
 
     try:
-        ds_path = await save_upload_file(dataset_file, subdir="datasets")
-        md_path = await save_upload_file(model_file, subdir="models")
+        # hashed while streaming; identical content is stored only once
+        profiler.mark("save")
+        ds_path, dataset_sha256 = await store_upload_file(
+            dataset_file, subdir="datasets", max_bytes=settings.MAX_CSV_SIZE_BYTES
+        )
+        stored.append(("dataset", ds_path))
+        md_path, model_sha256 = await store_upload_file(
+            model_file, subdir="models", max_bytes=settings.MAX_MODEL_SIZE_BYTES
+        )
+        stored.append(("model", md_path))
+
+        # validation results are reused for content validated before
+        profiler.mark("validate_dataset")
+        dataset_info = await acquire_file(
+            session, "dataset", ds_path, dataset_sha256, summarize_csv_file
+        )
+        acquired.append(("dataset", ds_path.name, 1))
+        profiler.mark("validate_model")
+        model_info = await acquire_file(
+            session, "model", md_path, model_sha256, describe_model_file, model_sha256
+        )
+        acquired.append(("model", md_path.name, 1))
 
-        df, _ = await validate_csv_file(ds_path)
-        model_info = safe_load_model_from_path(md_path)
+    except WorkerPoolBusyError as busy:
+        await _discard(session, acquired, *stored)
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
 
     except ValueError as ve:
-        for p in (locals().get("ds_path"), locals().get("md_path")):
-            try:
-                if p and Path(p).exists():
-                    Path(p).unlink()
-            except:
-                pass
+        await _discard(session, acquired, *stored)
         raise HTTPException(status_code=400, detail=str(ve))
 
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {exc}")
 
+    profiler.mark("db")
     # FIXED HERE ↓ store Boolean, no str() wrapping
     record = UploadRecord(
         dataset_filename = ds_path.name,
         model_filename = md_path.name,
-        dataset_rows = int(df.shape[0]),
-        dataset_columns = int(df.shape[1]),
-        dataset_columns_list = df.columns.astype(str).tolist(),
+        dataset_rows = dataset_info["rows"],
+        dataset_columns = dataset_info["columns"],
+        dataset_columns_list = dataset_info["column_names"],
+        dataset_dtypes = dataset_info["dtypes"],
+        dataset_health = dataset_info["health"],
+        dataset_columnar_filename = dataset_info["columnar_filename"],
         model_type = model_info["model_type"],
         model_supports_predict_proba = bool(model_info["supports_proba"]),  # ✔ Boolean
+        dataset_sha256 = dataset_sha256,
+        model_sha256 = model_sha256,
     )
 
     session.add(record)
@@ -61,9 +104,9 @@ async def upload_files(
     success = {
         "status": "success",
         "dataset_info": {
-            "rows": df.shape[0],
-            "columns": df.shape[1],
-            "column_names": df.columns.tolist(),
+            "rows": dataset_info["rows"],
+            "columns": dataset_info["columns"],
+            "column_names": dataset_info["column_names"],
         },
         "model_info": {
             "model_type": model_info["model_type"],
@@ -72,4 +115,134 @@ async def upload_files(
         "next_step": "select_sensitive_attribute",
     }
 
+    headers = None
+    if settings.ENABLE_PROFILING:
+        timings = profiler.report()
+        observe_stages("upload", timings)
+        headers = {"Server-Timing": server_timing_header(timings)}
+
+    return JSONResponse(content=success, headers=headers)
+
+
+@router.post("/upload/batch", response_model=Any)
+async def upload_batch(
+    dataset_file: UploadFile = File(...),
+    model_files: List[UploadFile] = File(...),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    One dataset, many candidate models: the CSV is stored and validated once
+    and every model gets its own upload record pointing at it (and its own
+    reference to the stored dataset).
+    """
+    if len(model_files) > settings.BATCH_MAX_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_MAX_MODELS} models per batch upload",
+        )
+    _check_extensions(dataset_file, model_files)
+
+    stored, acquired = [], []
+    try:
+        ds_path, dataset_sha256 = await store_upload_file(
+            dataset_file, subdir="datasets", max_bytes=settings.MAX_CSV_SIZE_BYTES
+        )
+        stored.append(("dataset", ds_path))
+        # one reference per upload record created below
+        dataset_info = await acquire_file(
+            session, "dataset", ds_path, dataset_sha256, summarize_csv_file,
+            refs=len(model_files),
+        )
+        acquired.append(("dataset", ds_path.name, len(model_files)))
+
+        models = []
+        for model_file in model_files:
+            md_path, model_sha256 = await store_upload_file(
+                model_file, subdir="models", max_bytes=settings.MAX_MODEL_SIZE_BYTES
+            )
+            stored.append(("model", md_path))
+            try:
+                model_info = await acquire_file(
+                    session, "model", md_path, model_sha256, describe_model_file, model_sha256
+                )
+            except ValueError as ve:
+                raise ValueError(f"{model_file.filename}: {ve}")
+            acquired.append(("model", md_path.name, 1))
+            models.append((model_file.filename, md_path, model_sha256, model_info))
+
+    except WorkerPoolBusyError as busy:
+        await _discard(session, acquired, *stored)
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
+
+    except ValueError as ve:
+        await _discard(session, acquired, *stored)
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {exc}")
+
+    records = [
+        UploadRecord(
+            dataset_filename = ds_path.name,
+            model_filename = md_path.name,
+            dataset_rows = dataset_info["rows"],
+            dataset_columns = dataset_info["columns"],
+            dataset_columns_list = dataset_info["column_names"],
+            dataset_dtypes = dataset_info["dtypes"],
+            dataset_health = dataset_info["health"],
+            dataset_columnar_filename = dataset_info["columnar_filename"],
+            model_type = model_info["model_type"],
+            model_supports_predict_proba = bool(model_info["supports_proba"]),
+            dataset_sha256 = dataset_sha256,
+            model_sha256 = model_sha256,
+        )
+        for _, md_path, model_sha256, model_info in models
+    ]
+
+    session.add_all(records)
+    await session.commit()
+
+    success = {
+        "status": "success",
+        "dataset_info": {
+            "rows": dataset_info["rows"],
+            "columns": dataset_info["columns"],
+            "column_names": dataset_info["column_names"],
+        },
+        "models": [
+            {
+                "upload_id": record.id,
+                "filename": filename,
+                "model_type": model_info["model_type"],
+                "supports_predict_proba": model_info["supports_proba"],
+            }
+            for record, (filename, _, _, model_info) in zip(records, models)
+        ],
+        "next_step": "select_sensitive_attribute",
+    }
+
     return JSONResponse(content=success)
+
+
+@router.delete("/upload/{upload_id}", response_model=Any)
+async def remove_upload(upload_id: int, session: AsyncSession = Depends(get_session)):
+    """
+    Delete an upload with its audits and mitigated models. Its dataset and
+    model files are removed once no other upload references them.
+    """
+    record = await session.get(UploadRecord, upload_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Upload record not found")
+
+    try:
+        collected = await delete_upload(record, session)
+    except WorkerPoolBusyError as busy:
+        raise HTTPException(
+            status_code=503, detail=str(busy), headers={"Retry-After": "5"}
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    return {"status": "deleted", "upload_id": upload_id, "garbage_collected": collected}
@@ -1,5 +1,39 @@
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Literal, Optional
+from datetime import datetime
+
+
+class SensitiveBinning(BaseModel):
+    strategy: Literal["fixed", "quantile", "custom"] = Field(
+        "quantile",
+        description="fixed: equal-width bins over the observed range; "
+        "quantile: equal-frequency bins; custom: the given edges",
+    )
+    bins: int = Field(4, ge=1, le=100, description="Number of fixed/quantile bins")
+    edges: Optional[List[float]] = Field(
+        None, description="Increasing bin edges (custom); bins are right-closed"
+    )
+    labels: Optional[List[str]] = Field(None, description="One label per bin")
+
+    @model_validator(mode="after")
+    def check_edges(self):
+        if self.strategy == "custom":
+            if not self.edges or len(self.edges) < 2:
+                raise ValueError("custom binning needs at least two edges")
+            if any(b <= a for a, b in zip(self.edges, self.edges[1:])):
+                raise ValueError("bin edges must be strictly increasing")
+        elif self.edges is not None:
+            raise ValueError(f"edges are only used by custom binning, not {self.strategy}")
+        if self.labels is not None and len(self.labels) != len(set(self.labels)):
+            raise ValueError("bin labels must be unique")
+        return self
+
+
+SENSITIVE_BINS_FIELD = Field(
+    None,
+    description="Binning per numeric sensitive column, audited as <column>_group "
+    "(a numeric column named age is binned into age groups by default)",
+)
 
 
 class BiasDetectRequest(BaseModel):
@@ -8,3 +42,75 @@ class BiasDetectRequest(BaseModel):
     sensitive_columns: List[str] = Field(
         ..., description="List of sensitive attributes selected by user"
     )
+    out_of_core: Optional[bool] = Field(
+        None,
+        description="Stream the dataset in chunks; defaults to on for datasets "
+        "above OUT_OF_CORE_THRESHOLD_BYTES",
+    )
+    intersectional: bool = Field(
+        False,
+        description="Also audit subgroups formed by combining all sensitive columns",
+    )
+    sensitive_bins: Optional[Dict[str, SensitiveBinning]] = SENSITIVE_BINS_FIELD
+
+
+class BatchBiasDetectRequest(BaseModel):
+    upload_ids: List[int] = Field(
+        ..., min_length=1, description="UploadRecord IDs sharing one dataset"
+    )
+    target_column: str = Field(..., description="Target label column")
+    sensitive_columns: List[str] = Field(
+        ..., description="List of sensitive attributes selected by user"
+    )
+    out_of_core: Optional[bool] = Field(
+        None, description="See BiasDetectRequest.out_of_core"
+    )
+    intersectional: bool = Field(
+        False, description="See BiasDetectRequest.intersectional"
+    )
+    sensitive_bins: Optional[Dict[str, SensitiveBinning]] = SENSITIVE_BINS_FIELD
+
+    def member_request(self, upload_id: int) -> BiasDetectRequest:
+        return BiasDetectRequest(
+            upload_id=upload_id,
+            target_column=self.target_column,
+            sensitive_columns=self.sensitive_columns,
+            out_of_core=self.out_of_core,
+            intersectional=self.intersectional,
+            sensitive_bins=self.sensitive_bins,
+        )
+
+
+class ThresholdSweepRequest(BaseModel):
+    upload_id: int = Field(..., description="UploadRecord ID")
+    target_column: str = Field(..., description="Target label column")
+    sensitive_columns: List[str] = Field(
+        ..., description="List of sensitive attributes selected by user"
+    )
+    n_thresholds: int = Field(
+        101, ge=2, le=1000, description="Evenly spaced thresholds in [0, 1]"
+    )
+    sensitive_bins: Optional[Dict[str, SensitiveBinning]] = SENSITIVE_BINS_FIELD
+
+
+class AuditJobSubmitted(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+
+class AuditJobOut(BaseModel):
+    id: str
+    upload_id: int
+    status: str
+    current_step: Optional[int]
+    step_name: Optional[str]
+    progress: Optional[float]
+    request: Dict[str, Any]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    model_config = {"from_attributes": True}
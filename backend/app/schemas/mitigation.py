@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+from datetime import datetime
+
+from app.schemas.bias import SENSITIVE_BINS_FIELD, SensitiveBinning
+
+Constraint = Literal[
+    "demographic_parity",
+    "equalized_odds",
+    "true_positive_rate_parity",
+    "false_positive_rate_parity",
+]
+
+
+class MitigationRequest(BaseModel):
+    upload_id: int = Field(..., description="UploadRecord ID of the base model")
+    target_column: str = Field(..., description="Target label column")
+    sensitive_columns: List[str] = Field(
+        ..., min_length=1, description="Sensitive attributes to mitigate over"
+    )
+    constraints: List[Constraint] = Field(
+        ["demographic_parity", "equalized_odds", "true_positive_rate_parity"],
+        min_length=1,
+        description="One mitigated model is fitted per constraint",
+    )
+    objective: Literal["accuracy_score", "balanced_accuracy_score"] = Field(
+        "accuracy_score", description="ThresholdOptimizer objective"
+    )
+    include_reductions: bool = Field(
+        False,
+        description="Also refit the base model with ExponentiatedGradient "
+        "(slow: one full retraining per constraint)",
+    )
+    sensitive_bins: Optional[Dict[str, SensitiveBinning]] = SENSITIVE_BINS_FIELD
+
+
+class MitigatedModelOut(BaseModel):
+    id: int
+    upload_id: int
+    method: str
+    constraint: str
+    objective: Optional[str]
+    target_column: str
+    sensitive_columns: List[str]
+    sensitive_bins: Optional[Dict[str, Any]] = None
+    model_filename: str
+    metrics_before: Optional[Dict[str, Any]]
+    metrics_after: Optional[Dict[str, Any]]
+    evaluation: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime]
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+
+WindowUnit = Literal["hour", "day", "week"]
+
+
+class MonitoringRequest(BaseModel):
+    log_id: int = Field(..., description="PredictionLog ID")
+    timestamp_column: str = Field(..., description="When each prediction was made")
+    target_column: str = Field(..., description="Observed outcome column")
+    prediction_column: str = Field(..., description="Model prediction column")
+    sensitive_columns: List[str] = Field(..., min_length=1)
+    window: WindowUnit = Field("day", description="Window length")
+    step: Optional[WindowUnit] = Field(
+        None,
+        description="Distance between window starts; omitted or equal to "
+        "window gives tumbling windows, shorter gives sliding windows",
+    )
+
+    @model_validator(mode="after")
+    def check_step(self):
+        order = ["hour", "day", "week"]
+        if self.step is not None and order.index(self.step) > order.index(self.window):
+            raise ValueError("step must not be longer than window")
+        return self
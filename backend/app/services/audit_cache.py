@@ -0,0 +1,209 @@
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.bias import AuditCacheEntry
+from app.models.models import UploadRecord
+from app.schemas.bias import BiasDetectRequest
+from app.services.executor import run_in_worker
+from app.utils.file_hashing import file_sha256
+
+# Bump whenever the shape of the audit result changes so stale entries
+# are never served for the new code.
+AUDIT_RESULT_VERSION = 6
+
+# Settings that change the audit result; any change invalidates the cache.
+CACHE_RELEVANT_SETTINGS = (
+    "MIN_GROUP_SIZE",
+    "MIN_GROUP_PROPORTION",
+    "PREDICTION_SKEW_THRESHOLD",
+    "DPD_THRESHOLD",
+    "EOD_THRESHOLD",
+    "DIR_THRESHOLD",
+    "ENABLE_BOOTSTRAP_CI",
+    "BOOTSTRAP_SAMPLES",
+    "BOOTSTRAP_CONFIDENCE",
+    "BOOTSTRAP_SEED",
+    # seeded CIs depend on how replicates are split into batches
+    "BOOTSTRAP_BATCH_SIZE",
+    "BOOTSTRAP_MAX_BATCH_CELLS",
+    "INTERSECTIONAL_TOP_K",
+)
+
+DATASET_DIR = Path(settings.TEMP_DIR) / "datasets"
+MODEL_DIR = Path(settings.TEMP_DIR) / "models"
+
+# key -> serialized result; ordered from least to most recently used
+_memory: "OrderedDict[str, str]" = OrderedDict()
+_memory_bytes = 0
+
+
+def _sha256_json(obj) -> str:
+    blob = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def settings_fingerprint() -> str:
+    snapshot = {name: getattr(settings, name) for name in CACHE_RELEVANT_SETTINGS}
+    snapshot["result_version"] = AUDIT_RESULT_VERSION
+    return _sha256_json(snapshot)
+
+
+def normalize_request(payload: BiasDetectRequest) -> dict:
+    """
+    Request fields that affect the result. upload_id is left out on purpose:
+    the key is content-addressed, so identical files share cached results.
+    """
+    # out_of_core only changes how the result is computed, not the result
+    request = payload.model_dump(exclude={"upload_id", "out_of_core"})
+    request["sensitive_columns"] = list(dict.fromkeys(payload.sensitive_columns))
+    if not request.get("sensitive_bins"):
+        # same key as before binning was configurable
+        request.pop("sensitive_bins", None)
+    return request
+
+
+async def ensure_upload_hashes(record: UploadRecord, session: AsyncSession):
+    """Backfill content hashes for uploads stored before hashing existed."""
+    if record.dataset_sha256 and record.model_sha256:
+        return
+
+    if not record.dataset_sha256:
+        record.dataset_sha256 = await run_in_worker(
+            file_sha256, DATASET_DIR / record.dataset_filename
+        )
+    if not record.model_sha256:
+        record.model_sha256 = await run_in_worker(
+            file_sha256, MODEL_DIR / record.model_filename
+        )
+    await session.commit()
+
+
+def audit_cache_key(record: UploadRecord, payload: BiasDetectRequest) -> str:
+    return _sha256_json(
+        {
+            "dataset": record.dataset_sha256,
+            "model": record.model_sha256,
+            "request": normalize_request(payload),
+            "settings": settings_fingerprint(),
+        }
+    )
+
+
+def _memory_put(key: str, blob: str):
+    global _memory_bytes
+
+    if key in _memory:
+        _memory_bytes -= len(_memory.pop(key))
+
+    if len(blob) > settings.AUDIT_CACHE_MEMORY_MAX_BYTES:
+        return
+
+    _memory[key] = blob
+    _memory_bytes += len(blob)
+
+    while _memory_bytes > settings.AUDIT_CACHE_MEMORY_MAX_BYTES:
+        _, evicted = _memory.popitem(last=False)
+        _memory_bytes -= len(evicted)
+
+
+def _memory_get(key: str) -> str | None:
+    blob = _memory.get(key)
+    if blob is not None:
+        _memory.move_to_end(key)
+    return blob
+
+
+def clear_memory_cache():
+    global _memory_bytes
+    _memory.clear()
+    _memory_bytes = 0
+
+
+async def get_cached_audit(key: str, session: AsyncSession) -> dict | None:
+    blob = _memory_get(key)
+    if blob is not None:
+        return json.loads(blob)
+
+    entry = await session.get(AuditCacheEntry, key)
+    if entry is None:
+        return None
+
+    await session.execute(
+        update(AuditCacheEntry)
+        .where(AuditCacheEntry.key == key)
+        .values(
+            hit_count=AuditCacheEntry.hit_count + 1,
+            last_accessed_at=datetime.now(timezone.utc),
+        )
+    )
+    await session.commit()
+
+    _memory_put(key, json.dumps(entry.result))
+    return entry.result
+
+
+async def store_cached_audit(
+    key: str, record: UploadRecord, result: dict, session: AsyncSession
+):
+    blob = json.dumps(result)
+    _memory_put(key, blob)
+
+    if await session.get(AuditCacheEntry, key) is None:
+        session.add(
+            AuditCacheEntry(
+                key=key,
+                dataset_sha256=record.dataset_sha256,
+                model_sha256=record.model_sha256,
+                settings_fingerprint=settings_fingerprint(),
+                result=json.loads(blob),
+                size_bytes=len(blob),
+            )
+        )
+        await session.commit()
+
+    await _evict_database_tier(session)
+
+
+async def _evict_database_tier(session: AsyncSession):
+    total = (
+        await session.execute(select(func.coalesce(func.sum(AuditCacheEntry.size_bytes), 0)))
+    ).scalar_one()
+    if total <= settings.AUDIT_CACHE_DB_MAX_BYTES:
+        return
+
+    rows = (
+        await session.execute(
+            select(AuditCacheEntry.key, AuditCacheEntry.size_bytes).order_by(
+                AuditCacheEntry.last_accessed_at
+            )
+        )
+    ).all()
+
+    evict = []
+    for key, size in rows:
+        if total <= settings.AUDIT_CACHE_DB_MAX_BYTES:
+            break
+        evict.append(key)
+        total -= size
+
+    await session.execute(delete(AuditCacheEntry).where(AuditCacheEntry.key.in_(evict)))
+    await session.commit()
+
+
+async def purge_stale_audit_cache(session: AsyncSession) -> int:
+    """Drop persisted entries computed under different thresholds/settings."""
+    clear_memory_cache()
+    result = await session.execute(
+        delete(AuditCacheEntry).where(
+            AuditCacheEntry.settings_fingerprint != settings_fingerprint()
+        )
+    )
+    await session.commit()
+    return result.rowcount or 0
@@ -0,0 +1,94 @@
+import hashlib
+import json
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.bias import AuditState
+from app.models.models import UploadRecord
+from app.schemas.bias import BiasDetectRequest
+from app.services.audit_cache import normalize_request
+from app.utils.fairness_metrics import CONFUSION_CELLS
+
+# observed subgroup counts of intersectional audits (see subgroup_table):
+# kept with (cached) results so audit states can be appended to, but
+# never part of a response
+INTERSECTIONAL_TABLE = "intersectional_table"
+
+
+def audit_request_key(payload: BiasDetectRequest) -> str:
+    blob = json.dumps(normalize_request(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def public_result(result: dict) -> dict:
+    return {key: value for key, value in result.items() if key != INTERSECTIONAL_TABLE}
+
+
+def group_tables_from_result(result: dict) -> dict:
+    """Per-group [tn, fp, fn, tp] counts recovered from an audit result."""
+    return {
+        sensitive: {
+            "labels": list(audit["confusion_matrix"]),
+            "counts": [
+                [cells[c] for c in CONFUSION_CELLS]
+                for cells in audit["confusion_matrix"].values()
+            ],
+        }
+        for sensitive, audit in result["sensitive_audit"].items()
+    }
+
+
+async def get_audit_state(state_id: int, session: AsyncSession) -> AuditState | None:
+    return await session.get(AuditState, state_id)
+
+
+async def save_audit_state(
+    record: UploadRecord,
+    payload: BiasDetectRequest,
+    result: dict,
+    session: AsyncSession,
+) -> AuditState:
+    """
+    Persist the sufficient statistics of a full audit, once per upload and
+    request; an existing state (possibly with appended rows) is kept.
+    """
+    key = audit_request_key(payload)
+    state = (
+        await session.execute(
+            select(AuditState).where(
+                AuditState.upload_id == record.id, AuditState.request_key == key
+            )
+        )
+    ).scalar_one_or_none()
+    if state is not None:
+        if state.intersectional_table is None and not state.append_count:
+            # states stored before subgroup counts were kept
+            table = result.get(INTERSECTIONAL_TABLE)
+            if table is not None:
+                state.intersectional_table = table
+                await session.commit()
+        return state
+
+    group_tables = group_tables_from_result(result)
+    first = next(iter(group_tables.values()))
+
+    state = AuditState(
+        upload_id=record.id,
+        request_key=key,
+        target_column=payload.target_column,
+        sensitive_columns=list(dict.fromkeys(payload.sensitive_columns)),
+        target_info=result["target_info"],
+        sensitive_info=result["sensitive_attributes"],
+        dataset_health=result["dataset_health"],
+        group_tables=group_tables,
+        intersectional_table=result.get(INTERSECTIONAL_TABLE),
+        total_rows=sum(map(sum, first["counts"])),
+        predicted_positives=sum(fp + tp for _, fp, _, tp in first["counts"]),
+        appended_rows=0,
+        append_count=0,
+        result=public_result(result),
+    )
+    session.add(state)
+    await session.commit()
+    return state
@@ -1,37 +1,146 @@
+from contextlib import nullcontext
+
 import pandas as pd
 import numpy as np
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.bias import BiasDetectRequest
+from concurrent.futures import ProcessPoolExecutor
+
+from app.schemas.bias import (
+    BatchBiasDetectRequest,
+    BiasDetectRequest,
+    ThresholdSweepRequest,
+)
 from app.models.models import UploadRecord
-from app.utils.dataset_loader import load_dataset
+from app.utils.dataset_loader import (
+    DATASET_DIR,
+    bin_codes_path,
+    feature_encoder_path,
+    iter_dataset_chunks,
+    load_dataset,
+    sensitive_bins_path,
+)
 from app.utils.model_loader import load_model
-from app.utils.prediction import predict_labels
+from app.utils.prediction import predict_labels, predict_proba_positive
+from app.utils.prediction_cache import (
+    feature_set_hash,
+    PredictionWriter,
+    has_cached_predictions,
+    load_cached_predictions,
+    save_cached_predictions,
+)
 from app.config import settings
+from app.services.executor import run_in_worker
+from app.services.metrics import observe_stages
+from app.services.audit_state import INTERSECTIONAL_TABLE, public_result, save_audit_state
+from app.services.audit_cache import (
+    audit_cache_key,
+    ensure_upload_hashes,
+    get_cached_audit,
+    store_cached_audit,
+)
 
-from app.utils.dataset_validation import validate_dataset_health
-from app.utils.target_encoder import encode_target_column
-from app.utils.feature_encoder import encode_features_for_inference
-from app.utils.sensitive_validation import validate_sensitive_columns
-from app.utils.sensitive_preprocessing import bin_age_column
-from app.utils.bootstrap import bootstrap_ci
+from app.utils.dataset_validation import DatasetProfiler
+from app.utils.target_encoder import (
+    DROP_VALUES,
+    build_target_mapping,
+    encode_target_column,
+    factorize_target,
+    target_classes,
+    target_keep_mask,
+    target_labels,
+)
+from app.utils.feature_encoder import FeatureEncoder, load_feature_encoder
+from app.utils.sensitive_validation import (
+    check_sensitive_columns_exist,
+    summarize_sensitive_groups,
+    validate_sensitive_columns,
+)
+from app.utils.sensitive_preprocessing import (
+    bin_codes,
+    bin_key,
+    bin_labels,
+    bin_specs,
+    binned_name,
+    compact_groups,
+    fit_bins,
+    read_sensitive_bins,
+    remap_group_codes,
+    write_bin_codes,
+    write_sensitive_bins,
+)
+from app.utils.bootstrap import bootstrap_fairness_ci
+from app.utils.profiling import StageProfiler, merge_timings
 
 from app.utils.fairness_metrics import (
-    selection_rate,
-    true_positive_rate,
+    factorize_groups,
+    group_confusion_counts,
+    intersect_group_codes,
+    stacked_group_confusion_counts,
+    summarize_group_counts,
+    summarize_intersectional_counts,
+    subgroup_table,
     demographic_parity_difference,
     equal_opportunity_difference,
     disparate_impact_ratio,
 )
 from app.utils.bias_decision import evaluate_bias
+from app.utils.threshold_analysis import (
+    fairness_threshold_curves,
+    group_threshold_counts,
+    threshold_grid,
+)
 from fairlearn.postprocessing import ThresholdOptimizer
 from sklearn.pipeline import Pipeline
 
+PIPELINE_STEPS = {
+    1: "Validate upload record",
+    2: "Load dataset & model",
+    3: "Dataset health validation",
+    4: "Target validation & encoding",
+    5: "Sensitive attribute validation",
+    6: "Model prediction",
+    7: "Fairness metric computation",
+    8: "Bias driver identification",
+}
+
+# short stage names used in timings and the Server-Timing header
+PIPELINE_STAGES = {
+    1: "db_fetch",
+    2: "load",
+    3: "health",
+    4: "target",
+    5: "sensitive",
+    6: "predict",
+    7: "metrics",
+    8: "response",
+}
+
+
+def _report_step(progress, step: int):
+    # progress: optional callable(step, step_name), e.g. a job progress queue
+    if progress is not None:
+        progress(step, PIPELINE_STEPS[step])
+
+
+class _ProfiledProgress:
+    """Progress callback that also starts a profiler stage at every step."""
+
+    def __init__(self, progress, profiler: StageProfiler):
+        self.progress = progress
+        self.profiler = profiler
+
+    def __call__(self, step: int, name: str):
+        self.profiler.mark(PIPELINE_STAGES[step])
+        if self.progress is not None:
+            self.progress(step, name)
+
 
 async def run_bias_detection(
     payload: BiasDetectRequest,
     session: AsyncSession,
+    progress=None,
 ):
     """
     Bias Detection Pipeline
@@ -44,11 +153,20 @@ async def run_bias_detection(
     Step 6: Model prediction
     Step 7: Fairness metric computation
     Step 8: Bias driver identification
+
+    Only step 1 touches the database; steps 2-8 are CPU-bound and run in
+    the worker pool so the event loop stays responsive.
+
+    With ENABLE_PROFILING the result carries "timings": per-stage wall/CPU
+    time and peak RSS of both the API side and the worker.
     """
+    profiler = StageProfiler()
 
     # -------------------------------------------------
     # STEP 1: Fetch upload record
     # -------------------------------------------------
+    _report_step(progress, 1)
+    profiler.mark(PIPELINE_STAGES[1])
     record = (
         await session.execute(
             select(UploadRecord).where(UploadRecord.id == payload.upload_id)
@@ -58,67 +176,558 @@ async def run_bias_detection(
     if not record:
         raise ValueError("Upload record not found")
 
-    # -------------------------------------------------
-    # STEP 2: Load dataset & model
-    # -------------------------------------------------
-    df = load_dataset(record.dataset_filename)
-    model = load_model(record.model_filename)
+    cache_key = None
+    if settings.ENABLE_AUDIT_CACHE:
+        profiler.mark("cache_lookup")
+        await ensure_upload_hashes(record, session)
+        cache_key = audit_cache_key(record, payload)
+        cached = await get_cached_audit(cache_key, session)
+        if cached is not None:
+            state = await save_audit_state(record, payload, cached, session)
+            return _with_timings(
+                {**public_result(cached), "cached": True, "audit_state_id": state.id},
+                profiler,
+            )
+
+    # the worker times steps 2-8 itself; "worker" adds queueing and transfer
+    profiler.mark("worker")
+    result = await run_in_worker(
+        compute_bias_audit, upload_info(record), payload, progress
+    )
+    worker_timings = result.pop("timings", None)
+
+    profiler.mark("cache_store")
+    await _remember_dataset_health([record], result["dataset_health"], session)
+    if cache_key is not None:
+        await store_cached_audit(cache_key, record, result, session)
+
+    # per-group counts for incremental re-audits of appended rows
+    state = await save_audit_state(record, payload, result, session)
+
+    return _with_timings(
+        {**public_result(result), "cached": False, "audit_state_id": state.id},
+        profiler,
+        worker_timings,
+    )
+
+
+async def _remember_dataset_health(records: list[UploadRecord], health: dict, session: AsyncSession):
+    # uploads made before health was profiled at upload time: keep the
+    # profile an audit computed so later audits skip it
+    stale = [record for record in records if record.dataset_health is None]
+    if stale:
+        for record in stale:
+            record.dataset_health = health
+        await session.commit()
+
+
+def _with_timings(result: dict, profiler: StageProfiler, worker_timings=None) -> dict:
+    if not settings.ENABLE_PROFILING:
+        return result
+    timings = merge_timings(profiler.report(), worker_timings)
+    observe_stages("audit", timings)
+    return {**result, "timings": timings}
+
+
+async def run_batch_bias_detection(
+    payload: BatchBiasDetectRequest,
+    session: AsyncSession,
+):
+    """
+    Audit several models against one dataset.
+
+    All uploads must share the same dataset content. Cached audits are
+    served as usual; the rest are audited together in a single worker
+    call that reads and encodes the dataset once (see
+    compute_batch_bias_audit).
+    """
+    upload_ids = list(dict.fromkeys(payload.upload_ids))
+    if len(upload_ids) > settings.BATCH_MAX_MODELS:
+        raise ValueError(
+            f"Batch audits support at most {settings.BATCH_MAX_MODELS} uploads"
+        )
+
+    records = (
+        await session.execute(
+            select(UploadRecord).where(UploadRecord.id.in_(upload_ids))
+        )
+    ).scalars().all()
+    by_id = {record.id: record for record in records}
+
+    missing = [i for i in upload_ids if i not in by_id]
+    if missing:
+        raise ValueError(f"Upload records not found: {missing}")
+
+    records = [by_id[i] for i in upload_ids]
+    for record in records:
+        await ensure_upload_hashes(record, session)
+
+    if len({record.dataset_sha256 for record in records}) > 1:
+        raise ValueError("All uploads in a batch audit must share the same dataset")
+
+    results = {}
+    cache_keys = {}
+    for record in records:
+        if not settings.ENABLE_AUDIT_CACHE:
+            break
+        key = audit_cache_key(record, payload.member_request(record.id))
+        cached = await get_cached_audit(key, session)
+        if cached is not None:
+            results[record.id] = {**public_result(cached), "cached": True}
+        else:
+            cache_keys[record.id] = key
+
+    pending = [record for record in records if record.id not in results]
+    if pending:
+        computed = await run_in_worker(
+            compute_batch_bias_audit,
+            [upload_info(record) for record in pending],
+            payload,
+        )
+        await _remember_dataset_health(pending, computed[0]["dataset_health"], session)
+        for record, result in zip(pending, computed):
+            if record.id in cache_keys:
+                await store_cached_audit(cache_keys[record.id], record, result, session)
+            results[record.id] = {**public_result(result), "cached": False}
+
+    return {
+        "status": "success",
+        "results": [
+            {"upload_id": record.id, "model_type": record.model_type, **results[record.id]}
+            for record in records
+        ],
+        "comparison": compare_audits(records, results),
+    }
+
+
+def compare_audits(records: list[UploadRecord], results: dict) -> list[dict]:
+    """One row per model, least biased first."""
+    rows = []
+    for record in records:
+        result = results[record.id]
+        rows.append(
+            {
+                "upload_id": record.id,
+                "model_type": record.model_type,
+                "bias_present": result["bias_present"],
+                "bias_severity_score": result["bias_severity_score"],
+                "bias_driver": result["bias_driver"],
+                "metrics": {
+                    sensitive: {
+                        "dpd": audit["dpd"],
+                        "eod": audit["eod"],
+                        "dir": audit["dir"],
+                    }
+                    for sensitive, audit in result["sensitive_audit"].items()
+                },
+            }
+        )
+
+    def worst_dpd(row):
+        return max((m["dpd"] for m in row["metrics"].values()), default=0)
+
+    rows.sort(key=lambda row: (row["bias_severity_score"], worst_dpd(row)))
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    return rows
+
+
+def upload_info(record: UploadRecord) -> dict:
+    # plain, picklable view of the record for the worker pool
+    return {
+        "upload_id": record.id,
+        "dataset_filename": record.dataset_filename,
+        "model_filename": record.model_filename,
+        "model_sha256": record.model_sha256,
+        "model_type": record.model_type,
+        "dataset_columns": record.dataset_columns_list,
+        "dataset_dtypes": record.dataset_dtypes,
+        "dataset_health": record.dataset_health,
+    }
+
+
+def load_base_model(upload: dict):
+    model = load_model(upload["model_filename"], upload.get("model_sha256"))
 
     if isinstance(model, ThresholdOptimizer):
         raise ValueError(
             "Uploaded model is a ThresholdOptimizer (post-mitigation model). "
             "Bias detection should be performed on the original base model."
         )
+    return model
+
+
+def load_upload_encoder(upload: dict) -> FeatureEncoder:
+    """
+    FeatureEncoder fitted when the dataset was uploaded. Older uploads get
+    one fitted now, in a single streaming pass, and saved for next time.
+    """
+    path = feature_encoder_path(upload["dataset_filename"])
+    encoder = load_feature_encoder(path)
+    if encoder is None:
+        encoder = FeatureEncoder()
+        for chunk in iter_dataset_chunks(
+            upload["dataset_filename"],
+            chunk_rows=settings.OUT_OF_CORE_CHUNK_ROWS,
+            dtypes=upload.get("dataset_dtypes"),
+        ):
+            encoder.update(chunk)
+        encoder.save(path)
+    return encoder
+
+
+def model_feature_columns(model, default: list[str]) -> list[str]:
+    # models fitted on DataFrames know exactly which columns they consume
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None and set(names).issubset(default):
+        return [str(n) for n in names]
+    return default
+
+
+def audit_columns(all_columns: list[str], *groups) -> list[str]:
+    """
+    The columns an audit reads (target, sensitive, model features, ...),
+    in file order; nothing else is ever loaded.
+    """
+    wanted = set().union(*groups)
+    return [c for c in all_columns if c in wanted]
+
+
+def take_rows(data, rows: np.ndarray | None):
+    """Rows at positions `rows` of an array or frame; None keeps all (no copy)."""
+    if rows is None or data is None:
+        return data
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        return data.take(rows)
+    return np.asarray(data)[rows]
+
+
+def feature_frame(upload: dict, df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """
+    df[columns], with the columns df lacks read from the dataset for df's
+    rows (df.index = dataset row positions). Columns are put side by side,
+    never joined into a consolidated copy.
+    """
+    missing = [c for c in columns if c not in df.columns]
+    if not missing:
+        return df[columns]
+
+    extra = load_dataset(upload["dataset_filename"], columns=missing)
+    if len(extra) != len(df):
+        extra = extra.take(df.index.to_numpy())
+    frame = {c: extra[c].to_numpy() if c in extra.columns else df[c] for c in columns}
+    return pd.DataFrame(frame, index=df.index, copy=False)
+
+
+def profile_upload(upload: dict) -> dict:
+    """
+    Dataset health of an upload in one streaming pass, for uploads made
+    before it was stored at upload time; only a chunk is held at once.
+    """
+    profiler = DatasetProfiler()
+    for chunk in iter_dataset_chunks(
+        upload["dataset_filename"],
+        chunk_rows=settings.OUT_OF_CORE_CHUNK_ROWS,
+        dtypes=upload.get("dataset_dtypes"),
+    ):
+        profiler.update(chunk)
+    return profiler.result()
+
+
+def requested_bin_specs(payload) -> dict:
+    """bin_specs for a request, with the specs as plain (picklable) dicts."""
+    requested = {
+        col: spec.model_dump(exclude_none=True)
+        for col, spec in (payload.sensitive_bins or {}).items()
+    }
+    return bin_specs(list(payload.sensitive_columns), requested)
+
+
+def load_upload_bins(upload: dict, specs: dict, df: pd.DataFrame | None = None) -> dict:
+    """
+    column -> (fitted bins, bin code per dataset row) for the columns in
+    specs (see bin_specs). Every column + spec is fitted once per upload;
+    the fit and the codes are stored beside the dataset, so later audits
+    only memory-map the codes. df: the full dataset, if already loaded.
+    """
+    filename = upload["dataset_filename"]
+    path = sensitive_bins_path(filename)
+    stored = read_sensitive_bins(path)
+    changed = False
+
+    bins = {}
+    for col, (spec, explicit) in specs.items():
+        key = bin_key(col, spec)
+        codes_path = bin_codes_path(filename, key)
+        if key not in stored or (stored[key] is not None and not codes_path.exists()):
+            values = df[col] if df is not None else load_dataset(filename, columns=[col])[col]
+            stored[key] = fit_bins(values, spec, explicit)
+            if stored[key] is not None:
+                write_bin_codes(codes_path, bin_codes(values, stored[key]))
+            changed = True
+
+        if stored[key] is not None:
+            bins[col] = (stored[key], np.load(codes_path, mmap_mode="r"))
+
+    if changed:
+        write_sensitive_bins(path, stored)
+    return bins
+
+
+def fit_sensitive_bins(df: pd.DataFrame, specs: dict) -> dict:
+    """load_upload_bins for data that is not a stored upload: fitted on df."""
+    bins = {}
+    for col, (spec, explicit) in specs.items():
+        fitted = fit_bins(df[col], spec, explicit)
+        if fitted is not None:
+            bins[col] = (fitted, None)
+    return bins
+
+
+def sensitive_group_codes(df: pd.DataFrame, sensitive_columns: list[str], bins: dict) -> dict:
+    """
+    (group codes, labels) per audited attribute. Binned columns are audited
+    as <col>_group: their stored codes are gathered by df.index (dataset row
+    positions), or df is binned directly for bins from fit_sensitive_bins.
+    Other columns are factorized as they are, never converted to strings.
+    """
+    groups = {}
+    for col in dict.fromkeys(sensitive_columns):
+        if col in bins:
+            fitted, codes = bins[col]
+            if codes is None:
+                codes = bin_codes(df[col], fitted)
+            else:
+                codes = np.asarray(codes[df.index.to_numpy()])
+            groups[binned_name(col)] = compact_groups(codes, bin_labels(fitted))
+        else:
+            groups[col] = factorize_groups(df[col])
+    return groups
+
+
+def fitted_bins(bins: dict) -> dict:
+    # the bin edges and labels used, reported with the audit
+    return {col: fitted for col, (fitted, _) in bins.items()}
+
+
+def _audit_target(y_true: np.ndarray, target: str) -> np.ndarray:
+    # float labels only come from missing targets, which target_labels keeps
+    if y_true.dtype.kind == "f":
+        raise ValueError(f"Target column '{target}' contains missing values")
+    return y_true.astype(int, copy=False)
+
+
+def _check_intersectional(payload: BiasDetectRequest):
+    if payload.intersectional and len(set(payload.sensitive_columns)) < 2:
+        raise ValueError("Intersectional audits need at least two sensitive columns")
+
+
+def _subgroup_sizes(labels_by_column: dict) -> list[int]:
+    sizes = [len(labels) for labels in labels_by_column.values()]
+
+    if np.prod(sizes, dtype=float) > settings.INTERSECTIONAL_MAX_SUBGROUPS:
+        raise ValueError(
+            "Too many intersectional subgroups "
+            f"({' x '.join(map(str, sizes))}); audit fewer sensitive columns"
+        )
+    return sizes
+
+
+def intersectional_codes(codes_by_column: dict, labels_by_column: dict):
+    """Subgroup code per row over all audited attributes, plus subgroup count."""
+    sizes = _subgroup_sizes(labels_by_column)
+    return intersect_group_codes([codes_by_column[c] for c in labels_by_column], sizes)
+
+
+def use_out_of_core(upload: dict, payload: BiasDetectRequest) -> bool:
+    if payload.out_of_core is not None:
+        return payload.out_of_core
+
+    path = DATASET_DIR / upload["dataset_filename"]
+    return path.exists() and path.stat().st_size >= settings.OUT_OF_CORE_THRESHOLD_BYTES
+
+
+def compute_bias_audit(
+    upload: dict,
+    payload: BiasDetectRequest,
+    progress=None,
+) -> dict:
+    """
+    Steps 2-8 of the bias detection pipeline (synchronous, CPU-bound).
+    upload: see upload_info
+    """
+    profiler = None
+    if settings.ENABLE_PROFILING:
+        profiler = StageProfiler()
+        progress = _ProfiledProgress(progress, profiler)
+
+    _check_intersectional(payload)
+    if use_out_of_core(upload, payload):
+        return compute_bias_audit_chunked(upload, payload, progress, profiler)
+
+    sensitive_columns = list(payload.sensitive_columns)
+    target = payload.target_column
+    all_columns = upload["dataset_columns"]
+
+    # -------------------------------------------------
+    # STEP 2: Plan columns, load dataset & model
+    # -------------------------------------------------
+    _report_step(progress, 2)
+
+    # the model sees the uploaded columns minus the target, never derived
+    # columns such as age bins
+    feature_columns = [c for c in all_columns if c != target]
+    feature_hash = feature_set_hash(feature_columns, target)
+
+    # with cached predictions the model (and its feature columns) are not
+    # needed at all
+    model = None
+    model_features = []
+    if not (
+        settings.ENABLE_PREDICTION_CACHE
+        and has_cached_predictions(upload["upload_id"], feature_hash)
+    ):
+        model = load_base_model(upload)
+        model_features = model_feature_columns(model, feature_columns)
+
+    # read only target, sensitive and model feature columns, once; every
+    # later step works on views of this frame
+    df = load_dataset(
+        upload["dataset_filename"],
+        columns=audit_columns(all_columns, [target], sensitive_columns, model_features),
+    )
+    bins = load_upload_bins(upload, requested_bin_specs(payload), df)
 
     # -------------------------------------------------
     # STEP 3: Dataset health validation
     # -------------------------------------------------
-    dataset_health = validate_dataset_health(df)
+    _report_step(progress, 3)
+    dataset_health = upload["dataset_health"]
+    if dataset_health is None:
+        # uploads made before health was stored at upload time
+        dataset_health = profile_upload(upload)
 
     # -------------------------------------------------
     # STEP 4: Target validation & encoding
     # -------------------------------------------------
-    df, target_info = encode_target_column(df, payload.target_column)
+    _report_step(progress, 4)
+    if target not in df.columns:
+        raise ValueError(f"Target column '{target}' not found in dataset")
+    y_true, keep, target_info = target_labels(df[target])
+    y_true = _audit_target(y_true, target)
+    # dropped rows are never removed from df itself: only the sensitive
+    # columns and the predictions are subset
+    rows = None if keep is None else np.flatnonzero(keep)
 
     # -------------------------------------------------
     # STEP 5: Sensitive attribute validation
     # -------------------------------------------------
-    sensitive_info = validate_sensitive_columns(df, payload.sensitive_columns)
+    _report_step(progress, 5)
+    check_sensitive_columns_exist(df.columns, sensitive_columns)
+    sensitive = take_rows(df[list(dict.fromkeys(sensitive_columns))], rows)
+    sensitive_info = validate_sensitive_columns(sensitive, sensitive_columns)
 
-    for col in payload.sensitive_columns:
-        if col.lower() == "age":
-            df = bin_age_column(df, col)
-            payload.sensitive_columns = [
-                c if c != col else col + "_group" for c in payload.sensitive_columns
-            ]
-            break
+    sensitive_groups = sensitive_group_codes(sensitive, sensitive_columns, bins)
+    sensitive_columns = list(sensitive_groups)
+
+    # -------------------------------------------------
+    # STEP 6: Separate features / target & predict
+    # -------------------------------------------------
+    _report_step(progress, 6)
+    cached = None
+    if model is None:
+        cached = load_cached_predictions(upload["upload_id"], feature_hash, len(y_true))
 
-    for col in payload.sensitive_columns:
-        df[col] = df[col].astype(str)
+    if cached is not None:
+        # same upload + same features: reuse y_pred, skip model load/predict
+        y_pred = np.asarray(cached[0], dtype=int)
+    else:
+        if model is None:
+            # cache entry turned out unusable: fall back to predicting
+            model = load_base_model(upload)
+            model_features = model_feature_columns(model, feature_columns)
+
+        X = feature_frame(upload, df, model_features)
+
+        if isinstance(model, Pipeline):
+            # Pipeline handles preprocessing internally
+            X_infer = X
+        else:
+            # Fallback encoding for non-pipeline models
+            X_infer = load_upload_encoder(upload).transform(X)
 
-    print(df[payload.sensitive_columns].dtypes)
+        # every loaded row is predicted and the dropped ones discarded
+        # afterwards, so the features are never copied to drop rows
+        y_pred = take_rows(predict_labels(model, X_infer), rows)
+        y_pred = np.nan_to_num(y_pred).astype(int)
+
+        if settings.ENABLE_PREDICTION_CACHE:
+            scores = None
+            if settings.CACHE_PREDICTION_SCORES:
+                scores = take_rows(predict_proba_positive(model, X_infer), rows)
+            save_cached_predictions(upload["upload_id"], feature_hash, y_pred, scores)
+        del X, X_infer
 
     # -------------------------------------------------
-    # STEP 6: Separate features / target & predict
+    # STEP 7: Fairness metric computation
     # -------------------------------------------------
-    y_true = df[payload.target_column].astype(int)
+    _report_step(progress, 7)
+    group_tables = {}
+    group_codes = {}
+    for sensitive, (codes, labels) in sensitive_groups.items():
+        # one bincount pass per attribute
+        group_codes[sensitive] = codes
+        group_tables[sensitive] = (
+            group_confusion_counts(codes, len(labels), y_true, y_pred),
+            labels,
+        )
 
-    X = df.drop(columns=[payload.target_column])
+    intersectional = None
+    if payload.intersectional:
+        labels = {col: group_tables[col][1] for col in sensitive_columns}
+        codes, n_subgroups = intersectional_codes(group_codes, labels)
+        intersectional = (
+            group_confusion_counts(codes, n_subgroups, y_true, y_pred),
+            labels,
+        )
 
-    if isinstance(model, Pipeline):
-        # Pipeline handles preprocessing internally
-        X_infer = X
-    else:
-        # Fallback encoding for non-pipeline models
-        X_infer = encode_features_for_inference(X)
+    return finalize_audit(
+        group_tables,
+        positive_rate=float(y_pred.mean()),
+        total_rows=len(y_true),
+        dataset_health=dataset_health,
+        target_info=target_info,
+        sensitive_info=sensitive_info,
+        progress=progress,
+        intersectional=intersectional,
+        profiler=profiler,
+        sensitive_bins=fitted_bins(bins),
+    )
 
-    y_pred = predict_labels(model, X_infer)
-    y_pred = np.nan_to_num(y_pred).astype(int)
 
-    print("MODEL TYPE:", type(model))
-    print("USING PIPELINE:", isinstance(model, Pipeline))
+def finalize_audit(
+    group_tables: dict,
+    positive_rate: float,
+    total_rows: int,
+    dataset_health: dict,
+    target_info: dict,
+    sensitive_info: dict,
+    progress=None,
+    intersectional=None,
+    profiler: StageProfiler | None = None,
+    sensitive_bins: dict | None = None,
+) -> dict:
+    """
+    Metrics, warnings and the final response from per-group confusion counts.
 
-    positive_rate = y_pred.mean()
+    group_tables: sensitive column -> ((groups, 4) confusion counts, labels)
+    intersectional: optional ((subgroups, 4) counts, column -> labels)
+    profiler: when given, bootstrap is timed separately and the stage
+    report is attached as response["timings"].
+    sensitive_bins: column -> fitted bins of the binned attributes
+    Shared by the in-memory and the chunked (out-of-core) pipelines.
+    """
+    warnings = []
 
     if (
         positive_rate < (1 - settings.PREDICTION_SKEW_THRESHOLD)
@@ -129,22 +738,16 @@ async def run_bias_detection(
             "Fairness metrics may be misleading."
         )
 
-    # -------------------------------------------------
-    # STEP 7: Fairness metric computation
-    # -------------------------------------------------
     audit_results = {}
-    warnings = []
     bias_driver = None
     max_severity = 0
-    total_rows = len(df)
-
-    for sensitive in payload.sensitive_columns:
-        group_rates = {}
-        group_tprs = {}
 
-        group_counts = df[sensitive].value_counts(dropna=False).to_dict()
+    for sensitive, (counts, labels) in group_tables.items():
+        group_metrics = summarize_group_counts(counts, labels)
+        group_rates = group_metrics["selection_rate"]
+        group_tprs = group_metrics["true_positive_rate"]
 
-        for group, count in group_counts.items():
+        for group, count in group_metrics["group_counts"].items():
             # ---------------------------
             # Warning: Low sample size
             # ---------------------------
@@ -165,42 +768,37 @@ async def run_bias_detection(
                     f"represents only {proportion:.2%} of the dataset."
                 )
 
-            mask = df[sensitive] == group
-            y_g = y_true[mask]
-            y_p = y_pred[mask]
-
-            if len(y_g) == 0:
-                continue
-
-            group_rates[str(group)] = selection_rate(y_p)
-            group_tprs[str(group)] = true_positive_rate(y_g, y_p)
-
         dpd = demographic_parity_difference(group_rates)
         eod = equal_opportunity_difference(group_tprs)
         dir_ratio = disparate_impact_ratio(group_rates)
 
         decision = evaluate_bias(dpd, eod, dir_ratio)
 
-        dpd_ci = None
-        eod_ci = None
+        cis = None
 
         if settings.ENABLE_BOOTSTRAP_CI:
-            dpd_ci = bootstrap_ci(
-                list(group_rates.values()), n_bootstrap=settings.BOOTSTRAP_SAMPLES
-            )
-
-            eod_ci = bootstrap_ci(
-                list(group_tprs.values()), n_bootstrap=settings.BOOTSTRAP_SAMPLES
-            )
+            with _timed(profiler, "bootstrap"):
+                cis = bootstrap_fairness_ci(
+                    group_metrics["counts"],
+                    n_bootstrap=settings.BOOTSTRAP_SAMPLES,
+                    ci=settings.BOOTSTRAP_CONFIDENCE,
+                    seed=settings.BOOTSTRAP_SEED,
+                    batch_size=settings.BOOTSTRAP_BATCH_SIZE,
+                    max_batch_cells=settings.BOOTSTRAP_MAX_BATCH_CELLS,
+                    n_jobs=settings.BOOTSTRAP_WORKERS,
+                )
 
         audit_results[sensitive] = {
             "selection_rate": group_rates,
             "true_positive_rate": group_tprs,
+            "false_positive_rate": group_metrics["false_positive_rate"],
+            "confusion_matrix": group_metrics["confusion_matrix"],
             "dpd": round(dpd, 4),
             "eod": round(eod, 4),
             "dir": round(dir_ratio, 4),
-            "dpd_ci": dpd_ci,
-            "eod_ci": eod_ci,
+            "dpd_ci": cis["dpd"] if cis else None,
+            "eod_ci": cis["eod"] if cis else None,
+            "dir_ci": cis["dir"] if cis else None,
             "biased": decision["bias_present"],
             "severity_score": decision["severity_score"],
             "violations": decision["violations"],
@@ -213,11 +811,13 @@ async def run_bias_detection(
     # -------------------------------------------------
     # STEP 8: Final response
     # -------------------------------------------------
-    return {
+    _report_step(progress, 8)
+    response = {
         "status": "success",
         "dataset_health": dataset_health,
         "target_info": target_info,
         "sensitive_attributes": sensitive_info,
+        "sensitive_bins": sensitive_bins or {},
         "bias_present": max_severity > 0,
         "bias_driver": bias_driver,
         "bias_severity_score": max_severity,
@@ -225,3 +825,608 @@ async def run_bias_detection(
         "warnings": list(set(warnings)),  # remove duplicates
         "next_step": "bias_mitigation" if max_severity > 0 else "model_optimization",
     }
+
+    if intersectional is not None:
+        with _timed(profiler, "intersectional"):
+            response["intersectional_audit"] = _intersectional_audit(*intersectional, warnings)
+        response["warnings"] = list(set(warnings))
+        # lets appends to this audit's state keep the intersectional audit
+        response[INTERSECTIONAL_TABLE] = subgroup_table(*intersectional)
+
+    if profiler is not None:
+        response["timings"] = profiler.report()
+
+    return response
+
+
+def _timed(profiler: StageProfiler | None, name: str):
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+def _intersectional_audit(counts, column_labels: dict, warnings: list) -> dict:
+    summary = summarize_intersectional_counts(
+        counts,
+        column_labels,
+        min_group_size=settings.MIN_GROUP_SIZE,
+        top_k=settings.INTERSECTIONAL_TOP_K,
+    )
+    subgroup_counts = summary.pop("counts")
+    label = " x ".join(summary["attributes"])
+
+    if summary["subgroups_pruned"]:
+        warnings.append(
+            f"{summary['subgroups_pruned']} intersectional subgroups of {label} "
+            f"have fewer than {settings.MIN_GROUP_SIZE} samples and were excluded."
+        )
+
+    if summary["dpd"] is None:
+        warnings.append(
+            f"Fewer than two intersectional subgroups of {label} are large enough "
+            "to compare. Intersectional metrics were not computed."
+        )
+        return {**summary, "biased": None, "severity_score": None, "violations": None}
+
+    decision = evaluate_bias(summary["dpd"], summary["eod"], summary["dir"])
+
+    cis = None
+    if settings.ENABLE_BOOTSTRAP_CI:
+        cis = bootstrap_fairness_ci(
+            subgroup_counts,
+            n_bootstrap=settings.BOOTSTRAP_SAMPLES,
+            ci=settings.BOOTSTRAP_CONFIDENCE,
+            seed=settings.BOOTSTRAP_SEED,
+            batch_size=settings.BOOTSTRAP_BATCH_SIZE,
+            max_batch_cells=settings.BOOTSTRAP_MAX_BATCH_CELLS,
+            n_jobs=settings.BOOTSTRAP_WORKERS,
+        )
+
+    return {
+        **summary,
+        "dpd": round(summary["dpd"], 4),
+        "eod": round(summary["eod"], 4),
+        "dir": round(summary["dir"], 4),
+        "dpd_ci": cis["dpd"] if cis else None,
+        "eod_ci": cis["eod"] if cis else None,
+        "dir_ci": cis["dir"] if cis else None,
+        "biased": decision["bias_present"],
+        "severity_score": decision["severity_score"],
+        "violations": decision["violations"],
+    }
+
+
+def compute_bias_audit_chunked(
+    upload: dict,
+    payload: BiasDetectRequest,
+    progress=None,
+    profiler: StageProfiler | None = None,
+) -> dict:
+    """
+    Out-of-core variant of compute_bias_audit for datasets larger than RAM.
+
+    Pass 1 streams the needed columns once to learn everything that must be
+    global: health stats (if not stored at upload), target classes and
+    sensitive groups. Features are encoded with the upload's FeatureEncoder.
+    Pass 2 encodes, predicts and bincounts each chunk into running per-group
+    confusion counts. Only one chunk is ever held in memory.
+    """
+    sensitive_columns = list(payload.sensitive_columns)
+    target = payload.target_column
+    all_columns = upload["dataset_columns"]
+    chunk_rows = settings.OUT_OF_CORE_CHUNK_ROWS
+
+    def chunks(columns):
+        # chunks are indexed by dataset row position, like load_dataset
+        start = 0
+        for chunk in iter_dataset_chunks(
+            upload["dataset_filename"],
+            columns=columns,
+            chunk_rows=chunk_rows,
+            dtypes=upload.get("dataset_dtypes"),
+        ):
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+
+    # -------------------------------------------------
+    # STEP 2: Resolve model & columns
+    # -------------------------------------------------
+    _report_step(progress, 2)
+    if target not in all_columns:
+        raise ValueError(f"Target column '{target}' not found in dataset")
+    check_sensitive_columns_exist(all_columns, sensitive_columns)
+
+    feature_columns = [c for c in all_columns if c != target]
+    feature_hash = feature_set_hash(feature_columns, target)
+
+    model = None
+    model_features = []
+    if not (
+        settings.ENABLE_PREDICTION_CACHE
+        and has_cached_predictions(upload["upload_id"], feature_hash)
+    ):
+        model = load_base_model(upload)
+        model_features = model_feature_columns(model, feature_columns)
+
+    dataset_health = upload["dataset_health"]
+    wanted = {target, *sensitive_columns, *model_features}
+    needed = [c for c in all_columns if c in wanted]
+    # fitted on first use, from that column alone
+    bins = load_upload_bins(upload, requested_bin_specs(payload))
+
+    # -------------------------------------------------
+    # STEPS 3-5: Fit pass (health, target, sensitive groups)
+    # -------------------------------------------------
+    _report_step(progress, 3)
+    health = DatasetProfiler() if dataset_health is None else None
+
+    target_values = set()
+    dropped_rows = 0
+    kept_rows = 0
+    sensitive_uniques = {col: {} for col in sensitive_columns}
+    group_labels = {}
+
+    for chunk in chunks(all_columns if health is not None else needed):
+        if health is not None:
+            health.update(chunk)
+
+        codes, normalized = factorize_target(chunk[target])
+        keep = target_keep_mask(codes, normalized)
+        dropped_rows += int((~keep).sum())
+        kept_rows += int(keep.sum())
+        target_values.update(v for v in normalized if v not in DROP_VALUES)
+
+        kept = chunk[keep]
+        for col in sensitive_columns:
+            sensitive_uniques[col].update(dict.fromkeys(kept[col].dropna().unique()))
+        for name, (_, labels) in sensitive_group_codes(kept, sensitive_columns, bins).items():
+            group_labels.setdefault(name, {}).update(dict.fromkeys(labels))
+
+    if health is not None:
+        dataset_health = health.result()
+
+    _report_step(progress, 4)
+    target_mapping = build_target_mapping(target_values)
+    target_info = {
+        "audit_mode": target_mapping[1],
+        "dropped_rows": dropped_rows,
+        "unique_classes": len(target_values),
+        "classes": target_classes(target_values),
+    }
+
+    _report_step(progress, 5)
+    sensitive_info = summarize_sensitive_groups(
+        {col: list(values) for col, values in sensitive_uniques.items()}
+    )
+    group_labels = {name: list(labels) for name, labels in group_labels.items()}
+    for col, (fitted, _) in bins.items():
+        # bins in edge order rather than order of appearance
+        seen = group_labels[binned_name(col)]
+        group_labels[binned_name(col)] = [l for l in bin_labels(fitted) if l in seen]
+
+    # -------------------------------------------------
+    # STEPS 6-7: Predict + accumulate per-group counts
+    # -------------------------------------------------
+    _report_step(progress, 6)
+    cached = None
+    if model is None:
+        cached = load_cached_predictions(upload["upload_id"], feature_hash, kept_rows)
+        if cached is None:
+            # cache entry turned out unusable: fall back to predicting
+            model = load_base_model(upload)
+            model_features = model_feature_columns(model, feature_columns)
+            needed = [c for c in all_columns if c in {target, *sensitive_columns, *model_features}]
+
+    encoder = None
+    if model is not None and not isinstance(model, Pipeline):
+        encoder = load_upload_encoder(upload)
+
+    writer = None
+    if model is not None and settings.ENABLE_PREDICTION_CACHE:
+        writer = PredictionWriter(
+            upload["upload_id"],
+            feature_hash,
+            kept_rows,
+            with_scores=settings.CACHE_PREDICTION_SCORES and hasattr(model, "predict_proba"),
+        )
+
+    group_counts = {
+        col: np.zeros((len(labels), 4), dtype=np.int64)
+        for col, labels in group_labels.items()
+    }
+    intersectional_counts = None
+    if payload.intersectional:
+        sizes = _subgroup_sizes(group_labels)
+        intersectional_counts = np.zeros((int(np.prod(sizes)), 4), dtype=np.int64)
+    predicted_sum = 0
+    offset = 0
+
+    try:
+        for chunk in chunks(needed):
+            chunk, _ = encode_target_column(chunk, target, target_mapping)
+            n = len(chunk)
+            if n == 0:
+                continue
+
+            y_true = chunk[target].astype(int).to_numpy()
+
+            if cached is not None:
+                y_pred = np.asarray(cached[0][offset : offset + n], dtype=int)
+            else:
+                X = chunk[model_features]
+                X_infer = X if encoder is None else encoder.transform(X)
+
+                y_pred = np.nan_to_num(predict_labels(model, X_infer)).astype(int)
+
+                if writer is not None:
+                    scores = None
+                    if writer.scores is not None:
+                        scores = predict_proba_positive(model, X_infer)
+                    writer.write(offset, y_pred, scores)
+
+            chunk_codes = {}
+            for name, (codes, labels) in sensitive_group_codes(chunk, sensitive_columns, bins).items():
+                codes = remap_group_codes(codes, labels, group_labels[name])
+                chunk_codes[name] = codes
+                group_counts[name] += group_confusion_counts(
+                    codes, len(group_labels[name]), y_true, y_pred
+                )
+
+            if intersectional_counts is not None:
+                codes, n_subgroups = intersectional_codes(chunk_codes, group_labels)
+                intersectional_counts += group_confusion_counts(
+                    codes, n_subgroups, y_true, y_pred
+                )
+
+            predicted_sum += int(y_pred.sum())
+            offset += n
+    except BaseException:
+        if writer is not None:
+            writer.discard()
+        raise
+
+    if writer is not None:
+        writer.commit()
+
+    _report_step(progress, 7)
+    return finalize_audit(
+        {col: (group_counts[col], group_labels[col]) for col in group_counts},
+        positive_rate=predicted_sum / max(offset, 1),
+        total_rows=offset,
+        dataset_health=dataset_health,
+        target_info=target_info,
+        sensitive_info=sensitive_info,
+        progress=progress,
+        intersectional=(
+            (intersectional_counts, group_labels)
+            if intersectional_counts is not None
+            else None
+        ),
+        profiler=profiler,
+        sensitive_bins=fitted_bins(bins),
+    )
+
+
+def _batch_features(uploads: list[dict], members: list[int], feature_columns: list[str]) -> list[str]:
+    # union of the feature columns the given batch members' models use
+    used = set()
+    for i in members:
+        used.update(model_feature_columns(load_base_model(uploads[i]), feature_columns))
+    return [c for c in feature_columns if c in used]
+
+
+def _predict_batch_member(
+    upload: dict, X: pd.DataFrame, X_encoded, feature_hash: str, rows: np.ndarray | None
+):
+    """
+    Predict one model of a batch audit. Module level so it can run in a
+    worker process. X_encoded is X after the upload's FeatureEncoder
+    (None when every model in the batch is a Pipeline). X holds every
+    dataset row; predictions are returned for `rows` (see take_rows).
+    """
+    model = load_base_model(upload)
+    model_features = model_feature_columns(model, list(X.columns))
+
+    if isinstance(model, Pipeline):
+        X_infer = X[model_features]
+    else:
+        if X_encoded is None:
+            X_encoded = load_upload_encoder(upload).transform(X)
+        X_infer = X_encoded[model_features]
+
+    y_pred = np.nan_to_num(take_rows(predict_labels(model, X_infer), rows)).astype(np.int8)
+
+    if settings.ENABLE_PREDICTION_CACHE:
+        scores = None
+        if settings.CACHE_PREDICTION_SCORES:
+            scores = take_rows(predict_proba_positive(model, X_infer), rows)
+        save_cached_predictions(upload["upload_id"], feature_hash, y_pred, scores)
+
+    return y_pred
+
+
+def compute_batch_bias_audit(
+    uploads: list[dict],
+    payload: BatchBiasDetectRequest,
+    progress=None,
+) -> list[dict]:
+    """
+    Steps 2-8 for several models that share one dataset.
+
+    The dataset is loaded, validated and encoded once; only prediction runs
+    per model (across BATCH_PREDICT_WORKERS processes when > 1), and the
+    per-group confusion counts of all models come from one stacked bincount
+    per sensitive attribute. Results are in the order of uploads.
+    """
+    _check_intersectional(payload)
+    if use_out_of_core(uploads[0], payload):
+        # chunked audits stream the dataset per model anyway
+        return [
+            compute_bias_audit_chunked(upload, payload.member_request(upload["upload_id"]))
+            for upload in uploads
+        ]
+
+    sensitive_columns = list(payload.sensitive_columns)
+    target = payload.target_column
+    all_columns = uploads[0]["dataset_columns"]
+
+    # -------------------------------------------------
+    # STEP 2: Plan columns, load dataset
+    # -------------------------------------------------
+    _report_step(progress, 2)
+    feature_columns = [c for c in all_columns if c != target]
+    feature_hash = feature_set_hash(feature_columns, target)
+
+    # features are read only for the models without cached predictions
+    uncached = [
+        i
+        for i, upload in enumerate(uploads)
+        if not (
+            settings.ENABLE_PREDICTION_CACHE
+            and has_cached_predictions(upload["upload_id"], feature_hash)
+        )
+    ]
+    df = load_dataset(
+        uploads[0]["dataset_filename"],
+        columns=audit_columns(
+            all_columns,
+            [target],
+            sensitive_columns,
+            _batch_features(uploads, uncached, feature_columns),
+        ),
+    )
+    bins = load_upload_bins(uploads[0], requested_bin_specs(payload), df)
+
+    # -------------------------------------------------
+    # STEPS 3-5: Health, target, sensitive attributes
+    # -------------------------------------------------
+    _report_step(progress, 3)
+    dataset_health = uploads[0]["dataset_health"]
+    if dataset_health is None:
+        dataset_health = profile_upload(uploads[0])
+
+    _report_step(progress, 4)
+    if target not in df.columns:
+        raise ValueError(f"Target column '{target}' not found in dataset")
+    y_true, keep, target_info = target_labels(df[target])
+    y_true = _audit_target(y_true, target)
+    rows = None if keep is None else np.flatnonzero(keep)
+
+    _report_step(progress, 5)
+    check_sensitive_columns_exist(df.columns, sensitive_columns)
+    sensitive = take_rows(df[list(dict.fromkeys(sensitive_columns))], rows)
+    sensitive_info = validate_sensitive_columns(sensitive, sensitive_columns)
+    sensitive_groups = sensitive_group_codes(sensitive, sensitive_columns, bins)
+
+    # -------------------------------------------------
+    # STEP 6: Predict with every model
+    # -------------------------------------------------
+    _report_step(progress, 6)
+    y_preds = [None] * len(uploads)
+
+    for i, upload in enumerate(uploads):
+        if settings.ENABLE_PREDICTION_CACHE:
+            cached = load_cached_predictions(upload["upload_id"], feature_hash, len(y_true))
+            if cached is not None:
+                y_preds[i] = np.asarray(cached[0], dtype=np.int8)
+
+    to_predict = [i for i, y_pred in enumerate(y_preds) if y_pred is None]
+    if to_predict:
+        X = feature_frame(
+            uploads[0], df, _batch_features(uploads, to_predict, feature_columns)
+        )
+        X_encoded = None
+        if any(uploads[i]["model_type"] != "Pipeline" for i in to_predict):
+            # encode once (the uploads share the dataset and so the
+            # encoder); each model selects its own columns from it
+            X_encoded = load_upload_encoder(uploads[0]).transform(X)
+
+        args = [(uploads[i], X, X_encoded, feature_hash, rows) for i in to_predict]
+        workers = min(settings.BATCH_PREDICT_WORKERS, len(to_predict))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                predicted = list(pool.map(_predict_batch_member, *zip(*args)))
+        else:
+            predicted = [_predict_batch_member(*a) for a in args]
+
+        for i, y_pred in zip(to_predict, predicted):
+            y_preds[i] = y_pred
+
+    y_preds = np.stack(y_preds)
+
+    # -------------------------------------------------
+    # STEP 7: Stacked per-group confusion counts
+    # -------------------------------------------------
+    _report_step(progress, 7)
+    stacked = {}
+    group_codes = {}
+    for sensitive, (codes, group_labels) in sensitive_groups.items():
+        group_codes[sensitive] = codes
+        stacked[sensitive] = (
+            stacked_group_confusion_counts(codes, len(group_labels), y_true, y_preds),
+            group_labels,
+        )
+
+    intersectional = None
+    if payload.intersectional:
+        labels = {col: stacked[col][1] for col in stacked}
+        codes, n_subgroups = intersectional_codes(group_codes, labels)
+        intersectional = (
+            stacked_group_confusion_counts(codes, n_subgroups, y_true, y_preds),
+            labels,
+        )
+
+    return [
+        finalize_audit(
+            {sensitive: (counts[m], labels) for sensitive, (counts, labels) in stacked.items()},
+            positive_rate=float(y_preds[m].mean()),
+            total_rows=len(y_true),
+            dataset_health=dataset_health,
+            target_info=target_info,
+            sensitive_info=sensitive_info,
+            intersectional=(
+                (intersectional[0][m], intersectional[1]) if intersectional else None
+            ),
+            sensitive_bins=fitted_bins(bins),
+        )
+        for m in range(len(uploads))
+    ]
+
+
+async def run_threshold_sweep(payload: ThresholdSweepRequest, session: AsyncSession):
+    """
+    Fairness-vs-threshold curves and per-group ROC/AUC from predict_proba
+    scores. Cached like audits (the request fields make the key distinct).
+    """
+    record = (
+        await session.execute(
+            select(UploadRecord).where(UploadRecord.id == payload.upload_id)
+        )
+    ).scalar_one_or_none()
+
+    if not record:
+        raise ValueError("Upload record not found")
+    if not record.model_supports_predict_proba:
+        raise ValueError(
+            "Threshold analysis needs a model that supports predict_proba"
+        )
+
+    cache_key = None
+    if settings.ENABLE_AUDIT_CACHE:
+        await ensure_upload_hashes(record, session)
+        cache_key = audit_cache_key(record, payload)
+        cached = await get_cached_audit(cache_key, session)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    result = await run_in_worker(compute_threshold_sweep, upload_info(record), payload)
+
+    if cache_key is not None:
+        await store_cached_audit(cache_key, record, result, session)
+
+    return {**result, "cached": False}
+
+
+def model_inputs(upload: dict, df: pd.DataFrame, feature_columns: list[str]):
+    """(base model, its inference input for df's rows), loading missing feature columns."""
+    model = load_base_model(upload)
+    X = feature_frame(upload, df, model_feature_columns(model, feature_columns))
+    X_infer = X if isinstance(model, Pipeline) else load_upload_encoder(upload).transform(X)
+    return model, X_infer
+
+
+def predictions_with_scores(
+    upload: dict, df: pd.DataFrame, feature_columns: list[str], target: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (y_pred, positive-class scores) for df's rows, from the prediction cache
+    if possible; otherwise the model predicts once and the cache is filled.
+    Labels cached by an audit without scores (CACHE_PREDICTION_SCORES off)
+    are reused, so only predict_proba runs then.
+    """
+    feature_hash = feature_set_hash(feature_columns, target)
+
+    cached = None
+    if settings.ENABLE_PREDICTION_CACHE:
+        cached = load_cached_predictions(upload["upload_id"], feature_hash, len(df))
+        if cached is not None and cached[1] is not None:
+            return np.asarray(cached[0], dtype=int), np.asarray(cached[1], dtype=np.float64)
+
+    model, X_infer = model_inputs(upload, df, feature_columns)
+
+    scores = predict_proba_positive(model, X_infer)
+    if scores is None:
+        raise ValueError("Model does not support predict_proba")
+    if cached is not None:
+        y_pred = np.asarray(cached[0], dtype=int)
+    else:
+        y_pred = np.nan_to_num(predict_labels(model, X_infer)).astype(int)
+
+    if settings.ENABLE_PREDICTION_CACHE:
+        save_cached_predictions(upload["upload_id"], feature_hash, y_pred, scores)
+
+    return y_pred, np.asarray(scores, dtype=np.float64)
+
+
+def compute_threshold_sweep(upload: dict, payload: ThresholdSweepRequest) -> dict:
+    """
+    Sweep n_thresholds evenly spaced thresholds over the positive-class
+    scores. Every attribute costs one sort plus cumulative sums
+    (group_threshold_counts), not one audit per threshold.
+    """
+    sensitive_columns = list(payload.sensitive_columns)
+    target = payload.target_column
+    all_columns = upload["dataset_columns"]
+    feature_columns = [c for c in all_columns if c != target]
+
+    wanted = {target, *sensitive_columns}
+    df = load_dataset(
+        upload["dataset_filename"], columns=[c for c in all_columns if c in wanted]
+    )
+    bins = load_upload_bins(upload, requested_bin_specs(payload), df)
+
+    df, target_info = encode_target_column(df, target)
+    if target_info["audit_mode"] != "binary":
+        raise ValueError("Threshold analysis supports binary targets only")
+
+    sensitive_info = validate_sensitive_columns(df, sensitive_columns)
+    sensitive_groups = sensitive_group_codes(df, sensitive_columns, bins)
+
+    _, scores = predictions_with_scores(upload, df, feature_columns, target)
+    y_true = df[target].astype(int).to_numpy()
+    thresholds = threshold_grid(payload.n_thresholds)
+
+    def rounded(values):
+        return np.round(values, 4).tolist()
+
+    overall = group_threshold_counts(np.zeros(len(df)), 1, y_true, scores, [0.0])
+
+    sweep = {}
+    for sensitive, (codes, labels) in sensitive_groups.items():
+        counts = group_threshold_counts(codes, len(labels), y_true, scores, thresholds)
+        curves = fairness_threshold_curves(counts, thresholds)
+
+        sweep[sensitive] = {
+            "dpd": rounded(curves["dpd"]),
+            "eod": rounded(curves["eod"]),
+            "dir": rounded(curves["dir"]),
+            "groups": {
+                label: {
+                    "count": int(counts["positives"][g] + counts["negatives"][g]),
+                    "auc": round(float(counts["auc"][g]), 4),
+                    "selection_rate": rounded(curves["selection_rate"][g]),
+                    "true_positive_rate": rounded(curves["true_positive_rate"][g]),
+                    "false_positive_rate": rounded(curves["false_positive_rate"][g]),
+                }
+                for g, label in enumerate(labels)
+            },
+        }
+
+    return {
+        "status": "success",
+        "target_info": target_info,
+        "sensitive_attributes": sensitive_info,
+        "sensitive_bins": fitted_bins(bins),
+        "thresholds": rounded(thresholds),
+        "auc": round(float(overall["auc"][0]), 4),
+        "threshold_audit": sweep,
+    }
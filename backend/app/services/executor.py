@@ -0,0 +1,124 @@
+import asyncio
+import multiprocessing
+import queue
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from app.config import settings
+
+
+class WorkerPoolBusyError(RuntimeError):
+    """Raised when the worker queue is full and new work must be rejected."""
+
+
+_executor: Executor | None = None
+_manager = None
+_semaphore: asyncio.Semaphore | None = None
+_queued = 0
+
+
+def get_executor() -> Executor:
+    global _executor
+
+    if _executor is None:
+        if settings.WORKER_POOL_KIND == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.WORKER_POOL_SIZE)
+        elif settings.WORKER_POOL_KIND == "thread":
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.WORKER_POOL_SIZE,
+                thread_name_prefix="biasbuster-worker",
+            )
+        else:
+            raise ValueError(
+                f"Unknown WORKER_POOL_KIND '{settings.WORKER_POOL_KIND}' "
+                "(expected 'thread' or 'process')"
+            )
+
+    return _executor
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.WORKER_MAX_CONCURRENT_TASKS)
+    return _semaphore
+
+
+def worker_pool_stats() -> dict:
+    semaphore = _get_semaphore()
+    return {
+        "kind": settings.WORKER_POOL_KIND,
+        "max_concurrent": settings.WORKER_MAX_CONCURRENT_TASKS,
+        "max_queued": settings.WORKER_MAX_QUEUED_TASKS,
+        "queued": _queued,
+        "available_slots": semaphore._value,
+    }
+
+
+async def run_in_worker(func, *args, **kwargs):
+    """
+    Run a CPU-bound callable off the event loop.
+
+    At most WORKER_MAX_CONCURRENT_TASKS calls run at once; up to
+    WORKER_MAX_QUEUED_TASKS more may wait for a slot. Anything beyond that
+    is rejected with WorkerPoolBusyError so callers can return 503.
+    For the process pool, func and its arguments must be picklable.
+    """
+    global _queued
+
+    semaphore = _get_semaphore()
+
+    if semaphore.locked() and _queued >= settings.WORKER_MAX_QUEUED_TASKS:
+        raise WorkerPoolBusyError(
+            "Server is busy processing other audits. Please retry shortly."
+        )
+
+    _queued += 1
+    try:
+        await semaphore.acquire()
+    finally:
+        _queued -= 1
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+    finally:
+        semaphore.release()
+
+
+class QueueProgress:
+    """Picklable progress callback that forwards (step, name) into a queue."""
+
+    def __init__(self, progress_queue):
+        self.queue = progress_queue
+
+    def __call__(self, step: int, name: str):
+        self.queue.put_nowait((step, name))
+
+
+def make_progress_queue():
+    """
+    Queue that work running in the pool can report progress into:
+    a plain queue for threads, a manager proxy for worker processes.
+    """
+    global _manager
+
+    if settings.WORKER_POOL_KIND != "process":
+        return queue.Queue()
+
+    if _manager is None:
+        _manager = multiprocessing.Manager()
+    return _manager.Queue()
+
+
+def shutdown_executor():
+    global _executor, _semaphore, _manager
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    if _manager is not None:
+        _manager.shutdown()
+    _executor = None
+    _semaphore = None
+    _manager = None
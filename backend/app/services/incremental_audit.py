@@ -0,0 +1,259 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, update as sa_update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sklearn.pipeline import Pipeline
+
+from app.config import settings
+from app.models.bias import AuditState
+from app.models.models import UploadRecord
+from app.services.audit_state import INTERSECTIONAL_TABLE
+from app.services.bias_service import (
+    finalize_audit,
+    fit_sensitive_bins,
+    fitted_bins,
+    intersectional_codes,
+    load_base_model,
+    load_upload_encoder,
+    model_feature_columns,
+    sensitive_group_codes,
+    upload_info,
+)
+from app.services.executor import run_in_worker
+from app.utils.fairness_metrics import group_confusion_counts
+from app.utils.file_validation import save_upload_file
+from app.utils.prediction import predict_labels
+from app.utils.sensitive_preprocessing import bin_specs, remap_group_codes
+from app.utils.sensitive_validation import check_sensitive_columns_exist
+from app.utils.target_encoder import build_target_mapping, encode_target_column
+
+
+# appends retried this many times when concurrent appends keep winning
+APPEND_MAX_ATTEMPTS = 5
+
+
+def _state_info(state: AuditState) -> dict:
+    # plain, picklable view of the state for the worker pool
+    return {
+        "target_column": state.target_column,
+        "sensitive_columns": state.sensitive_columns,
+        "target_info": state.target_info,
+        "sensitive_info": state.sensitive_info,
+        "dataset_health": state.dataset_health,
+        "group_tables": state.group_tables,
+        "intersectional": "intersectional_audit" in (state.result or {}),
+        "intersectional_table": state.intersectional_table,
+        "total_rows": state.total_rows,
+        "predicted_positives": state.predicted_positives,
+        "sensitive_bins": (state.result or {}).get("sensitive_bins"),
+    }
+
+
+async def append_to_audit(state: AuditState, upload_file, session: AsyncSession) -> dict:
+    """
+    Fold newly scored rows into a stored audit: only the appended rows are
+    read and predicted; metrics are recomputed from the updated counts.
+    """
+    record = await session.get(UploadRecord, state.upload_id)
+    if record is None:
+        raise ValueError("Upload record not found")
+
+    path = await save_upload_file(
+        upload_file, subdir="appends", max_bytes=settings.MAX_CSV_SIZE_BYTES
+    )
+    try:
+        for _ in range(APPEND_MAX_ATTEMPTS):
+            version = state.version or 0
+            update = await run_in_worker(
+                compute_audit_append, upload_info(record), _state_info(state), path
+            )
+            # compare-and-swap: a concurrent append that committed first
+            # bumped the version, so fold these rows into its counts instead
+            swapped = await session.execute(
+                sa_update(AuditState)
+                .where(AuditState.id == state.id, AuditState.version == version)
+                .values(
+                    group_tables=update["group_tables"],
+                    intersectional_table=update["intersectional_table"],
+                    target_info=update["target_info"],
+                    sensitive_info=update["sensitive_info"],
+                    total_rows=update["total_rows"],
+                    predicted_positives=update["predicted_positives"],
+                    appended_rows=func.coalesce(AuditState.appended_rows, 0) + update["appended_rows"],
+                    append_count=func.coalesce(AuditState.append_count, 0) + 1,
+                    version=version + 1,
+                    result=update["result"],
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            await session.refresh(state)
+            if swapped.rowcount == 1:
+                break
+        else:
+            raise ValueError("Audit is being updated concurrently, please retry")
+    finally:
+        path.unlink(missing_ok=True)
+
+    return {
+        **update["result"],
+        "audit_state_id": state.id,
+        "appended_rows": update["appended_rows"],
+        "total_rows": state.total_rows,
+        "append_count": state.append_count,
+    }
+
+
+def _read_appended_rows(csv_path: Path, dtypes: dict | None) -> pd.DataFrame:
+    try:
+        return pd.read_csv(csv_path, dtype=dtypes or None)
+    except UnicodeDecodeError as e:
+        raise ValueError("Unreadable CSV encoding. Please upload UTF-8 encoded CSV.") from e
+    except pd.errors.EmptyDataError as e:
+        raise ValueError("CSV is empty.") from e
+    except Exception as e:
+        raise ValueError(f"Failed to parse CSV: {e}") from e
+
+
+def compute_audit_append(upload: dict, state: dict, csv_path: Path) -> dict:
+    """
+    Predict the appended rows, add their per-group confusion counts to the
+    stored ones and finalize the audit from the merged counts.
+    Cost is proportional to the appended rows.
+    """
+    target = state["target_column"]
+    sensitive_columns = state["sensitive_columns"]
+    if state["intersectional"] and state["intersectional_table"] is None:
+        raise ValueError(
+            "This intersectional audit was stored without its subgroup counts. "
+            "Please re-run bias detection (on a new upload if rows were already "
+            "appended) before appending rows."
+        )
+
+    df = _read_appended_rows(csv_path, upload["dataset_dtypes"])
+    if target not in df.columns:
+        raise ValueError(f"Target column '{target}' not found in appended data")
+    check_sensitive_columns_exist(df.columns, sensitive_columns)
+
+    target_mapping = build_target_mapping(state["target_info"]["classes"])
+    df, delta_target_info = encode_target_column(df, target, target_mapping)
+    if df[target].isna().any():
+        raise ValueError("Appended rows contain target values not seen in the original audit")
+    if df.empty:
+        raise ValueError("Appended data contains no auditable rows")
+
+    # -------------------------------------------------
+    # Predict the appended rows only
+    # -------------------------------------------------
+    model = load_base_model(upload)
+    feature_columns = [c for c in upload["dataset_columns"] if c != target]
+    model_features = model_feature_columns(model, feature_columns)
+
+    missing = [c for c in model_features if c not in df.columns]
+    if missing:
+        raise ValueError(f"Appended data is missing model features: {missing}")
+
+    # the upload's encoder gives appended rows the original audit's codes
+    X = df[model_features]
+    if isinstance(model, Pipeline):
+        X_infer = X
+    else:
+        X_infer = load_upload_encoder(upload).transform(X)
+
+    y_pred = np.nan_to_num(predict_labels(model, X_infer)).astype(int)
+    y_true = df[target].astype(int).to_numpy()
+
+    # -------------------------------------------------
+    # Merge per-group counts (new groups are appended)
+    # -------------------------------------------------
+    # appended rows are binned with the original audit's bins; states from
+    # before bins were reported used the default ones
+    if state["sensitive_bins"] is None:
+        bins = fit_sensitive_bins(df, bin_specs(sensitive_columns))
+    else:
+        bins = {col: (fitted, None) for col, fitted in state["sensitive_bins"].items()}
+
+    group_codes = sensitive_group_codes(df, sensitive_columns, bins)
+    group_tables = {}
+    for sensitive, (codes, labels) in group_codes.items():
+        stored = state["group_tables"][sensitive]
+        known = list(stored["labels"])
+        known += [label for label in labels if label not in set(known)]
+
+        counts = np.zeros((len(known), 4), dtype=np.int64)
+        counts[: len(stored["counts"])] = np.asarray(stored["counts"], dtype=np.int64).reshape(-1, 4)
+
+        codes = remap_group_codes(codes, labels, known)
+        counts += group_confusion_counts(codes, len(known), y_true, y_pred)
+        group_tables[sensitive] = (counts, known)
+
+    sensitive_info = {}
+    for col in sensitive_columns:
+        groups = list(state["sensitive_info"][col]["groups"])
+        groups += [g for g in map(str, df[col].dropna().unique()) if g not in set(groups)]
+        sensitive_info[col] = {"unique_gropus": len(groups), "groups": groups}
+
+    target_info = {
+        **state["target_info"],
+        "dropped_rows": state["target_info"]["dropped_rows"] + delta_target_info["dropped_rows"],
+    }
+
+    total_rows = state["total_rows"] + len(df)
+    predicted_positives = state["predicted_positives"] + int(y_pred.sum())
+
+    result = finalize_audit(
+        group_tables,
+        positive_rate=predicted_positives / total_rows,
+        total_rows=total_rows,
+        dataset_health=state["dataset_health"],
+        target_info=target_info,
+        sensitive_info=sensitive_info,
+        intersectional=_merge_subgroup_table(
+            state["intersectional_table"], group_codes, y_true, y_pred
+        ),
+        sensitive_bins=fitted_bins(bins),
+    )
+
+    return {
+        "group_tables": {
+            col: {"labels": labels, "counts": counts.tolist()}
+            for col, (counts, labels) in group_tables.items()
+        },
+        "intersectional_table": result.pop(INTERSECTIONAL_TABLE, None),
+        "target_info": target_info,
+        "sensitive_info": sensitive_info,
+        "total_rows": total_rows,
+        "predicted_positives": predicted_positives,
+        "appended_rows": len(df),
+        "result": result,
+    }
+
+
+def _merge_subgroup_table(table: dict | None, group_codes: dict, y_true, y_pred):
+    """
+    Stored intersectional counts (see subgroup_table) plus the appended
+    rows', as the ((subgroups, 4) counts, column -> labels) finalize_audit
+    takes. New groups are appended to each attribute's labels, so stored
+    subgroups keep their label indices.
+    """
+    if table is None:
+        return None
+
+    column_labels = {}
+    codes_by_column = {}
+    for col, known in table["labels"].items():
+        codes, labels = group_codes[col]
+        known = list(known)
+        known += [label for label in labels if label not in set(known)]
+        column_labels[col] = known
+        codes_by_column[col] = remap_group_codes(codes, labels, known)
+
+    codes, n_subgroups = intersectional_codes(codes_by_column, column_labels)
+    counts = group_confusion_counts(codes, n_subgroups, y_true, y_pred)
+
+    subgroups = np.asarray(table["subgroups"], dtype=np.int64).reshape(-1, len(column_labels))
+    stored = np.ravel_multi_index(tuple(subgroups.T), [len(v) for v in column_labels.values()])
+    counts[stored] += np.asarray(table["counts"], dtype=np.int64).reshape(-1, 4)
+    return counts, column_labels
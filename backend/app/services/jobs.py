@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import queue
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.models.bias import AuditJob
+from app.models.models import UploadRecord
+from app.schemas.bias import BiasDetectRequest
+from app.services.bias_service import PIPELINE_STEPS, run_bias_detection
+from app.services.executor import (
+    QueueProgress,
+    WorkerPoolBusyError,
+    make_progress_queue,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when too many audit jobs are already waiting."""
+
+
+_job_queue: asyncio.Queue | None = None
+_workers: list[asyncio.Task] = []
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+async def submit_audit_job(payload: BiasDetectRequest, session: AsyncSession) -> AuditJob:
+    if _job_queue is None:
+        raise RuntimeError("Audit job workers are not running")
+
+    if _job_queue.full():
+        raise JobQueueFullError(
+            "Too many audit jobs are queued. Please retry shortly."
+        )
+
+    record = await session.get(UploadRecord, payload.upload_id)
+    if not record:
+        raise ValueError("Upload record not found")
+
+    job = AuditJob(
+        id=uuid.uuid4().hex,
+        upload_id=payload.upload_id,
+        status="queued",
+        request=payload.model_dump(),
+    )
+    session.add(job)
+    await session.commit()
+    await session.refresh(job)
+
+    try:
+        _job_queue.put_nowait(job.id)
+    except asyncio.QueueFull:
+        # filled up while the job was being stored (e.g. by re-queued jobs)
+        job.status = "failed"
+        job.error = "Audit job queue was full"
+        job.finished_at = _now()
+        await session.commit()
+        raise JobQueueFullError(
+            "Too many audit jobs are queued. Please retry shortly."
+        )
+    return job
+
+
+async def get_audit_job(job_id: str, session: AsyncSession) -> AuditJob | None:
+    return await session.get(AuditJob, job_id)
+
+
+async def _update_job(job_id: str, **values):
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(AuditJob).where(AuditJob.id == job_id).values(**values)
+        )
+        await session.commit()
+
+
+async def _pump_progress(job_id: str, progress_queue, done: asyncio.Event):
+    # progress_queue is filled from the worker pool; poll it and persist
+    # the latest step so GET /jobs/{id} can show where the audit is.
+    while True:
+        latest = None
+        while True:
+            try:
+                latest = progress_queue.get_nowait()
+            except queue.Empty:
+                break
+
+        if latest is not None:
+            step, name = latest
+            await _update_job(
+                job_id,
+                current_step=step,
+                step_name=name,
+                progress=round((step - 1) / len(PIPELINE_STEPS), 3),
+            )
+
+        if done.is_set():
+            return
+        await asyncio.sleep(settings.JOB_PROGRESS_POLL_SECONDS)
+
+
+async def _run_job(job_id: str):
+    async with AsyncSessionLocal() as session:
+        job = await session.get(AuditJob, job_id)
+        if job is None or job.status not in ("queued", "running"):
+            return
+        payload = BiasDetectRequest(**job.request)
+
+    await _update_job(job_id, status="running", started_at=_now(), error=None)
+
+    progress_queue = make_progress_queue()
+    done = asyncio.Event()
+    pump = asyncio.create_task(_pump_progress(job_id, progress_queue, done))
+
+    try:
+        while True:
+            try:
+                async with AsyncSessionLocal() as session:
+                    result = await run_bias_detection(
+                        payload, session, progress=QueueProgress(progress_queue)
+                    )
+                break
+            except WorkerPoolBusyError:
+                # interactive requests filled the pool; jobs can wait
+                await asyncio.sleep(settings.JOB_PROGRESS_POLL_SECONDS)
+    except Exception as exc:
+        done.set()
+        await pump
+        await _update_job(
+            job_id, status="failed", error=str(exc), finished_at=_now()
+        )
+        return
+
+    done.set()
+    await pump
+    await _update_job(
+        job_id,
+        status="succeeded",
+        current_step=len(PIPELINE_STEPS),
+        step_name=PIPELINE_STEPS[len(PIPELINE_STEPS)],
+        progress=1.0,
+        result=result,
+        finished_at=_now(),
+    )
+
+
+async def _job_worker():
+    while True:
+        job_id = await _job_queue.get()
+        try:
+            await _run_job(job_id)
+        except Exception as exc:
+            # never let one broken job kill the worker, not even when the
+            # failure cannot be recorded (e.g. the database is down)
+            logger.exception("Audit job %s failed", job_id)
+            try:
+                await _update_job(
+                    job_id, status="failed", error=str(exc), finished_at=_now()
+                )
+            except Exception:
+                logger.exception("Could not mark audit job %s as failed", job_id)
+        finally:
+            _job_queue.task_done()
+
+
+async def _requeue(job_ids: list[str]):
+    # more pending jobs than JOB_QUEUE_MAX_SIZE are fed in as slots free up
+    for job_id in job_ids:
+        await _job_queue.put(job_id)
+
+
+async def start_job_workers():
+    """
+    Start the local audit job workers and re-queue jobs that were still
+    queued or running when the process last stopped.
+    """
+    global _job_queue, _workers
+
+    _job_queue = asyncio.Queue(maxsize=settings.JOB_QUEUE_MAX_SIZE)
+
+    async with AsyncSessionLocal() as session:
+        pending = (
+            await session.execute(
+                select(AuditJob.id)
+                .where(AuditJob.status.in_(("queued", "running")))
+                .order_by(AuditJob.created_at)
+            )
+        ).scalars().all()
+
+    _workers = [
+        asyncio.create_task(_job_worker()) for _ in range(settings.JOB_WORKERS)
+    ]
+    if pending:
+        _workers.append(asyncio.create_task(_requeue(pending)))
+
+
+async def stop_job_workers():
+    global _job_queue, _workers
+
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+
+    _workers = []
+    _job_queue = None
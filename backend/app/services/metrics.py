@@ -0,0 +1,87 @@
+import bisect
+import threading
+
+from app.services.executor import worker_pool_stats
+from app.utils.model_loader import model_cache_stats
+
+# seconds; upper bounds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Minimal Prometheus histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.series: dict[tuple, list] = {}  # labels -> [bucket counts, sum, count]
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect.bisect_left(LATENCY_BUCKETS, value)
+        with _lock:
+            entry = self.series.setdefault(labels, [[0] * len(LATENCY_BUCKETS), 0.0, 0])
+            if index < len(LATENCY_BUCKETS):
+                entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            for labels, (buckets, total, count) in sorted(self.series.items()):
+                label_str = ",".join(
+                    f'{k}="{v}"' for k, v in zip(self.label_names, labels)
+                )
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS, buckets):
+                    cumulative += n
+                    lines.append(f'{self.name}_bucket{{{label_str},le="{bound}"}} {cumulative}')
+                lines.append(f'{self.name}_bucket{{{label_str},le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{label_str}}} {total:.6f}")
+                lines.append(f"{self.name}_count{{{label_str}}} {count}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "biasbuster_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status"),
+)
+STAGE_LATENCY = Histogram(
+    "biasbuster_stage_duration_seconds",
+    "Wall time of upload and audit pipeline stages",
+    ("pipeline", "stage"),
+)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    REQUEST_LATENCY.observe((method, route, str(status)), seconds)
+
+
+def observe_stages(pipeline: str, timings: dict | None):
+    if not timings:
+        return
+    for name, entry in timings["stages"].items():
+        STAGE_LATENCY.observe((pipeline, name), entry["wall_ms"] / 1000)
+
+
+def render_metrics() -> str:
+    pool = worker_pool_stats()
+    cache = model_cache_stats()
+
+    lines = REQUEST_LATENCY.render() + STAGE_LATENCY.render()
+    lines += [
+        "# HELP biasbuster_worker_queued_tasks Tasks waiting for a worker slot",
+        "# TYPE biasbuster_worker_queued_tasks gauge",
+        f"biasbuster_worker_queued_tasks {pool['queued']}",
+        "# HELP biasbuster_worker_available_slots Free worker slots",
+        "# TYPE biasbuster_worker_available_slots gauge",
+        f"biasbuster_worker_available_slots {pool['available_slots']}",
+        "# HELP biasbuster_model_cache_bytes Size on disk of cached models",
+        "# TYPE biasbuster_model_cache_bytes gauge",
+        f"biasbuster_model_cache_bytes {cache['bytes']}",
+    ]
+    return "\n".join(lines) + "\n"
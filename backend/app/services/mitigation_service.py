@@ -0,0 +1,310 @@
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.bias import MitigatedModel
+from app.models.models import UploadRecord
+from app.schemas.mitigation import MitigationRequest
+from app.services.bias_service import (
+    fitted_bins,
+    load_base_model,
+    load_upload_bins,
+    model_inputs,
+    predictions_with_scores,
+    requested_bin_specs,
+    sensitive_group_codes,
+    take_rows,
+    upload_info,
+)
+from app.services.executor import run_in_worker
+from app.utils.bias_decision import evaluate_bias
+from app.utils.dataset_loader import load_dataset
+from app.utils.fairness_metrics import (
+    demographic_parity_difference,
+    disparate_impact_ratio,
+    equal_opportunity_difference,
+    group_confusion_counts,
+    summarize_group_counts,
+)
+from app.utils.file_hashing import file_sha256
+from app.utils.mitigation import (
+    attach_base_estimator,
+    fit_exponentiated_gradient,
+    fit_threshold_optimizer,
+)
+from app.utils.model_loader import MODEL_DIR
+from app.utils.sensitive_validation import validate_sensitive_columns
+from app.utils.target_encoder import encode_target_column
+
+
+async def run_mitigation(payload: MitigationRequest, session: AsyncSession) -> dict:
+    """
+    Fit one mitigated model per requested constraint, store each as a new
+    artifact with before/after metrics, and return them for comparison.
+    """
+    record = (
+        await session.execute(
+            select(UploadRecord).where(UploadRecord.id == payload.upload_id)
+        )
+    ).scalar_one_or_none()
+
+    if not record:
+        raise ValueError("Upload record not found")
+    if not record.model_supports_predict_proba:
+        raise ValueError("Bias mitigation needs a model that supports predict_proba")
+
+    result = await run_in_worker(compute_mitigation, upload_info(record), payload)
+
+    rows = [
+        MitigatedModel(
+            upload_id=record.id,
+            method=candidate["method"],
+            constraint=candidate["constraint"],
+            objective=candidate["objective"],
+            target_column=payload.target_column,
+            sensitive_columns=result["sensitive_columns"],
+            sensitive_bins=result["sensitive_bins"],
+            model_filename=candidate["model_filename"],
+            model_sha256=candidate["model_sha256"],
+            metrics_before=result["before"],
+            metrics_after=candidate["metrics"],
+            evaluation=result["evaluation"],
+        )
+        for candidate in result["candidates"]
+    ]
+    session.add_all(rows)
+    await session.commit()
+
+    before = result["before"]
+    return {
+        "status": "success",
+        "upload_id": record.id,
+        "sensitive_columns": result["sensitive_columns"],
+        "sensitive_bins": result["sensitive_bins"],
+        "evaluation": result["evaluation"],
+        "before": before,
+        "mitigated_models": [
+            {
+                "id": row.id,
+                "method": row.method,
+                "constraint": row.constraint,
+                "objective": row.objective,
+                "metrics": row.metrics_after,
+                "accuracy_change": round(
+                    row.metrics_after["accuracy"] - before["accuracy"], 4
+                ),
+                "severity_change": round(
+                    row.metrics_after["bias_severity_score"]
+                    - before["bias_severity_score"],
+                    2,
+                ),
+            }
+            for row in rows
+        ],
+        "next_step": "model_selection",
+    }
+
+
+async def list_mitigated_models(upload_id: int, session: AsyncSession) -> list[MitigatedModel]:
+    return (
+        await session.execute(
+            select(MitigatedModel)
+            .where(MitigatedModel.upload_id == upload_id)
+            .order_by(MitigatedModel.id)
+        )
+    ).scalars().all()
+
+
+async def get_mitigated_model(model_id: int, session: AsyncSession) -> MitigatedModel | None:
+    return await session.get(MitigatedModel, model_id)
+
+
+def _prediction_metrics(group_codes: dict, y_true: np.ndarray, y_pred: np.ndarray) -> dict:
+    """Accuracy plus DPD/EOD/DIR per attribute for one set of predictions."""
+    sensitive_audit = {}
+    for sensitive, (codes, labels) in group_codes.items():
+        counts = group_confusion_counts(codes, len(labels), y_true, y_pred)
+        group_metrics = summarize_group_counts(counts, labels)
+
+        dpd = demographic_parity_difference(group_metrics["selection_rate"])
+        eod = equal_opportunity_difference(group_metrics["true_positive_rate"])
+        dir_ratio = disparate_impact_ratio(group_metrics["selection_rate"])
+        decision = evaluate_bias(dpd, eod, dir_ratio)
+
+        sensitive_audit[sensitive] = {
+            "selection_rate": group_metrics["selection_rate"],
+            "true_positive_rate": group_metrics["true_positive_rate"],
+            "dpd": round(dpd, 4),
+            "eod": round(eod, 4),
+            "dir": round(dir_ratio, 4),
+            "biased": decision["bias_present"],
+            "severity_score": decision["severity_score"],
+        }
+
+    severity = max(a["severity_score"] for a in sensitive_audit.values())
+    return {
+        "accuracy": round(float((y_true == y_pred).mean()), 4),
+        "positive_rate": round(float(y_pred.mean()), 4),
+        "bias_present": severity > 0,
+        "bias_severity_score": severity,
+        "sensitive_audit": sensitive_audit,
+    }
+
+
+def _holdout_split(y_true: np.ndarray, seed) -> tuple[np.ndarray | None, np.ndarray | None]:
+    """
+    (fit rows, held-out rows) of a split stratified by target, or
+    (None, None) when MITIGATION_TEST_SIZE is 0 (fit and report in-sample).
+    """
+    test_size = settings.MITIGATION_TEST_SIZE
+    if test_size <= 0:
+        return None, None
+    try:
+        fit_rows, test_rows = train_test_split(
+            np.arange(len(y_true)), test_size=test_size, stratify=y_true, random_state=seed
+        )
+    except ValueError as e:
+        raise ValueError(f"Too few rows to hold out {test_size:.0%} for evaluation: {e}") from e
+    return np.sort(fit_rows), np.sort(test_rows)
+
+
+def compute_mitigation(upload: dict, payload: MitigationRequest) -> dict:
+    """
+    The base model predicts once (or not at all, with cached scores).
+    ThresholdOptimizer fits only need those scores, so every constraint is
+    fitted on a one-column score matrix; fits run across MITIGATION_WORKERS
+    processes when > 1. ExponentiatedGradient, when requested, retrains
+    the base model on the features.
+
+    Mitigators are fitted on a seeded, target-stratified split; before and
+    after metrics are computed on the MITIGATION_TEST_SIZE rows held out.
+    """
+    sensitive_columns = list(payload.sensitive_columns)
+    target = payload.target_column
+    all_columns = upload["dataset_columns"]
+    feature_columns = [c for c in all_columns if c != target]
+
+    wanted = {target, *sensitive_columns}
+    df = load_dataset(
+        upload["dataset_filename"], columns=[c for c in all_columns if c in wanted]
+    )
+    bins = load_upload_bins(upload, requested_bin_specs(payload), df)
+
+    df, target_info = encode_target_column(df, target)
+    if target_info["audit_mode"] != "binary":
+        raise ValueError("Bias mitigation supports binary targets only")
+
+    validate_sensitive_columns(df, sensitive_columns)
+    group_codes = sensitive_group_codes(df, sensitive_columns, bins)
+    # fairlearn takes the group labels themselves, gathered once per attribute
+    sensitive_features = pd.DataFrame(
+        {
+            col: np.asarray(labels, dtype=object)[codes]
+            for col, (codes, labels) in group_codes.items()
+        }
+    )
+
+    y_true = df[target].astype(int).to_numpy()
+    y_pred, scores = predictions_with_scores(upload, df, feature_columns, target)
+    seed = settings.MITIGATION_SEED
+
+    fit_rows, test_rows = _holdout_split(y_true, seed)
+    fit_sensitive = take_rows(sensitive_features, fit_rows)
+    holdout = None
+    if test_rows is not None:
+        holdout = (take_rows(scores, test_rows), take_rows(sensitive_features, test_rows))
+
+    tasks = [
+        (
+            "threshold_optimizer",
+            constraint,
+            payload.objective,
+            fit_threshold_optimizer,
+            (
+                take_rows(scores, fit_rows),
+                take_rows(y_true, fit_rows),
+                fit_sensitive,
+                constraint,
+                payload.objective,
+                seed,
+                holdout,
+            ),
+        )
+        for constraint in dict.fromkeys(payload.constraints)
+    ]
+
+    if payload.include_reductions:
+        model, X_infer = model_inputs(upload, df, feature_columns)
+        tasks += [
+            (
+                "exponentiated_gradient",
+                constraint,
+                None,
+                fit_exponentiated_gradient,
+                (
+                    model,
+                    take_rows(X_infer, fit_rows),
+                    take_rows(y_true, fit_rows),
+                    fit_sensitive,
+                    constraint,
+                    seed,
+                    take_rows(X_infer, test_rows) if test_rows is not None else None,
+                ),
+            )
+            for constraint in dict.fromkeys(payload.constraints)
+        ]
+
+    # before/after are both measured on the held-out rows
+    eval_codes = {
+        col: (take_rows(codes, test_rows), labels) for col, (codes, labels) in group_codes.items()
+    }
+    eval_true = take_rows(y_true, test_rows)
+
+    workers = min(settings.MITIGATION_WORKERS, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(fit, *args) for *_, fit, args in tasks]
+            fitted = [f.result() for f in futures]
+    else:
+        fitted = [fit(*args) for *_, fit, args in tasks]
+
+    base_model = load_base_model(upload)
+    candidates = []
+    for (method, constraint, objective, _, _), (mitigator, mitigated) in zip(tasks, fitted):
+        if method == "threshold_optimizer":
+            mitigator = attach_base_estimator(mitigator, base_model)
+
+        path = MODEL_DIR / f"{uuid.uuid4().hex}.joblib"
+        joblib.dump(mitigator, path)
+
+        candidates.append(
+            {
+                "method": method,
+                "constraint": constraint,
+                "objective": objective,
+                "model_filename": path.name,
+                "model_sha256": file_sha256(path),
+                "metrics": _prediction_metrics(eval_codes, eval_true, mitigated),
+            }
+        )
+
+    before = take_rows(np.asarray(y_pred, dtype=int), test_rows)
+    return {
+        "sensitive_columns": list(group_codes),
+        "sensitive_bins": fitted_bins(bins),
+        "evaluation": {
+            "method": "in_sample" if test_rows is None else "holdout",
+            "fit_rows": len(y_true) if fit_rows is None else len(fit_rows),
+            "evaluation_rows": len(eval_true),
+            "seed": seed,
+        },
+        "before": _prediction_metrics(eval_codes, eval_true, before),
+        "candidates": candidates,
+    }
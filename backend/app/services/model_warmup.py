@@ -0,0 +1,34 @@
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.models.models import UploadRecord
+from app.services.executor import run_in_worker
+from app.utils.model_loader import load_model
+
+
+async def warm_model_cache():
+    """
+    Preload the most recently uploaded models into the model cache so the
+    first audits after a restart skip the unpickling cost.
+    With a process pool this warms whichever worker picks each load up.
+    """
+    if settings.MODEL_CACHE_WARMUP_COUNT <= 0:
+        return
+
+    async with AsyncSessionLocal() as session:
+        rows = (
+            await session.execute(
+                select(UploadRecord.model_filename, UploadRecord.model_sha256)
+                .group_by(UploadRecord.model_filename, UploadRecord.model_sha256)
+                .order_by(func.max(UploadRecord.created_at).desc())
+                .limit(settings.MODEL_CACHE_WARMUP_COUNT)
+            )
+        ).all()
+
+    for filename, sha256 in rows:
+        try:
+            await run_in_worker(load_model, filename, sha256)
+        except Exception:
+            # missing/broken artifacts surface on the audit itself
+            continue
@@ -0,0 +1,282 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.models import UploadRecord
+from app.models.monitoring import MonitoringRun, MonitoringWindow, PredictionLog
+from app.schemas.monitoring import MonitoringRequest
+from app.services.bias_service import fit_sensitive_bins, sensitive_group_codes
+from app.services.executor import run_in_worker
+from app.utils.bias_decision import evaluate_bias_series
+from app.utils.dataset_loader import load_dataset
+from app.utils.file_hashing import file_sha256
+from app.utils.file_validation import save_upload_file, summarize_csv_file
+from app.utils.sensitive_preprocessing import bin_specs
+from app.utils.target_encoder import build_target_mapping, encode_target_column
+from app.utils.windowed_metrics import (
+    WINDOW_SECONDS,
+    bucket_group_counts,
+    bucket_start,
+    rolling_window_counts,
+    time_buckets,
+    window_fairness_metrics,
+)
+
+
+async def store_prediction_log(log_file, upload_id: int | None, session: AsyncSession) -> PredictionLog:
+    if upload_id is not None and await session.get(UploadRecord, upload_id) is None:
+        raise ValueError("Upload record not found")
+
+    path = await save_upload_file(
+        log_file, subdir="datasets", max_bytes=settings.MAX_CSV_SIZE_BYTES
+    )
+    try:
+        # logs are never model input: no feature encoder
+        info = await run_in_worker(summarize_csv_file, path, False)
+        sha256 = await run_in_worker(file_sha256, path)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".parquet").unlink(missing_ok=True)
+        raise
+
+    log = PredictionLog(
+        upload_id=upload_id,
+        filename=path.name,
+        columnar_filename=info["columnar_filename"],
+        rows=info["rows"],
+        column_names=info["column_names"],
+        dtypes=info["dtypes"],
+        sha256=sha256,
+    )
+    session.add(log)
+    await session.commit()
+    return log
+
+
+async def run_monitoring(payload: MonitoringRequest, session: AsyncSession) -> dict:
+    """
+    Fairness metrics per time window over a prediction log, stored as a
+    time series (one MonitoringWindow row per window and attribute).
+    """
+    log = await session.get(PredictionLog, payload.log_id)
+    if log is None:
+        raise ValueError("Prediction log not found")
+
+    computed = await run_in_worker(
+        compute_monitoring,
+        {"filename": log.filename, "column_names": log.column_names},
+        payload,
+    )
+
+    run = MonitoringRun(
+        log_id=log.id,
+        request=payload.model_dump(),
+        window_count=len(computed["series"]["window_start"]),
+        alert_count=len(computed["alerts"]),
+        dropped_rows=computed["dropped_rows"],
+    )
+    session.add(run)
+    await session.flush()
+
+    if computed["windows"]:
+        await session.execute(
+            insert(MonitoringWindow),
+            [{**window, "run_id": run.id} for window in computed["windows"]],
+        )
+    await session.commit()
+
+    return {
+        "status": "success",
+        "run_id": run.id,
+        "window": payload.window,
+        "step": payload.step or payload.window,
+        "window_count": run.window_count,
+        "dropped_rows": run.dropped_rows,
+        "alert_count": run.alert_count,
+        "alerts": computed["alerts"],
+        "series": computed["series"],
+    }
+
+
+async def get_monitoring_run(run_id: int, alerts_only: bool, session: AsyncSession) -> dict | None:
+    run = await session.get(MonitoringRun, run_id)
+    if run is None:
+        return None
+
+    query = select(MonitoringWindow).where(MonitoringWindow.run_id == run_id)
+    if alerts_only:
+        query = query.where(MonitoringWindow.alert.is_(True))
+    windows = (
+        await session.execute(
+            query.order_by(MonitoringWindow.sensitive_column, MonitoringWindow.window_start)
+        )
+    ).scalars().all()
+
+    columns = [c.name for c in MonitoringWindow.__table__.columns if c.name not in ("id", "run_id")]
+    return {
+        "run_id": run.id,
+        "log_id": run.log_id,
+        "request": run.request,
+        "window_count": run.window_count,
+        "alert_count": run.alert_count,
+        "dropped_rows": run.dropped_rows,
+        "created_at": run.created_at,
+        "windows": [{c: getattr(w, c) for c in columns} for w in windows],
+    }
+
+
+def _floats(values) -> list:
+    # JSON-safe: NaN (no comparable groups) becomes None
+    return [None if np.isnan(v) else round(float(v), 4) for v in values]
+
+
+def _parse_timestamps(values: pd.Series) -> pd.Series:
+    # a single inferred format is much faster; fall back to per-value parsing
+    parsed = pd.to_datetime(values, utc=True, errors="coerce")
+    if (parsed.isna() & values.notna()).any():
+        parsed = pd.to_datetime(values, utc=True, errors="coerce", format="mixed")
+    return parsed
+
+
+def compute_monitoring(log: dict, payload: MonitoringRequest) -> dict:
+    """
+    One pass per attribute: bincount rows into (time bucket, group)
+    confusion counts, prefix-sum over buckets, and read every window off
+    the prefix sums. Metrics and alerts are vectorized over all windows.
+    """
+    ts_col = payload.timestamp_column
+    target = payload.target_column
+    pred_col = payload.prediction_column
+    sensitive_columns = list(payload.sensitive_columns)
+
+    wanted = [ts_col, target, pred_col, *sensitive_columns]
+    missing = [c for c in wanted if c not in log["column_names"]]
+    if missing:
+        raise ValueError(f"Columns missing from prediction log: {missing}")
+
+    df = load_dataset(
+        log["filename"], columns=[c for c in log["column_names"] if c in set(wanted)]
+    )
+
+    timestamps = _parse_timestamps(df[ts_col])
+    valid = timestamps.notna()
+    dropped_rows = int((~valid).sum())
+    df = df[valid.to_numpy()]
+
+    df, target_info = encode_target_column(df, target)
+    if target_info["audit_mode"] != "binary":
+        raise ValueError("Monitoring supports binary targets only")
+
+    # predictions are encoded with the outcome's class mapping
+    df, prediction_info = encode_target_column(
+        df, pred_col, build_target_mapping(target_info["classes"])
+    )
+    if df[pred_col].isna().any():
+        raise ValueError("Prediction column contains values that are not target classes")
+    if df.empty:
+        raise ValueError("Prediction log contains no usable rows")
+
+    dropped_rows += target_info["dropped_rows"] + prediction_info["dropped_rows"]
+
+    step = payload.step or payload.window
+    size = WINDOW_SECONDS[payload.window] // WINDOW_SECONDS[step]
+    buckets, first_bucket = time_buckets(timestamps[df.index], step)
+    # only buckets holding rows are materialized: a stray timestamp decades
+    # away must not allocate every bucket in between
+    occupied, bucket_index = np.unique(buckets, return_inverse=True)
+
+    y_true = df[target].astype(int).to_numpy()
+    y_pred = df[pred_col].astype(int).to_numpy()
+
+    series = {}
+    windows = []
+    alerts = []
+    window_start = window_end = None
+
+    # a log is not an upload: the default bins (age) are fitted on it directly
+    bins = fit_sensitive_bins(df, bin_specs(sensitive_columns))
+    for sensitive, (codes, group_labels) in sensitive_group_codes(df, sensitive_columns, bins).items():
+        counts = bucket_group_counts(
+            bucket_index, len(occupied), codes, len(group_labels), y_true, y_pred
+        )
+        window_counts, starts = rolling_window_counts(counts, size, occupied)
+        # groups below MIN_GROUP_SIZE in a window are left out, as in audits
+        metrics = window_fairness_metrics(window_counts, settings.MIN_GROUP_SIZE)
+        decision = evaluate_bias_series(metrics["dpd"], metrics["eod"], metrics["dir"])
+
+        # every attribute sees all rows, so empty windows are the same for all
+        keep = np.flatnonzero(metrics["rows"] > 0)
+        if window_start is None:
+            window_start = bucket_start(first_bucket + starts[keep], step).to_pydatetime()
+            window_end = bucket_start(first_bucket + starts[keep] + size, step).to_pydatetime()
+
+        violations = {k: v[keep] for k, v in decision["violations"].items()}
+        alert = decision["bias_present"][keep]
+        rates = metrics["selection_rate"][keep]
+        group_counts = metrics["group_counts"][keep]
+
+        series[sensitive] = {
+            "rows": metrics["rows"][keep].tolist(),
+            "positive_rate": _floats(metrics["positive_rate"][keep]),
+            "accuracy": _floats(metrics["accuracy"][keep]),
+            "dpd": _floats(metrics["dpd"][keep]),
+            "eod": _floats(metrics["eod"][keep]),
+            "dir": _floats(metrics["dir"][keep]),
+            "severity_score": decision["severity_score"][keep].tolist(),
+            "alert": alert.tolist(),
+            "groups_skipped": metrics["groups_skipped"][keep].tolist(),
+        }
+
+        s = series[sensitive]
+        for i in range(len(keep)):
+            violated = {k: bool(v[i]) for k, v in violations.items()}
+            present = np.flatnonzero(group_counts[i])
+            windows.append(
+                {
+                    "sensitive_column": sensitive,
+                    "window_start": window_start[i],
+                    "window_end": window_end[i],
+                    "rows": s["rows"][i],
+                    "positive_rate": s["positive_rate"][i],
+                    "accuracy": s["accuracy"][i],
+                    "dpd": s["dpd"][i],
+                    "eod": s["eod"][i],
+                    "dir": s["dir"][i],
+                    "severity_score": s["severity_score"][i],
+                    "alert": s["alert"][i],
+                    "groups_skipped": s["groups_skipped"][i],
+                    "violations": violated,
+                    "selection_rate": {
+                        group_labels[g]: round(float(rates[i, g]), 4) for g in present
+                    },
+                    "group_counts": {
+                        group_labels[g]: int(group_counts[i, g]) for g in present
+                    },
+                }
+            )
+            if s["alert"][i]:
+                alerts.append(
+                    {
+                        "sensitive_column": sensitive,
+                        "window_start": window_start[i].isoformat(),
+                        "window_end": window_end[i].isoformat(),
+                        "dpd": s["dpd"][i],
+                        "eod": s["eod"][i],
+                        "dir": s["dir"][i],
+                        "severity_score": s["severity_score"][i],
+                        "violations": [k for k, v in violated.items() if v],
+                    }
+                )
+
+    return {
+        "dropped_rows": dropped_rows,
+        "series": {
+            "window_start": [t.isoformat() for t in window_start],
+            "window_end": [t.isoformat() for t in window_end],
+            **series,
+        },
+        "windows": windows,
+        "alerts": alerts,
+    }
@@ -0,0 +1,231 @@
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.bias import AuditJob, AuditState, MitigatedModel
+from app.models.models import StoredFile, UploadRecord
+from app.models.monitoring import PredictionLog
+from app.services.executor import run_in_worker
+from app.utils.dataset_loader import DATASET_DIR, columnar_path
+from app.utils.model_loader import MODEL_DIR
+from app.utils.prediction_cache import PREDICTION_DIR
+
+APPENDS_DIR = Path(settings.TEMP_DIR) / "appends"
+
+
+async def _stored_file(session: AsyncSession, kind: str, sha256: str) -> StoredFile | None:
+    return (
+        await session.execute(
+            select(StoredFile).where(StoredFile.kind == kind, StoredFile.sha256 == sha256)
+        )
+    ).scalar_one_or_none()
+
+
+def _reusable(stored: StoredFile | None) -> bool:
+    if stored is None or stored.info is None:
+        return False
+    # a dataset's Parquet copy may have been removed since; summarize again
+    columnar = stored.info.get("columnar_filename")
+    return columnar is None or columnar_path(columnar).exists()
+
+
+async def acquire_file(
+    session: AsyncSession, kind: str, path: Path, sha256: str, describe, *args, refs: int = 1
+) -> dict:
+    """
+    Validation result of a stored upload (describe(path, *args), run in the
+    worker pool only for content not seen before) and `refs` more
+    references to it. Committed right away; release_file undoes it.
+    """
+    stored = await _stored_file(session, kind, sha256)
+    info = stored.info if _reusable(stored) else await run_in_worker(describe, path, *args)
+
+    for _ in range(2):
+        now = datetime.now(timezone.utc)
+        if stored is None:
+            session.add(
+                StoredFile(
+                    kind=kind,
+                    sha256=sha256,
+                    filename=path.name,
+                    size_bytes=path.stat().st_size,
+                    info=info,
+                    ref_count=refs,
+                    last_used_at=now,
+                )
+            )
+        else:
+            # atomic increment: concurrent uploads of the same content
+            await session.execute(
+                update(StoredFile)
+                .where(StoredFile.id == stored.id)
+                .values(ref_count=StoredFile.ref_count + refs, info=info, last_used_at=now)
+            )
+        try:
+            await session.commit()
+            return info
+        except IntegrityError:
+            # an identical upload registered the file first
+            await session.rollback()
+            stored = await _stored_file(session, kind, sha256)
+
+    raise ValueError("Could not register the uploaded file, please retry")
+
+
+async def release_file(session: AsyncSession, kind: str, filename: str, refs: int = 1):
+    """Drop references taken by acquire_file (files are removed by collect_garbage)."""
+    await session.execute(
+        update(StoredFile)
+        .where(StoredFile.kind == kind, StoredFile.filename == filename)
+        .values(ref_count=StoredFile.ref_count - refs)
+    )
+    await session.commit()
+
+
+async def discard_untracked(session: AsyncSession, kind: str, path: Path):
+    """Remove a stored upload (and derived files) unless it is tracked."""
+    if await _stored_file(session, kind, _stem(path.name)) is None:
+        for p in {path, *path.parent.glob(f"{_stem(path.name)}.*")}:
+            p.unlink(missing_ok=True)
+
+
+def _stem(name: str) -> str:
+    # <stem>.csv, <stem>.parquet, <stem>.encoder.json, <stem>.bins.<key>.npy
+    return name.split(".", 1)[0]
+
+
+def _sweep(directory: Path, keep: set[str], cutoff: float) -> tuple[int, int]:
+    """
+    Remove files of `directory` whose stem is not in `keep`, plus leftover
+    temporary files, unless modified after `cutoff`.
+    """
+    removed = freed = 0
+    if not directory.exists():
+        return removed, freed
+
+    for path in directory.iterdir():
+        orphan = _stem(path.name) not in keep or ".tmp" in path.suffixes
+        if not orphan:
+            continue
+        try:
+            if path.stat().st_mtime > cutoff:
+                continue
+            if path.is_dir():
+                size = sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+                shutil.rmtree(path)
+            else:
+                size = path.stat().st_size
+                path.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+        freed += size
+    return removed, freed
+
+
+def _sweep_all(keep: dict[Path, set[str]], cutoff: float) -> dict:
+    removed = freed = 0
+    for directory, stems in keep.items():
+        r, f = _sweep(directory, stems, cutoff)
+        removed += r
+        freed += f
+    return {"files_removed": removed, "bytes_freed": freed}
+
+
+async def collect_garbage(session: AsyncSession) -> dict:
+    """
+    Remove stored uploads no upload record references any more (ref_count
+    down to 0), together with their derived files (Parquet copy, encoder,
+    bins), plus untracked leftovers: failed or abandoned uploads, appended
+    rows, mitigated models and prediction caches of deleted uploads.
+    Files touched within UPLOAD_GC_GRACE_SECONDS are kept, so uploads still
+    being validated are never collected.
+    """
+    tracked = {
+        (kind, filename): refs
+        for kind, filename, refs in (
+            await session.execute(
+                select(StoredFile.kind, StoredFile.filename, StoredFile.ref_count)
+            )
+        ).all()
+    }
+    datasets = {f for (kind, f), refs in tracked.items() if kind == "dataset" and refs > 0}
+    models = {f for (kind, f), refs in tracked.items() if kind == "model" and refs > 0}
+
+    uploads = (
+        await session.execute(
+            select(UploadRecord.id, UploadRecord.dataset_filename, UploadRecord.model_filename)
+        )
+    ).all()
+    # upload records also pin their files: covers uploads stored before
+    # content addressing, and never lets a miscounted file go
+    for _, dataset_filename, model_filename in uploads:
+        datasets.add(dataset_filename)
+        models.add(model_filename)
+    datasets.update((await session.execute(select(PredictionLog.filename))).scalars())
+    models.update((await session.execute(select(MitigatedModel.model_filename))).scalars())
+
+    keep = {
+        DATASET_DIR: {_stem(f) for f in datasets},
+        MODEL_DIR: {_stem(f) for f in models},
+        APPENDS_DIR: set(),
+        PREDICTION_DIR: {str(upload_id) for upload_id, _, _ in uploads},
+    }
+    stats = await run_in_worker(
+        _sweep_all, keep, time.time() - settings.UPLOAD_GC_GRACE_SECONDS
+    )
+
+    # rows of collected files; kept files stay tracked for future uploads
+    unreferenced = [
+        (kind, f)
+        for (kind, f), refs in tracked.items()
+        if refs <= 0 and not ((DATASET_DIR if kind == "dataset" else MODEL_DIR) / f).exists()
+    ]
+    for kind, filename in unreferenced:
+        await session.execute(
+            delete(StoredFile).where(
+                StoredFile.kind == kind,
+                StoredFile.filename == filename,
+                StoredFile.ref_count <= 0,
+            )
+        )
+    await session.commit()
+    return stats
+
+
+async def delete_upload(record: UploadRecord, session: AsyncSession) -> dict:
+    """
+    Delete an upload record with its audits and mitigated models, release
+    its dataset and model, and collect whatever is no longer referenced.
+    """
+    active = (
+        await session.execute(
+            select(AuditJob.id).where(
+                AuditJob.upload_id == record.id,
+                AuditJob.status.in_(("queued", "running")),
+            )
+        )
+    ).first()
+    if active is not None:
+        raise ValueError("Upload has audit jobs in progress")
+
+    for model in (AuditJob, AuditState, MitigatedModel):
+        await session.execute(delete(model).where(model.upload_id == record.id))
+    await session.execute(
+        update(PredictionLog)
+        .where(PredictionLog.upload_id == record.id)
+        .values(upload_id=None)
+    )
+    dataset_filename, model_filename = record.dataset_filename, record.model_filename
+    await session.delete(record)
+    await session.commit()
+
+    await release_file(session, "dataset", dataset_filename)
+    await release_file(session, "model", model_filename)
+    return await collect_garbage(session)
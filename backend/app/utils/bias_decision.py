@@ -1,18 +1,43 @@
+import numpy as np
+
+from app.config import settings
+
+SEVERITY_WEIGHTS = {"dpd": 0.33, "eod": 0.33, "dir": 0.34}
+
+
 def evaluate_bias(dpd, eod, dir_ratio):
     violations = {
-        "dpd": abs(dpd) > 0.10,
-        "eod": abs(eod) > 0.10,
-        "dir": dir_ratio < 0.80,
+        "dpd": abs(dpd) > settings.DPD_THRESHOLD,
+        "eod": abs(eod) > settings.EOD_THRESHOLD,
+        "dir": dir_ratio < settings.DIR_THRESHOLD,
     }
 
     bias_present = any(violations.values())
 
-    severity = (
-        violations["dpd"] * 0.33 + violations["eod"] * 0.33 + violations["dir"] * 0.34
-    )
+    severity = sum(violations[k] * w for k, w in SEVERITY_WEIGHTS.items())
 
     return {
         "bias_present": bias_present,
         "violations": violations,
         "severity_score": round(severity * 10, 2),
     }
+
+
+def evaluate_bias_series(dpd, eod, dir_ratio):
+    """
+    evaluate_bias over arrays of metrics (e.g. one entry per time window).
+    NaN metrics never count as a violation.
+    """
+    violations = {
+        "dpd": np.abs(dpd) > settings.DPD_THRESHOLD,
+        "eod": np.abs(eod) > settings.EOD_THRESHOLD,
+        "dir": np.asarray(dir_ratio) < settings.DIR_THRESHOLD,
+    }
+
+    severity = sum(violations[k] * w for k, w in SEVERITY_WEIGHTS.items())
+
+    return {
+        "bias_present": np.logical_or.reduce(list(violations.values())),
+        "violations": violations,
+        "severity_score": np.round(severity * 10, 2),
+    }
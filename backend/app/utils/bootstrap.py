@@ -1,7 +1,9 @@
-import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
+from app.utils.fairness_metrics import rates_from_counts
+
 
 def bootstrap_ci(values, n_bootstrap=100, ci=95):
     """
@@ -27,28 +29,81 @@ def bootstrap_ci(values, n_bootstrap=100, ci=95):
     return round(lower, 4), round(upper, 4)
 
 
-import numpy as np
+def _replicate_metrics(counts: np.ndarray, n_replicates: int, seed) -> np.ndarray:
+    """
+    Draw n_replicates stratified row resamples and return DPD/EOD/DIR per
+    replicate as an array of shape (n_replicates, 3).
 
+    Resampling n_g rows with replacement inside group g only changes how many
+    rows land in each confusion cell, so each replicate is one multinomial
+    draw of n_g over that group's [tn, fp, fn, tp] proportions.
+    """
+    rng = np.random.default_rng(seed)
 
-def bootstrap_ci(values, n_bootstrap=100, ci=95):
+    sizes = counts.sum(axis=1)
+    pvals = counts / sizes[:, None]
+
+    # (B, groups, 4) resampled confusion counts
+    resampled = rng.multinomial(sizes, pvals, size=(n_replicates, len(sizes)))
+    rates = rates_from_counts(resampled)
+
+    sr = rates["selection_rate"]
+    tpr = rates["true_positive_rate"]
+
+    sr_min, sr_max = sr.min(axis=1), sr.max(axis=1)
+    dir_ratio = np.zeros_like(sr_max)
+    np.divide(sr_min, sr_max, out=dir_ratio, where=sr_max > 0)
+
+    return np.column_stack([sr_max - sr_min, tpr.max(axis=1) - tpr.min(axis=1), dir_ratio])
+
+
+def bootstrap_fairness_ci(
+    counts,
+    n_bootstrap: int = 1000,
+    ci: float = 95,
+    seed=None,
+    batch_size: int = 1000,
+    n_jobs: int = 1,
+    max_batch_cells: int | None = None,
+) -> dict | None:
     """
-    Generic bootstrap confidence interval.
-    values: list or array of metric values
+    Row-level stratified bootstrap CIs for DPD, EOD and DIR.
+
+    counts: (groups, 4) confusion table from group_confusion_counts
+    Replicates are generated in vectorized batches. Every batch gets its own
+    child seed, so results for a given seed do not depend on n_jobs.
+    max_batch_cells bounds a batch's (replicates, groups, 4) count array:
+    with many groups (intersectional audits) batches shrink accordingly.
     """
-    values = np.asarray(values, dtype=float)
+    counts = np.asarray(counts, dtype=np.int64)
+    counts = counts[counts.sum(axis=1) > 0]
 
-    if len(values) == 0:
+    if n_bootstrap <= 0 or len(counts) < 2:
         return None
 
-    stats = []
-    n = len(values)
-
-    for _ in range(n_bootstrap):
-        sample = np.random.choice(values, size=n, replace=True)
-        stats.append(np.mean(sample))
+    batch_size = max(1, int(batch_size))
+    if max_batch_cells is not None:
+        batch_size = max(1, min(batch_size, max_batch_cells // (4 * len(counts))))
+    batches = [
+        min(batch_size, n_bootstrap - start)
+        for start in range(0, n_bootstrap, batch_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+
+    if n_jobs > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(batches))) as pool:
+            parts = list(
+                pool.map(_replicate_metrics, [counts] * len(batches), batches, seeds)
+            )
+    else:
+        parts = [_replicate_metrics(counts, b, s) for b, s in zip(batches, seeds)]
+
+    replicates = np.concatenate(parts)
 
     alpha = (100 - ci) / 2
-    lower = np.percentile(stats, alpha)
-    upper = np.percentile(stats, 100 - alpha)
+    lower, upper = np.percentile(replicates, [alpha, 100 - alpha], axis=0)
 
-    return round(lower, 4), round(upper, 4)
+    return {
+        name: (round(float(lo), 4), round(float(hi), 4))
+        for name, lo, hi in zip(("dpd", "eod", "dir"), lower, upper)
+    }
@@ -1,19 +1,123 @@
+import uuid
 from pathlib import Path
+from typing import Iterable, Iterator
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from app.config import settings
 
 DATASET_DIR = Path(settings.TEMP_DIR) / "datasets"
 
 
-def load_dataset(filename: str) -> pd.DataFrame:
+def columnar_path(filename: str) -> Path:
+    # typed Parquet copy written next to the uploaded CSV
+    return DATASET_DIR / Path(filename).with_suffix(".parquet").name
+
+
+def feature_encoder_path(filename: str) -> Path:
+    # FeatureEncoder fitted at upload time, saved next to the uploaded CSV
+    return DATASET_DIR / f"{Path(filename).stem}.encoder.json"
+
+
+def sensitive_bins_path(filename: str) -> Path:
+    # sensitive-attribute bins fitted on the upload (see load_upload_bins)
+    return DATASET_DIR / f"{Path(filename).stem}.bins.json"
+
+
+def bin_codes_path(filename: str, key: str) -> Path:
+    # per-row bin codes of one fitted binning, over every dataset row
+    return DATASET_DIR / f"{Path(filename).stem}.bins.{key}.npy"
+
+
+def write_columnar_copy(chunks: Iterable[pd.DataFrame], csv_path: Path) -> Path | None:
+    """
+    Stream consistently-typed DataFrame chunks into a Parquet copy of an
+    uploaded dataset, one row group per chunk, so audits can read typed,
+    column-projected data instead of re-parsing the CSV.
+    Returns None when the data cannot be represented (e.g. mixed-type
+    object columns); audits then fall back to the CSV.
+    """
+    path = csv_path.with_suffix(".parquet")
+    # written under a temporary name, so concurrent uploads of the same
+    # content never see (or clobber) a half-written copy
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(
+                chunk,
+                schema=writer.schema if writer is not None else None,
+                preserve_index=False,
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, table.schema)
+            writer.write_table(table)
+    except Exception:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+        return None
+
+    if writer is None:
+        return None
+    writer.close()
+    tmp.replace(path)
+    return path
+
+
+def load_dataset(filename: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Load an uploaded dataset, optionally only `columns` (in file order).
+    """
     path = DATASET_DIR / filename
 
     if not path.exists():
         raise ValueError("Dataset file not found")
 
+    parquet = columnar_path(filename)
+
     try:
-        df = pd.read_csv(path)
+        if parquet.exists():
+            df = pd.read_parquet(parquet, columns=columns)
+        else:
+            df = pd.read_csv(path, usecols=columns)
     except Exception as e:
         raise ValueError(f"Failed to load_dataset: {e}")
 
     return df
+
+
+def iter_dataset_chunks(
+    filename: str,
+    columns: list[str] | None = None,
+    chunk_rows: int = 250_000,
+    dtypes: dict | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream an uploaded dataset in row chunks (Parquet row batches when a
+    columnar copy exists, CSV chunks otherwise). dtypes pins CSV column
+    types so every chunk is typed the same way.
+    """
+    path = DATASET_DIR / filename
+
+    if not path.exists():
+        raise ValueError("Dataset file not found")
+
+    parquet = columnar_path(filename)
+
+    try:
+        if parquet.exists():
+            for batch in pq.ParquetFile(parquet).iter_batches(
+                batch_size=chunk_rows, columns=columns
+            ):
+                yield batch.to_pandas()
+        else:
+            if dtypes is not None and columns is not None:
+                dtypes = {c: t for c, t in dtypes.items() if c in columns}
+            yield from pd.read_csv(
+                path, usecols=columns, chunksize=chunk_rows, dtype=dtypes
+            )
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Failed to load_dataset: {e}")
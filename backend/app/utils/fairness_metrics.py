@@ -37,3 +37,225 @@ def disparate_impact_ratio(group_rates: dict) -> float:
     if max_rate == 0:
         return 0.0
     return min_rate / max_rate
+
+
+# ---------------------------------------------------------------
+# Vectorized group engine
+# ---------------------------------------------------------------
+# Confusion cells are laid out as [tn, fp, fn, tp] so that
+# cell index == 2 * y_true + y_pred.
+CONFUSION_CELLS = ("tn", "fp", "fn", "tp")
+
+
+def factorize_groups(values) -> tuple[np.ndarray, list[str]]:
+    """
+    Factorize a sensitive column once into integer codes + string labels.
+    Missing values form their own group (like value_counts(dropna=False)).
+    """
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=False)
+    labels = [str(u) for u in uniques]
+    if len(set(labels)) < len(labels):
+        # values that print the same (1 and "1") are one group
+        label_codes, uniques = pd.factorize(np.array(labels, dtype=object))
+        codes, labels = label_codes[codes], list(uniques)
+    return codes.astype(np.int64, copy=False), labels
+
+
+def group_confusion_counts(codes, n_groups: int, y_true, y_pred) -> np.ndarray:
+    """
+    Per-group confusion matrices in a single bincount pass.
+    Returns an int64 array of shape (n_groups, 4) -> [tn, fp, fn, tp].
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    cell = 2 * (np.asarray(y_true) == 1) + (np.asarray(y_pred) == 1)
+    flat = np.bincount(codes * 4 + cell, minlength=n_groups * 4)
+    return flat.reshape(n_groups, 4).astype(np.int64, copy=False)
+
+
+def stacked_group_confusion_counts(codes, n_groups: int, y_true, y_preds) -> np.ndarray:
+    """
+    group_confusion_counts for several models scored on the same rows.
+    y_preds: (n_models, n_rows). One bincount over all models; returns
+    an int64 array of shape (n_models, n_groups, 4).
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    y_preds = np.asarray(y_preds)
+    n_models = len(y_preds)
+
+    cell = 2 * (np.asarray(y_true) == 1) + (y_preds == 1)
+    model_offset = (np.arange(n_models, dtype=np.int64) * n_groups)[:, None]
+    index = (model_offset + codes) * 4 + cell
+
+    flat = np.bincount(index.ravel(), minlength=n_models * n_groups * 4)
+    return flat.reshape(n_models, n_groups, 4).astype(np.int64, copy=False)
+
+
+def intersect_group_codes(codes_list, sizes) -> tuple[np.ndarray, int]:
+    """
+    Compose per-attribute group codes into one subgroup code per row
+    (mixed radix, last attribute varying fastest; np.unravel_index inverts
+    it). Returns (codes, number of possible subgroups).
+    """
+    combined = np.zeros(len(codes_list[0]), dtype=np.int64)
+    for codes, size in zip(codes_list, sizes):
+        combined = combined * size + np.asarray(codes, dtype=np.int64)
+    return combined, int(np.prod(sizes, dtype=np.int64))
+
+
+def subgroup_table(counts, column_labels: dict) -> dict:
+    """
+    The non-empty rows of an intersectional (n_subgroups, 4) table in a
+    JSON-friendly form: per-attribute label index of each observed subgroup
+    and its [tn, fp, fn, tp] counts.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    sizes = [len(labels) for labels in column_labels.values()]
+    observed = np.flatnonzero(counts.sum(axis=1) > 0)
+    return {
+        "labels": {col: list(labels) for col, labels in column_labels.items()},
+        "subgroups": np.column_stack(np.unravel_index(observed, sizes)).tolist(),
+        "counts": counts[observed].tolist(),
+    }
+
+
+def _safe_divide(num, den) -> np.ndarray:
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    out = np.zeros(np.broadcast(num, den).shape, dtype=float)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def rates_from_counts(counts) -> dict:
+    """
+    Vectorized rates from confusion counts of shape (..., 4).
+    Works for a single (groups, 4) table or stacked replicates (B, groups, 4).
+    """
+    counts = np.asarray(counts)
+    tn, fp, fn, tp = (counts[..., i] for i in range(4))
+
+    size = tn + fp + fn + tp
+    positives = fn + tp
+    negatives = tn + fp
+
+    return {
+        "count": size,
+        "positives": positives,
+        "predicted_positives": fp + tp,
+        "selection_rate": _safe_divide(fp + tp, size),
+        "true_positive_rate": _safe_divide(tp, positives),
+        "false_positive_rate": _safe_divide(fp, negatives),
+    }
+
+
+def compute_group_metrics(groups, y_true, y_pred) -> dict:
+    """
+    Single-pass per-group metrics for one sensitive attribute.
+
+    groups: raw sensitive values (factorized here)
+    Groups are ordered by descending size, matching value_counts().
+    """
+    codes, labels = factorize_groups(groups)
+    counts = group_confusion_counts(codes, len(labels), y_true, y_pred)
+    return summarize_group_counts(counts, labels)
+
+
+def summarize_group_counts(counts, labels) -> dict:
+    """
+    Turn a (groups, 4) confusion table into the per-group dicts consumed by
+    demographic_parity_difference / equal_opportunity_difference /
+    disparate_impact_ratio. Empty groups are skipped.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    rates = rates_from_counts(counts)
+
+    order = np.argsort(-rates["count"], kind="stable")
+    order = order[rates["count"][order] > 0]
+
+    def as_dict(values, cast=float):
+        return {labels[i]: cast(values[i]) for i in order}
+
+    return {
+        "labels": [labels[i] for i in order],
+        "counts": counts[order],
+        "group_counts": as_dict(rates["count"], int),
+        "selection_rate": as_dict(rates["selection_rate"]),
+        "true_positive_rate": as_dict(rates["true_positive_rate"]),
+        "false_positive_rate": as_dict(rates["false_positive_rate"]),
+        "confusion_matrix": {
+            labels[i]: dict(zip(CONFUSION_CELLS, map(int, counts[i]))) for i in order
+        },
+    }
+
+
+def summarize_intersectional_counts(
+    counts, column_labels: dict, min_group_size: int, top_k: int
+) -> dict:
+    """
+    Worst-case metrics over intersectional subgroups.
+
+    counts: (n_subgroups, 4) table indexed by intersect_group_codes
+    column_labels: attribute -> its group labels, in composition order
+    Subgroups with fewer than min_group_size rows are pruned before any
+    metric is computed. Disadvantaged subgroups are ranked by selection
+    rate, then true positive rate.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    columns = list(column_labels)
+    sizes = [len(column_labels[c]) for c in columns]
+
+    rates = rates_from_counts(counts)
+    size = rates["count"]
+    kept = np.flatnonzero(size >= max(min_group_size, 1))
+    pruned = (size > 0) & (size < max(min_group_size, 1))
+
+    summary = {
+        "attributes": columns,
+        "subgroups_observed": int((size > 0).sum()),
+        "subgroups_audited": int(len(kept)),
+        "subgroups_pruned": int(pruned.sum()),
+        "rows_pruned": int(size[pruned].sum()),
+        "counts": counts[kept],
+        "dpd": None,
+        "eod": None,
+        "dir": None,
+        "most_advantaged": None,
+        "top_disadvantaged": [],
+    }
+    if len(kept) < 2:
+        return summary
+
+    sr = rates["selection_rate"][kept]
+    tpr = rates["true_positive_rate"][kept]
+    fpr = rates["false_positive_rate"][kept]
+    max_sr = sr.max()
+    impact = _safe_divide(sr, max_sr)
+
+    def describe(positions):
+        decoded = np.unravel_index(kept[positions], sizes)
+        return [
+            {
+                "subgroup": {
+                    col: column_labels[col][codes[j]] for col, codes in zip(columns, decoded)
+                },
+                "count": int(size[kept[p]]),
+                "selection_rate": round(float(sr[p]), 4),
+                "true_positive_rate": round(float(tpr[p]), 4),
+                "false_positive_rate": round(float(fpr[p]), 4),
+                "disparate_impact": round(float(impact[p]), 4),
+            }
+            for j, p in enumerate(positions)
+        ]
+
+    ranked = np.lexsort((tpr, sr))[: max(top_k, 0)]
+
+    summary.update(
+        {
+            "dpd": float(max_sr - sr.min()),
+            "eod": float(tpr.max() - tpr.min()),
+            "dir": float(sr.min() / max_sr) if max_sr > 0 else 0.0,
+            "most_advantaged": describe(np.array([np.argmax(sr)]))[0],
+            "top_disadvantaged": describe(ranked),
+        }
+    )
+    return summary
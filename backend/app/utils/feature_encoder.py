@@ -1,21 +1,191 @@
+import json
+import uuid
+from functools import lru_cache
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
+FEATURE_ENCODER_VERSION = 1
+
+UNKNOWN = "UNKNOWN"  # category that missing values are encoded as
+
+_INT_DTYPES = ("int8", "int16", "int32", "int64")
+
+
+def is_categorical_feature(series: pd.Series) -> bool:
+    # object, category and pandas string ("str" / "string") columns
+    dtype = series.dtype
+    return (
+        dtype == "object"
+        or dtype.name == "category"
+        or pd.api.types.is_string_dtype(dtype)
+    )
+
+
+def _smallest_int_dtype(low, high) -> str | None:
+    for name in _INT_DTYPES:
+        info = np.iinfo(name)
+        if info.min <= low and high <= info.max:
+            return name
+    return None
+
+
+def _numeric_values(series: pd.Series) -> np.ndarray:
+    # numeric columns: coerce safely
+    return pd.to_numeric(series, errors="coerce").fillna(0).to_numpy()
+
+
+def _downcast(values: np.ndarray, dtype: str) -> np.ndarray:
+    if values.dtype == dtype:
+        return values
+    cast = values.astype(dtype)
+    # values the encoder was not fitted on (out of range, fractional) stay exact
+    return cast if np.array_equal(cast, values) else values
+
+
+class FeatureEncoder:
+    """
+    Model-input encoding fitted once per uploaded dataset.
+
+    Categorical columns get a sorted vocabulary (codes match astype("category")
+    on the full data; missing values are the UNKNOWN category, unseen values
+    -1) and the smallest integer code dtype. Numeric columns are downcast to
+    the smallest integer dtype, or float32 when that is lossless.
+
+    update() accumulates over chunks, transform() encodes any frame with the
+    same codes: distinct values are looked up once in a prebuilt index and
+    gathered back by code, and X itself is never copied.
+    """
+
+    def __init__(self, columns: dict | None = None):
+        # column -> {"kind": "categorical", "categories": [...]}
+        #         | {"kind": "numeric", "min", "max", "integral", "float32_exact"}
+        self.columns = columns or {}
+        self._vocabularies: dict[str, set] = {}  # categories while fitting
+        self._indexes: dict[str, pd.Index] = {}  # category lookup per column
+
+    # ---------------- fitting ----------------
+
+    def update(self, chunk: pd.DataFrame) -> "FeatureEncoder":
+        for col in chunk.columns:
+            series = chunk[col]
+            spec = self.columns.get(col)
+            if spec is None:
+                kind = "categorical" if is_categorical_feature(series) else "numeric"
+                spec = self.columns[col] = {"kind": kind}
+
+            if spec["kind"] == "categorical":
+                codes, uniques = pd.factorize(series)
+                vocabulary = self._vocabularies.get(col)
+                if vocabulary is None:
+                    vocabulary = self._vocabularies[col] = set(spec.get("categories") or ())
+                vocabulary.update(str(v) for v in uniques)
+                if (codes < 0).any():
+                    vocabulary.add(UNKNOWN)
+                spec["categories"] = None  # rebuilt from the vocabulary
+            else:
+                self._update_numeric(spec, _numeric_values(series))
+        return self
+
+    @staticmethod
+    def _update_numeric(spec: dict, values: np.ndarray):
+        if not len(values):
+            return
+        as_float = values.astype(np.float64, copy=False)
+        finite = np.isfinite(as_float)
+        low, high = float(as_float.min()), float(as_float.max())
+        spec["min"] = min(spec.get("min", low), low)
+        spec["max"] = max(spec.get("max", high), high)
+        spec["integral"] = spec.get("integral", True) and bool(
+            finite.all() and np.array_equal(as_float, np.trunc(as_float))
+        )
+        spec["float32_exact"] = spec.get("float32_exact", True) and bool(
+            np.array_equal(as_float.astype(np.float32), as_float)
+        )
+
+    def _finish(self):
+        for col, vocabulary in self._vocabularies.items():
+            self.columns[col]["categories"] = sorted(vocabulary)
+            self._indexes.pop(col, None)
+        self._vocabularies = {}
+
+    # ---------------- encoding ----------------
+
+    def dtype(self, col: str) -> str:
+        self._finish()
+        spec = self.columns[col]
+        if spec["kind"] == "categorical":
+            # -1 (unseen) must fit too
+            return _smallest_int_dtype(-1, len(spec["categories"]))
+        if "min" not in spec:
+            return "float64"
+        if spec["integral"]:
+            dtype = _smallest_int_dtype(spec["min"], spec["max"])
+            if dtype is not None:
+                return dtype
+        return "float32" if spec["float32_exact"] else "float64"
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        self._finish()
+        encoded = {}
+        for col in X.columns:
+            if col not in self.columns:
+                # columns the encoder never saw: fit on X itself
+                encoded[col] = FeatureEncoder().update(X[[col]]).transform(X[[col]])[col]
+            elif self.columns[col]["kind"] == "categorical":
+                encoded[col] = self._codes(col, X[col])
+            else:
+                encoded[col] = _downcast(_numeric_values(X[col]), self.dtype(col))
+        return pd.DataFrame(encoded, index=X.index, copy=False)
+
+    def _codes(self, col: str, series: pd.Series) -> np.ndarray:
+        index = self._category_index(col)
+        codes, uniques = pd.factorize(series)
+        # one lookup per distinct value; the trailing slot is for missing values
+        lookup = index.get_indexer([*(str(v) for v in uniques), UNKNOWN])
+        return lookup.astype(self.dtype(col))[codes]
+
+    def _category_index(self, col: str) -> pd.Index:
+        if col not in self._indexes:
+            self._indexes[col] = pd.Index(self.columns[col]["categories"], dtype=object)
+        return self._indexes[col]
+
+    # ---------------- persistence ----------------
+
+    def to_dict(self) -> dict:
+        self._finish()
+        return {"version": FEATURE_ENCODER_VERSION, "columns": self.columns}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FeatureEncoder":
+        if data.get("version") != FEATURE_ENCODER_VERSION:
+            raise ValueError("Unsupported feature encoder version")
+        return cls(data["columns"])
+
+    def save(self, path: Path):
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(self.to_dict(), separators=(",", ":")))
+        tmp.replace(path)
+
+
+@lru_cache(maxsize=32)
+def _load_feature_encoder(path: str, mtime_ns: int) -> FeatureEncoder:
+    return FeatureEncoder.from_dict(json.loads(Path(path).read_text()))
+
+
+def load_feature_encoder(path: Path) -> FeatureEncoder | None:
+    """Saved encoder (cached in-process with its lookup indexes), None if missing."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_feature_encoder(str(path), mtime_ns)
+
 
 def encode_features_for_inference(X: pd.DataFrame) -> pd.DataFrame:
-    X = X.copy()
-
-    for col in X.columns:
-        if X[col].dtype == "object" or X[col].dtype.name == "category":
-            X[col] = (
-                X[col]
-                .astype(str)
-                .fillna("UNKNOWN")
-                .astype("category")
-                .cat.codes.astype(np.int64)
-            )
-        else:
-            # numeric columns: coerce safely
-            X[col] = pd.to_numeric(X[col], errors="coerce").fillna(0)
-
-    return X
+    """
+    Encode X with an encoder fitted on X itself. Audits use the encoder
+    fitted on the whole upload instead, so codes stay stable across chunks.
+    """
+    return FeatureEncoder().update(X).transform(X)
@@ -1,12 +1,16 @@
+import hashlib
 import os
 import aiofiles
 import uuid
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator
 import pandas as pd
 from pandas.errors import EmptyDataError
 
 from ..config import settings
+from .dataset_loader import feature_encoder_path, write_columnar_copy
+from .dataset_validation import DatasetProfiler
+from .feature_encoder import FeatureEncoder
 
 TEMP_DIR = Path(settings.TEMP_DIR)
 TEMP_DIR.mkdir(parents=True, exist_ok=True)
@@ -14,7 +18,33 @@ TEMP_DIR.mkdir(parents=True, exist_ok=True)
 ALLOWED_DATA_EXT = {".csv"}
 ALLOWED_MODEL_EXT = {".pkl", ".joblib"}
 
-async def save_upload_file(upload_file, subdir: str = "") -> Path:
+async def _stream_upload(upload_file, file_path: Path, max_bytes: int | None, digest=None):
+    # write in UPLOAD_CHUNK_BYTES pieces; abort past max_bytes
+    written = 0
+    try:
+        async with aiofiles.open(file_path, "wb") as out_file:
+            while chunk := await upload_file.read(settings.UPLOAD_CHUNK_BYTES):
+                written += len(chunk)
+                if max_bytes is not None and written > max_bytes:
+                    raise ValueError(
+                        f"Uploaded file exceeds maximum allowed size "
+                        f"({max_bytes // (1024 * 1024)} MB)"
+                    )
+                if digest is not None:
+                    digest.update(chunk)
+                await out_file.write(chunk)
+    except BaseException:
+        file_path.unlink(missing_ok=True)
+        raise
+
+    await upload_file.seek(0)
+
+
+async def save_upload_file(upload_file, subdir: str = "", max_bytes: int | None = None) -> Path:
+    """
+    Stream an upload to disk in UPLOAD_CHUNK_BYTES pieces.
+    Aborts (and removes the partial file) as soon as max_bytes is exceeded.
+    """
     file_ext = Path(upload_file.filename).suffix.lower()
     unique_name = f"{uuid.uuid4().hex}{file_ext}"
 
@@ -22,18 +52,41 @@ async def save_upload_file(upload_file, subdir: str = "") -> Path:
     dir_path.mkdir(parents=True, exist_ok=True)
 
     file_path = dir_path / unique_name
+    await _stream_upload(upload_file, file_path, max_bytes)
+    return file_path
 
-    async with aiofiles.open(file_path, "wb") as out_file:
-        content = await upload_file.read()
-        await out_file.write(content)
 
-    await upload_file.seek(0)
-    return file_path
+async def store_upload_file(
+    upload_file, subdir: str = "", max_bytes: int | None = None
+) -> tuple[Path, str]:
+    """
+    Content-addressed save_upload_file: the upload is hashed while it is
+    streamed and stored once as <sha256><ext>. Identical content maps to
+    the already stored file. Returns (path, sha256).
+    """
+    file_ext = Path(upload_file.filename).suffix.lower()
 
-async def validate_csv_file(file_path: Path) -> Tuple[pd.DataFrame, str]:
-    # read using pandas from path (sync)
+    dir_path = TEMP_DIR / subdir
+    dir_path.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    tmp_path = dir_path / f"{uuid.uuid4().hex}{file_ext}.tmp"
+    await _stream_upload(upload_file, tmp_path, max_bytes, digest)
+
+    sha256 = digest.hexdigest()
+    file_path = dir_path / f"{sha256}{file_ext}"
+    if file_path.exists():
+        tmp_path.unlink()
+        os.utime(file_path)  # fresh again: the garbage collector's grace period
+    else:
+        tmp_path.replace(file_path)
+    return file_path, sha256
+
+
+def _read_csv_chunks(file_path: Path, **kwargs) -> Iterator[pd.DataFrame]:
+    # translate parser errors into user-facing ValueErrors
     try:
-        df = pd.read_csv(file_path)
+        yield from pd.read_csv(file_path, chunksize=settings.CSV_CHUNK_ROWS, **kwargs)
 
     except UnicodeDecodeError as e:
         raise ValueError(
@@ -46,15 +99,111 @@ async def validate_csv_file(file_path: Path) -> Tuple[pd.DataFrame, str]:
     except Exception as e:
         raise ValueError(f"Failed to parse CSV: {e}") from e
 
-    if df.empty:
-        raise ValueError("CSV contains no rows")
-
-    if df.shape[1] < 2:
-        raise ValueError("CSV must contain at least 2 columns (features + target)")
 
+def _unify_dtype(seen: set, has_nulls: bool = False) -> str:
+    # dtype the whole column would get if pandas parsed it in one go
+    if not seen:
+        return "float64"  # all-null column
+    if all(
+        pd.api.types.is_integer_dtype(t) or pd.api.types.is_float_dtype(t)
+        for t in seen
+    ):
+        # nulls anywhere (even in chunks that were entirely null) make
+        # an integer column float64
+        if len(seen) == 1 and not has_nulls:
+            return str(next(iter(seen)))
+        return "float64"
+    if len(seen) == 1:
+        dtype = next(iter(seen))
+        if has_nulls and pd.api.types.is_bool_dtype(dtype):
+            return "object"  # booleans with missing values
+        return str(dtype)
+    return "object"
+
+
+def validate_csv_file(file_path: Path) -> dict:
+    """
+    Chunked validation pass with bounded memory: encoding, header,
+    row/column counts, and per-column dtypes unified across chunks.
+    """
     if file_path.stat().st_size > settings.MAX_CSV_SIZE_BYTES:
         raise ValueError("CSV file exceeds maximum allowed size")
 
-    return df, "ok"
-
+    columns = None
+    rows = 0
+    seen_dtypes: dict[str, set] = {}
+    has_nulls: dict[str, bool] = {}
+
+    for chunk in _read_csv_chunks(file_path):
+        if columns is None:
+            columns = chunk.columns.astype(str).tolist()
+            if len(columns) < 2:
+                raise ValueError(
+                    "CSV must contain at least 2 columns (features + target)"
+                )
+            seen_dtypes = {c: set() for c in columns}
+            has_nulls = {c: False for c in columns}
+
+        rows += len(chunk)
+        for col, dtype in zip(columns, chunk.dtypes):
+            notna = chunk[col].notna()
+            if notna.any():
+                seen_dtypes[col].add(dtype)
+            if not notna.all():
+                has_nulls[col] = True
+
+    if not rows:
+        raise ValueError("CSV contains no rows")
 
+    return {
+        "rows": rows,
+        "columns": len(columns),
+        "column_names": columns,
+        "dtypes": {c: _unify_dtype(seen_dtypes[c], has_nulls[c]) for c in columns},
+    }
+
+
+def summarize_csv_file(file_path: Path, fit_encoder: bool = True) -> dict:
+    """
+    Validate a CSV, write its typed Parquet copy and return shape, dtypes and
+    health stats, so worker processes do not have to ship the parsed
+    DataFrame back to the API process.
+
+    Two bounded-memory passes: validation/dtype inference, then one typed
+    pass that computes health stats while writing the Parquet copy (and,
+    with fit_encoder, fits the upload's FeatureEncoder).
+    """
+    info = validate_csv_file(file_path)
+
+    health = DatasetProfiler()
+    encoder = FeatureEncoder() if fit_encoder else None
+    finished = False
+
+    def typed_chunks():
+        nonlocal finished
+        for chunk in _read_csv_chunks(file_path, dtype=info["dtypes"]):
+            health.update(chunk)
+            if encoder is not None:
+                encoder.update(chunk)
+            yield chunk
+        finished = True
+
+    chunks = typed_chunks()
+    columnar = write_columnar_copy(chunks, file_path)
+    for _ in chunks:
+        pass  # conversion bailed out early; finish the health pass
+
+    if not finished:
+        # the typed pass itself failed (write_columnar_copy swallowed it)
+        if columnar:
+            columnar.unlink(missing_ok=True)
+        raise ValueError("Failed to parse CSV with the inferred column types")
+
+    if encoder is not None:
+        encoder.save(feature_encoder_path(file_path.name))
+
+    return {
+        **info,
+        "health": health.result(),
+        "columnar_filename": columnar.name if columnar else None,
+    }
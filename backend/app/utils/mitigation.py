@@ -0,0 +1,100 @@
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.pipeline import Pipeline
+from fairlearn.postprocessing import ThresholdOptimizer
+from fairlearn.reductions import (
+    DemographicParity,
+    EqualizedOdds,
+    ExponentiatedGradient,
+    FalsePositiveRateParity,
+    TruePositiveRateParity,
+)
+
+# constraint name -> reductions moment (ThresholdOptimizer takes the name)
+MITIGATION_CONSTRAINTS = {
+    "demographic_parity": DemographicParity,
+    "equalized_odds": EqualizedOdds,
+    "true_positive_rate_parity": TruePositiveRateParity,
+    "false_positive_rate_parity": FalsePositiveRateParity,
+}
+
+
+class ScoreEstimator(ClassifierMixin, BaseEstimator):
+    """
+    Prefit stand-in for the base model: X is a single column holding the
+    base model's cached positive-class scores, so ThresholdOptimizer can
+    be fitted without predicting again.
+    """
+
+    def fit(self, X, y=None):
+        self.classes_ = np.array([0, 1])
+        return self
+
+    def predict_proba(self, X):
+        scores = np.asarray(X, dtype=np.float64).reshape(-1)
+        return np.column_stack([1.0 - scores, scores])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+def fit_threshold_optimizer(
+    scores, y_true, sensitive_features, constraint: str, objective: str, seed=None, holdout=None
+):
+    """
+    Fit a ThresholdOptimizer on cached scores.
+    holdout: optional (scores, sensitive_features) of rows not fitted on.
+    Returns (optimizer, mitigated labels of the holdout rows, or of the
+    fitted rows without one).
+    """
+    X = np.asarray(scores, dtype=np.float64).reshape(-1, 1)
+
+    optimizer = ThresholdOptimizer(
+        estimator=ScoreEstimator().fit(X),
+        constraints=constraint,
+        objective=objective,
+        prefit=True,
+        predict_method="predict_proba",
+    )
+    optimizer.fit(X, y_true, sensitive_features=sensitive_features)
+
+    if holdout is not None:
+        scores, sensitive_features = holdout
+        X = np.asarray(scores, dtype=np.float64).reshape(-1, 1)
+    y_pred = optimizer.predict(X, sensitive_features=sensitive_features, random_state=seed)
+    return optimizer, np.asarray(y_pred, dtype=int)
+
+
+def attach_base_estimator(optimizer: ThresholdOptimizer, model) -> ThresholdOptimizer:
+    """
+    Point an optimizer fitted by fit_threshold_optimizer at the real base
+    model, so the stored artifact predicts from features.
+    """
+    optimizer.estimator = optimizer.estimator_ = model
+    thresholder = optimizer.interpolated_thresholder_
+    thresholder.estimator = thresholder.estimator_ = model
+    return optimizer
+
+
+def fit_exponentiated_gradient(
+    model, X, y_true, sensitive_features, constraint: str, seed=None, holdout=None
+):
+    """
+    Refit a clone of the base model under a reductions constraint.
+    holdout: optional features of rows not fitted on.
+    Returns (mitigator, mitigated labels of the holdout rows, or of the
+    fitted rows without one).
+    """
+    sample_weight_name = "sample_weight"
+    if isinstance(model, Pipeline):
+        sample_weight_name = f"{model.steps[-1][0]}__sample_weight"
+
+    mitigator = ExponentiatedGradient(
+        clone(model),
+        constraints=MITIGATION_CONSTRAINTS[constraint](),
+        sample_weight_name=sample_weight_name,
+    )
+    mitigator.fit(X, y_true, sensitive_features=sensitive_features)
+
+    y_pred = mitigator.predict(X if holdout is None else holdout, random_state=seed)
+    return mitigator, np.asarray(y_pred, dtype=int)
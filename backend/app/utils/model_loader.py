@@ -1,17 +1,111 @@
+import threading
+import warnings
+from collections import OrderedDict
 from pathlib import Path
 import joblib
 from app.config import settings
 
 MODEL_DIR = Path(settings.TEMP_DIR) / "models"
 
+# (path, content key) -> (model, budget bytes); least recently used first
+_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+_load_locks: dict[tuple, threading.Lock] = {}
 
-def load_model(filename: str):
+
+def _joblib_load(path: Path):
+    if settings.MODEL_MMAP_MODE:
+        # numpy arrays inside uncompressed joblib artifacts are mapped from
+        # the file, so worker processes share those pages; compressed or
+        # plain-pickle artifacts silently load normally
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            return joblib.load(path, mmap_mode=settings.MODEL_MMAP_MODE)
+    return joblib.load(path)
+
+
+def _cache_put(key: tuple, model, size: int):
+    global _cache_bytes
+
+    if size > settings.MODEL_CACHE_MAX_BYTES:
+        return
+
+    with _cache_lock:
+        if key in _cache:
+            return
+        _cache[key] = (model, size)
+        _cache_bytes += size
+
+        while _cache_bytes > settings.MODEL_CACHE_MAX_BYTES:
+            _, (_, evicted) = _cache.popitem(last=False)
+            _cache_bytes -= evicted
+
+
+def _cache_get(key: tuple):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        _cache.move_to_end(key)
+        return entry[0]
+
+
+def load_model_from_path(path: Path, content_hash: str | None = None):
+    """
+    joblib.load through an in-process LRU cache.
+
+    Entries are keyed by path plus content hash (or size + mtime when no
+    hash is known) and budgeted by artifact size on disk.
+    Raw joblib/pickle errors propagate to the caller.
+    """
+    stat = path.stat()
+    key = (str(path), content_hash or f"{stat.st_size}:{stat.st_mtime_ns}")
+
+    model = _cache_get(key)
+    if model is not None:
+        return model
+
+    with _cache_lock:
+        load_lock = _load_locks.setdefault(key, threading.Lock())
+
+    # one loader per artifact; concurrent requests wait for it
+    with load_lock:
+        model = _cache_get(key)
+        if model is None:
+            model = _joblib_load(path)
+            _cache_put(key, model, stat.st_size)
+
+    with _cache_lock:
+        _load_locks.pop(key, None)
+
+    return model
+
+
+def load_model(filename: str, content_hash: str | None = None):
     path = MODEL_DIR / filename
 
     if not path.exists():
         raise ValueError("Model file not found")
 
     try:
-        return joblib.load(path)
+        return load_model_from_path(path, content_hash)
     except Exception as e:
         raise ValueError(f"Failed to load model: {e}")
+
+
+def model_cache_stats() -> dict:
+    with _cache_lock:
+        return {
+            "models": len(_cache),
+            "bytes": _cache_bytes,
+            "max_bytes": settings.MODEL_CACHE_MAX_BYTES,
+        }
+
+
+def clear_model_cache():
+    global _cache_bytes
+
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
@@ -1,10 +1,11 @@
 from pathlib import Path
-import joblib
 from typing import Any, Dict
 
 from sklearn.base import BaseEstimator
 from fairlearn.postprocessing import ThresholdOptimizer
 
+from .model_loader import load_model_from_path
+
 ALLOWED_METHODS = [
     "predict",
     "predict_proba",
@@ -32,9 +33,10 @@ def extract_wrapped_model(obj: Any) -> Any:
             return getattr(obj, attr)
     return None
 
-def safe_load_model_from_path(path: Path) -> Dict:
+def safe_load_model_from_path(path: Path, content_hash: str | None = None) -> Dict:
     try:
-        model_obj = joblib.load(path)
+        # goes through the model cache, so the first audit reuses this load
+        model_obj = load_model_from_path(path, content_hash)
     except Exception as exc:
         raise ValueError(
             "Model file could not be loaded. Ensure it's a joblib/pickle file."
@@ -94,3 +96,12 @@ def safe_load_model_from_path(path: Path) -> Dict:
         f"Uploaded object of type '{type(model_obj).__name__}' "
         f"is not a valid predictive model or wrapper."
     )
+
+
+def describe_model_file(path: Path, content_hash: str | None = None) -> Dict:
+    """
+    safe_load_model_from_path without the loaded object, for use from the
+    worker pool (estimators are not always picklable across processes).
+    """
+    info = safe_load_model_from_path(path, content_hash)
+    return {k: v for k, v in info.items() if k != "model"}
@@ -1,9 +1,135 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
 import pandas as pd
 import numpy as np
 from fairlearn.postprocessing import ThresholdOptimizer
 
+from app.config import settings
+
+# (model, X, sensitive_features) of the running blocked prediction, set in
+# forked workers by _init_shared so neither the model nor X is pickled
+_shared = None
+
+
+def _init_shared(model, X, sensitive_features):
+    global _shared
+    _shared = (model, X, sensitive_features)
+
+
+def _block(data, start: int, stop: int):
+    if data is None:
+        return None
+    return data.iloc[start:stop] if hasattr(data, "iloc") else data[start:stop]
+
+
+def _predict_block(method: str, start: int, stop: int, random_state=None, shared=None):
+    model, X, sensitive_features = shared or _shared
+    X = _block(X, start, stop)
+
+    if method == "proba":
+        return model.predict_proba(X)[:, 1]
+    if isinstance(model, ThresholdOptimizer):
+        return model.predict(
+            X,
+            sensitive_features=_block(sensitive_features, start, stop),
+            random_state=random_state,
+        )
+    return model.predict(X)
+
+
+def _block_seeds(n_blocks: int, random_state):
+    # one block keeps the caller's random_state as is; several get
+    # independent child seeds (forked workers would share the global RNG)
+    if n_blocks == 1:
+        return [random_state]
+    children = np.random.SeedSequence(random_state).spawn(n_blocks)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def _pool(workers: int, kind: str, shared: tuple):
+    if kind == "process":
+        if "fork" in multiprocessing.get_all_start_methods():
+            # forked workers inherit the loaded model and X copy-on-write
+            # (memory-mapped model arrays stay shared pages)
+            return ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_shared,
+                initargs=shared,
+            )
+        kind = "thread"  # without fork every worker would unpickle X
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="biasbuster-predict")
+    raise ValueError(f"Unknown PREDICT_POOL_KIND '{kind}' (expected 'thread' or 'process')")
+
+
+def predict_in_blocks(
+    method: str,
+    model,
+    X,
+    sensitive_features=None,
+    random_state=None,
+    block_rows: int | None = None,
+    workers: int | None = None,
+    pool_kind: str | None = None,
+) -> np.ndarray:
+    """
+    model.predict (method="labels") or the positive-class predict_proba
+    column (method="proba") over row blocks of X, so no intermediate is
+    larger than one block. Blocks run across `workers` threads or forked
+    processes and are written into one preallocated output array as they
+    complete. Defaults come from the PREDICT_* settings.
+    """
+    block_rows = max(1, block_rows or settings.PREDICT_BLOCK_ROWS)
+    workers = workers or settings.PREDICT_WORKERS
+    pool_kind = pool_kind or settings.PREDICT_POOL_KIND
+
+    n = len(X)
+    bounds = [(start, min(start + block_rows, n)) for start in range(0, n, block_rows)]
+    bounds = bounds or [(0, 0)]
+    seeds = [None] * len(bounds)
+    if method == "labels" and isinstance(model, ThresholdOptimizer):
+        seeds = _block_seeds(len(bounds), random_state)
+
+    shared = (model, X, sensitive_features)
+    out = None
+    # labels come out as model.classes_ (when known), so later blocks with
+    # wider labels (e.g. longer strings) fit without reallocating
+    classes = getattr(model, "classes_", None) if method == "labels" else None
+    dtype = np.asarray(classes).dtype if classes is not None else None
+
+    def store(start: int, stop: int, block):
+        nonlocal out, dtype
+        block = np.asarray(block)
+        # never cast a block down: "<U5" into "<U3" would truncate labels
+        wider = block.dtype if dtype is None else np.result_type(dtype, block.dtype)
+        if out is None:
+            out = np.empty(n, dtype=wider)
+        elif wider != out.dtype:
+            out = out.astype(wider)
+        dtype = wider
+        out[start:stop] = block
+
+    workers = min(workers, len(bounds))
+    if workers <= 1:
+        for (start, stop), seed in zip(bounds, seeds):
+            store(start, stop, _predict_block(method, start, stop, seed, shared))
+        return out
+
+    with _pool(workers, pool_kind, shared) as pool:
+        # thread workers get the shared objects with each block
+        per_task = None if isinstance(pool, ProcessPoolExecutor) else shared
+        futures = {
+            pool.submit(_predict_block, method, start, stop, seed, per_task): (start, stop)
+            for (start, stop), seed in zip(bounds, seeds)
+        }
+        for future in as_completed(futures):
+            store(*futures[future], future.result())
+    return out
+
 
-def predict_labels(model, X, sensitive_features=None):
+def predict_labels(model, X, sensitive_features=None, random_state=None):
     if isinstance(model, ThresholdOptimizer):
         if sensitive_features is None:
             raise ValueError(
@@ -11,17 +137,16 @@ def predict_labels(model, X, sensitive_features=None):
                 "Please re-run bias detection using the base model, "
                 "or provide sensitive features explicitly."
             )
-        return model.predict(X, sensitive_features=sensitive_features)
+        return predict_in_blocks("labels", model, X, sensitive_features, random_state)
 
     if hasattr(model, "predict"):
-        return model.predict(X)
+        return predict_in_blocks("labels", model, X)
 
     raise ValueError("Model does not support prediction")
 
 
 def predict_proba_positive(model, X: pd.DataFrame):
     if hasattr(model, "predict_proba"):
-        proba = model.predict_proba(X)
-        return proba[:, 1]
+        return predict_in_blocks("proba", model, X)
 
     return None
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+
+PREDICTION_DIR = Path(settings.TEMP_DIR) / "predictions"
+
+# bump when the way predictions are produced changes (encoding, dtype, ...)
+PREDICTION_CACHE_VERSION = 2
+
+
+def feature_set_hash(feature_columns: list[str], target_column: str) -> str:
+    """
+    Identify one prediction run of an upload: the ordered feature columns fed
+    to the model, plus the target column (it decides which rows get dropped).
+    """
+    blob = json.dumps(
+        {
+            "features": list(feature_columns),
+            "target": target_column,
+            "version": PREDICTION_CACHE_VERSION,
+        },
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()[:32]
+
+
+def _paths(upload_id: int, feature_hash: str) -> tuple[Path, Path]:
+    base = PREDICTION_DIR / str(upload_id)
+    return base / f"{feature_hash}_pred.npy", base / f"{feature_hash}_proba.npy"
+
+
+def _compact_labels(y_pred: np.ndarray) -> np.ndarray:
+    y_pred = np.asarray(y_pred)
+    if y_pred.size and y_pred.min() >= np.iinfo(np.int8).min and y_pred.max() <= np.iinfo(np.int8).max:
+        return y_pred.astype(np.int8)
+    return y_pred.astype(np.int64)
+
+
+def _atomic_save(path: Path, array: np.ndarray):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def save_cached_predictions(
+    upload_id: int, feature_hash: str, y_pred: np.ndarray, scores: np.ndarray | None = None
+):
+    pred_path, proba_path = _paths(upload_id, feature_hash)
+    pred_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if scores is not None:
+        _atomic_save(proba_path, np.asarray(scores, dtype=np.float32))
+    # labels last: their presence marks the entry as complete
+    _atomic_save(pred_path, _compact_labels(y_pred))
+
+
+def has_cached_predictions(upload_id: int, feature_hash: str) -> bool:
+    return _paths(upload_id, feature_hash)[0].exists()
+
+
+def load_cached_predictions(
+    upload_id: int, feature_hash: str, n_rows: int
+) -> tuple[np.ndarray, np.ndarray | None] | None:
+    """
+    Memory-mapped (y_pred, scores) for this upload + feature set, or None.
+    scores is None when the model had no predict_proba.
+    """
+    pred_path, proba_path = _paths(upload_id, feature_hash)
+
+    if not pred_path.exists():
+        return None
+
+    try:
+        y_pred = np.load(pred_path, mmap_mode="r")
+        scores = np.load(proba_path, mmap_mode="r") if proba_path.exists() else None
+    except (OSError, ValueError):
+        return None
+
+    if len(y_pred) != n_rows or (scores is not None and len(scores) != n_rows):
+        return None
+
+    return y_pred, scores
+
+
+class PredictionWriter:
+    """
+    Fill the cached prediction arrays block by block (out-of-core audits).
+    Nothing becomes visible to readers until commit().
+    """
+
+    def __init__(self, upload_id: int, feature_hash: str, n_rows: int, with_scores: bool):
+        pred_path, proba_path = _paths(upload_id, feature_hash)
+        pred_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._files = []
+        self.y_pred = self._open(pred_path, np.int8, n_rows)
+        self.scores = self._open(proba_path, np.float32, n_rows) if with_scores else None
+        self.ok = True
+
+    def _open(self, path: Path, dtype, n_rows: int):
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self._files.append((tmp, path))
+        return np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=(n_rows,))
+
+    def write(self, offset: int, y_pred: np.ndarray, scores: np.ndarray | None = None):
+        info = np.iinfo(np.int8)
+        if len(y_pred) and (y_pred.min() < info.min or y_pred.max() > info.max):
+            self.ok = False  # labels don't fit the compact dtype; skip caching
+            return
+        self.y_pred[offset : offset + len(y_pred)] = y_pred
+        if self.scores is not None:
+            if scores is None:
+                self.ok = False
+                return
+            self.scores[offset : offset + len(scores)] = scores
+
+    def commit(self):
+        if not self.ok:
+            return self.discard()
+        self.y_pred.flush()
+        if self.scores is not None:
+            self.scores.flush()
+        self.y_pred = self.scores = None
+        # scores before labels: labels mark the entry as complete
+        for tmp, path in reversed(self._files):
+            os.replace(tmp, path)
+
+    def discard(self):
+        self.y_pred = self.scores = None
+        for tmp, _ in self._files:
+            tmp.unlink(missing_ok=True)
@@ -0,0 +1,89 @@
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS; it only ever grows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageProfiler:
+    """
+    Wall time, CPU time and peak RSS per pipeline stage.
+
+    mark(name) closes the running stage and opens the next, so a linear
+    pipeline only needs one call per step; stage(name) times a nested
+    block (e.g. bootstrap inside metrics). CPU time is the calling
+    thread's, so it stays meaningful inside the worker thread pool.
+    Peak RSS is the process high-water mark when the stage ended.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self._current = None
+        self._started = time.perf_counter()
+
+    def _start(self):
+        return time.perf_counter(), time.thread_time()
+
+    def _record(self, name: str, started):
+        wall, cpu = started
+        entry = self.stages.setdefault(name, {"wall_ms": 0.0, "cpu_ms": 0.0})
+        entry["wall_ms"] += (time.perf_counter() - wall) * 1000
+        entry["cpu_ms"] += (time.thread_time() - cpu) * 1000
+        entry["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+
+    def mark(self, name: str):
+        self.stop()
+        self._current = (name, self._start())
+
+    def stop(self):
+        if self._current is not None:
+            self._record(*self._current)
+            self._current = None
+
+    @contextmanager
+    def stage(self, name: str):
+        started = self._start()
+        try:
+            yield
+        finally:
+            self._record(name, started)
+
+    def report(self) -> dict:
+        self.stop()
+        return {
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 2),
+            "stages": {
+                name: {
+                    "wall_ms": round(entry["wall_ms"], 2),
+                    "cpu_ms": round(entry["cpu_ms"], 2),
+                    "peak_rss_mb": entry["peak_rss_mb"],
+                }
+                for name, entry in self.stages.items()
+            },
+        }
+
+
+def merge_timings(outer: dict, inner: dict | None) -> dict:
+    """
+    Add the stages of work timed elsewhere (e.g. in a worker) to the report
+    of the request that waited for it; the outer total covers both.
+    """
+    if not inner:
+        return outer
+    return {"total_ms": outer["total_ms"], "stages": {**outer["stages"], **inner["stages"]}}
+
+
+def server_timing_header(timings: dict | None) -> str:
+    """Server-Timing header value, e.g. 'load;dur=12.5, predict;dur=40.1'."""
+    if not timings:
+        return ""
+    parts = [
+        f"{name};dur={entry['wall_ms']:.1f}" for name, entry in timings["stages"].items()
+    ]
+    parts.append(f"total;dur={timings['total_ms']:.1f}")
+    return ", ".join(parts)
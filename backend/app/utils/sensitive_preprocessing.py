@@ -1,20 +1,186 @@
+import hashlib
+import json
+import uuid
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+SENSITIVE_BINS_VERSION = 1
+
+BIN_STRATEGIES = ("fixed", "quantile", "custom")
+
+# the default for a numeric sensitive column named "age"
+AGE_BINS = {
+    "strategy": "custom",
+    "edges": [0, 25, 35, 45, 55, 65, 120],
+    "labels": ["18-25", "26-35", "36-45", "46-55", "56-65", "65+"],
+}
+
+# group of missing and out-of-range values (what astype(str) made of NaN)
+MISSING_GROUP = "nan"
+
+
+def binned_name(col: str) -> str:
+    # binned attributes are audited under a derived name, e.g. age_group
+    return f"{col}_group"
+
+
+def bin_specs(sensitive_columns: list[str], requested: dict | None = None) -> dict:
+    """
+    column -> (spec, explicit) for the sensitive columns to bin: the
+    requested specs, plus AGE_BINS for a column named age. A default spec
+    is skipped when its column turns out not to be numeric; an explicit
+    one is an error then.
+    """
+    requested = requested or {}
+    unknown = [c for c in requested if c not in sensitive_columns]
+    if unknown:
+        raise ValueError(f"Binning given for columns that are not audited: {unknown}")
+
+    specs = {}
+    for col in dict.fromkeys(sensitive_columns):
+        if col in requested:
+            specs[col] = (requested[col], True)
+        elif col.lower() == "age":
+            specs[col] = (AGE_BINS, False)
+    return specs
+
+
+def bin_key(col: str, spec: dict) -> str:
+    blob = json.dumps([col, spec], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def _format_edge(value: float) -> str:
+    return format(value, ".6g")
+
+
+def _interval_labels(edges: np.ndarray) -> list[str]:
+    # pd.cut(right=True, include_lowest=True) style: [a, b], (b, c], ...
+    labels = []
+    for i in range(len(edges) - 1):
+        opening = "[" if i == 0 else "("
+        labels.append(f"{opening}{_format_edge(edges[i])}, {_format_edge(edges[i + 1])}]")
+    return labels
+
+
+def _float_values(values) -> np.ndarray:
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.asarray(values, dtype=np.float64)
+
+
+def fit_bins(values: pd.Series, spec: dict, explicit: bool = True) -> dict | None:
+    """
+    Resolve a binning spec against a column: {"strategy", "edges", "labels"}.
+
+    fixed: `bins` equal-width bins over the observed range; quantile: `bins`
+    equal-frequency bins (ties merge bins); custom: the given edges.
+    Bins are right-closed, the first one also includes its lower edge.
+    Returns None for a non-numeric column unless the spec is explicit.
+    """
+    col = values.name
+    dtype = values.dtype
+    if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        if explicit:
+            raise ValueError(f"Sensitive column '{col}' is not numeric and cannot be binned")
+        return None
+
+    strategy = spec["strategy"]
+    if strategy not in BIN_STRATEGIES:
+        raise ValueError(f"Unknown binning strategy '{strategy}', expected one of {BIN_STRATEGIES}")
+
+    if strategy == "custom":
+        edges = np.asarray(spec["edges"], dtype=np.float64)
+    else:
+        x = _float_values(values)
+        x = x[np.isfinite(x)]
+        if not len(x):
+            raise ValueError(f"Sensitive column '{col}' has no values to bin")
+        if strategy == "fixed":
+            edges = np.linspace(x.min(), x.max(), spec["bins"] + 1)
+        else:
+            edges = np.unique(np.quantile(x, np.linspace(0, 1, spec["bins"] + 1)))
+        if len(edges) == 1:
+            # constant column: one bin holding every value
+            edges = np.repeat(edges, 2)
+
+    labels = spec.get("labels") or _interval_labels(edges)
+    if len(labels) != len(edges) - 1:
+        raise ValueError(f"Binning of '{col}' needs one label per bin ({len(edges) - 1})")
+
+    return {"strategy": strategy, "edges": edges.tolist(), "labels": list(labels)}
+
+
+def _code_dtype(n_codes: int):
+    return np.int8 if n_codes <= np.iinfo(np.int8).max else np.int16
+
+
+def bin_codes(values, fitted: dict) -> np.ndarray:
+    """
+    Bin code per value with one np.searchsorted over the edges. Missing and
+    out-of-range values get code len(labels), the MISSING_GROUP.
+    """
+    edges = np.asarray(fitted["edges"], dtype=np.float64)
+    x = _float_values(values)
+    n_bins = len(fitted["labels"])
+
+    # right-closed bins: edges[i] < x <= edges[i + 1] -> i
+    codes = np.searchsorted(edges, x, side="left") - 1
+    codes[x == edges[0]] = 0
+    codes[(codes < 0) | (codes >= n_bins)] = n_bins  # NaN sorts past the end
+    return codes.astype(_code_dtype(n_bins + 1))
+
+
+def bin_labels(fitted: dict) -> list[str]:
+    """Label per bin code, MISSING_GROUP last."""
+    return [*fitted["labels"], MISSING_GROUP]
+
+
+def compact_groups(codes: np.ndarray, labels: list[str], present=None) -> tuple[np.ndarray, list[str]]:
+    """
+    Drop groups no row falls into (present: optional precomputed mask) and
+    renumber the codes to match, keeping the label order.
+    """
+    if present is None:
+        present = np.bincount(codes, minlength=len(labels)) > 0
+    if present.all():
+        return codes, labels
+    remap = (np.cumsum(present) - 1).astype(codes.dtype)
+    return remap[codes], [label for label, keep in zip(labels, present) if keep]
+
+
+def remap_group_codes(codes: np.ndarray, labels: list[str], categories: list[str]) -> np.ndarray:
+    """
+    Re-express group codes over `labels` as codes over `categories`, one
+    lookup per distinct label; labels missing from categories become -1.
+    """
+    lookup = pd.Index(categories, dtype=object).get_indexer(labels)
+    return lookup[codes]
+
+
+# ---------------- persistence ----------------
+
+
+def read_sensitive_bins(path: Path) -> dict:
+    """Stored fits: bin_key -> fitted bins (None: column not binnable)."""
+    try:
+        data = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    if data.get("version") != SENSITIVE_BINS_VERSION:
+        return {}
+    return data["bins"]
 
-def bin_age_column(df: pd.DataFrame, col: str) -> pd.DataFrame:
-    if col not in df.columns:
-        return df
 
-    if not pd.api.types.is_numeric_dtype(df[col]):
-        return df  # don't bin non-numeric age
+def write_sensitive_bins(path: Path, bins: dict):
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps({"version": SENSITIVE_BINS_VERSION, "bins": bins}, separators=(",", ":")))
+    tmp.replace(path)
 
-    df = df.copy()
-    df[col + "_group"] = pd.cut(
-        df[col],
-        bins=[0, 25, 35, 45, 55, 65, 120],
-        labels=["18-25", "26-35", "36-45", "46-55", "56-65", "65+"],
-        right=True,
-        include_lowest=True,
-    )
 
-    return df
+def write_bin_codes(path: Path, codes: np.ndarray):
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp.npy")
+    np.save(tmp, codes)
+    tmp.replace(path)
@@ -1,17 +1,20 @@
 import pandas as pd
 
 
-def validate_sensitive_columns(df: pd.DataFrame, sensitive_columns: list[str]) -> dict:
-    missing = [c for c in sensitive_columns if c not in df.columns]
+def check_sensitive_columns_exist(columns, sensitive_columns: list[str]):
+    missing = [c for c in sensitive_columns if c not in columns]
 
     if missing:
         raise ValueError(f"Sensitive columns missing: {missing}")
 
-    audit = {}
 
-    for col in sensitive_columns:
-        unique_vals = df[col].dropna().unique()
+def summarize_sensitive_groups(unique_values: dict) -> dict:
+    """
+    unique_values: sensitive column -> its non-null unique values
+    """
+    audit = {}
 
+    for col, unique_vals in unique_values.items():
         if len(unique_vals) < 2:
             raise ValueError(
                 f"Sensitive column '{col}'  has fewer than 2 unique values"
@@ -23,3 +26,11 @@ def validate_sensitive_columns(df: pd.DataFrame, sensitive_columns: list[str]) -
         }
 
     return audit
+
+
+def validate_sensitive_columns(df: pd.DataFrame, sensitive_columns: list[str]) -> dict:
+    check_sensitive_columns_exist(df.columns, sensitive_columns)
+
+    return summarize_sensitive_groups(
+        {col: df[col].dropna().unique() for col in sensitive_columns}
+    )
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 BINARY_MAP = {
@@ -20,42 +21,111 @@ def normalize_value(v):
     return v
 
 
-def encode_target_column(
-    df: pd.DataFrame, target_col: str
-) -> tuple[pd.DataFrame, dict]:
-    if target_col not in df.columns:
-        raise ValueError(f"Target column '{target_col}' not found in dataset")
+def factorize_target(values: pd.Series) -> tuple[np.ndarray, list]:
+    """
+    Row codes (-1 for missing) into the distinct target values, and those
+    values normalized. Only the distinct values go through normalize_value,
+    so the Python-level work scales with the classes, not the rows.
+    """
+    codes, uniques = pd.factorize(values)
+    return codes, [normalize_value(v) for v in uniques]
 
-    # normalize
-    df = df.copy()
-    df[target_col] = df[target_col].apply(normalize_value)
 
-    # drop inconclusive rows
-    before_rows = df.shape[0]
-    df = df[~df[target_col].isin(DROP_VALUES)]
-    dropped_rows = before_rows - df.shape[0]
+def target_keep_mask(codes: np.ndarray, normalized: list) -> np.ndarray:
+    """Rows whose normalized target is not one of DROP_VALUES."""
+    dropped = np.fromiter(
+        (v in DROP_VALUES for v in normalized), dtype=bool, count=len(normalized)
+    )
+    # missing targets (code -1) hit the trailing False and are kept
+    return ~np.append(dropped, False)[codes]
+
+
+def target_classes(unique_vals) -> list:
+    """
+    JSON-safe, ordered list of normalized target classes; feeding it back
+    to build_target_mapping reproduces the original mapping.
+    """
+    plain = {v.item() if hasattr(v, "item") else v for v in unique_vals}
+    return sorted(plain, key=lambda v: (type(v).__name__, str(v)))
 
-    unique_vals = set(df[target_col].dropna().unique())
+
+def build_target_mapping(unique_vals) -> tuple[dict, str]:
+    """
+    Class mapping + audit mode for a set of normalized target values.
+    """
+    unique_vals = set(unique_vals)
 
     # binary case
     if unique_vals.issubset(set(BINARY_MAP.keys())):
-        df[target_col] = df[target_col].map(BINARY_MAP)
-        audit_mode = "binary"
+        return BINARY_MAP, "binary"
 
     # limited non-binary (<= 3 classes)
-    elif len(unique_vals) <= 3:
-        class_map = {v: i for i, v in enumerate(sorted(unique_vals))}
-        df[target_col] = df[target_col].map(class_map)
-        audit_mode = "multiclass"
+    if len(unique_vals) <= 3:
+        return {v: i for i, v in enumerate(sorted(unique_vals))}, "multiclass"
+
+    raise ValueError(
+        f"Target column has {len(unique_vals)} unique values"
+        "fairness audit supports binary to small multiclass targets only."
+    )
+
+
+def target_labels(
+    values: pd.Series, target_mapping: tuple[dict, str] | None = None
+) -> tuple[np.ndarray, np.ndarray | None, dict]:
+    """
+    Encoded target of the kept rows, the row keep mask (None when no row is
+    dropped) and target_info. Works on the target values alone, so callers
+    can drop rows from only the columns they need.
+
+    target_mapping: (class_map, audit_mode) fixed up front, e.g. when the
+    dataset is encoded chunk by chunk; learned from the values when omitted.
+
+    The target is factorized once; normalization, dropping and class
+    mapping work on the distinct values and are gathered back by code.
+    """
+    # normalize the distinct values
+    codes, normalized = factorize_target(values)
 
+    # drop inconclusive rows
+    keep = target_keep_mask(codes, normalized)
+    dropped_rows = int(len(keep) - np.count_nonzero(keep))
+
+    unique_vals = {v for v in normalized if v not in DROP_VALUES}
+
+    if target_mapping is None:
+        target_mapping = build_target_mapping(unique_vals)
+    class_map, audit_mode = target_mapping
+
+    # map each distinct value once; unmapped and missing targets become NaN
+    mapped = pd.Series(normalized, dtype=object).map(class_map)
+    codes = codes[keep] if dropped_rows else codes
+    unmapped = np.append(mapped.isna().to_numpy(), True)  # code -1: missing
+    if unmapped[codes].any():
+        lookup = np.append(mapped.to_numpy(dtype=np.float64), np.nan)
     else:
-        raise ValueError(
-            f"Target column has {len(unique_vals)} unique values"
-            "fairness audit supports binary to small multiclass targets only."
-        )
+        # unmapped distinct values are never gathered here
+        lookup = mapped.fillna(-1).to_numpy(dtype=np.int64)
 
-    return df, {
+    return lookup[codes], keep if dropped_rows else None, {
         "audit_mode": audit_mode,
         "dropped_rows": dropped_rows,
         "unique_classes": len(unique_vals),
+        "classes": target_classes(unique_vals),
     }
+
+
+def encode_target_column(
+    df: pd.DataFrame, target_col: str, target_mapping: tuple[dict, str] | None = None
+) -> tuple[pd.DataFrame, dict]:
+    """
+    df without the dropped rows and with the target encoded (see
+    target_labels). Only the target column is copied when no row is dropped.
+    """
+    if target_col not in df.columns:
+        raise ValueError(f"Target column '{target_col}' not found in dataset")
+
+    labels, keep, target_info = target_labels(df[target_col], target_mapping)
+
+    df = df[keep] if keep is not None else df.copy(deep=False)
+    df[target_col] = labels
+    return df, target_info
@@ -0,0 +1,97 @@
+import numpy as np
+
+from app.utils.fairness_metrics import _safe_divide
+
+
+def threshold_grid(n_thresholds: int) -> np.ndarray:
+    return np.linspace(0.0, 1.0, n_thresholds)
+
+
+def group_threshold_counts(codes, n_groups: int, y_true, scores, thresholds) -> dict:
+    """
+    Per-group true/false positive counts at every threshold (a row is
+    predicted positive when score >= threshold), plus exact per-group AUC.
+
+    Rows are sorted once by (group, score) with np.lexsort, so the distinct
+    scores of every group form one ordered slice. Counts at all thresholds
+    then come from cumulative sums and a searchsorted of the thresholds in
+    each group's slice, on the raw scores (no per-group float offsets that
+    would round grid-aligned scores differently from group to group).
+    Returns tp/fp of shape (n_groups, n_thresholds) and positives,
+    negatives and auc of shape (n_groups,).
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    positive = np.asarray(y_true) == 1
+    scores = np.clip(np.asarray(scores, dtype=np.float64), 0.0, 1.0)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+
+    order = np.lexsort((scores, codes))
+    sorted_codes, sorted_scores = codes[order], scores[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (sorted_codes[1:] != sorted_codes[:-1]) | (sorted_scores[1:] != sorted_scores[:-1])
+    inverse = np.cumsum(first) - 1
+
+    # one key per distinct (group, score), in sorted order
+    key_scores = sorted_scores[first]
+    key_groups = sorted_codes[first]
+    pos = np.bincount(inverse, weights=positive[order], minlength=len(key_scores))
+    neg = np.bincount(inverse, weights=~positive[order], minlength=len(key_scores))
+
+    positives = np.bincount(key_groups, weights=pos, minlength=n_groups)
+    negatives = np.bincount(key_groups, weights=neg, minlength=n_groups)
+
+    groups = np.arange(n_groups)
+    group_start = np.searchsorted(key_groups, groups, side="left")
+    group_end = np.searchsorted(key_groups, groups, side="right")
+
+    # first key at or above each threshold, within each group's slice
+    start = np.empty((n_groups, len(thresholds)), dtype=np.intp)
+    for g in range(n_groups):
+        lo, hi = group_start[g], group_end[g]
+        start[g] = lo + np.searchsorted(key_scores[lo:hi], thresholds, side="left")
+
+    # rows at or above each distinct score, within its group
+    pos_above = np.append(np.cumsum(pos[::-1])[::-1], 0.0)
+    neg_above = np.append(np.cumsum(neg[::-1])[::-1], 0.0)
+    tp = pos_above[start] - pos_above[group_end][:, None]
+    fp = neg_above[start] - neg_above[group_end][:, None]
+
+    # Mann-Whitney AUC: each positive beats the group's negatives scored
+    # below it and ties with half of those scored equal
+    neg_before = np.cumsum(neg) - neg
+    neg_below = neg_before - neg_before[group_start[key_groups]]
+    wins = np.bincount(key_groups, weights=pos * (neg_below + 0.5 * neg), minlength=n_groups)
+    auc = _safe_divide(wins, positives * negatives)
+
+    return {
+        "tp": tp.astype(np.int64),
+        "fp": fp.astype(np.int64),
+        "positives": positives.astype(np.int64),
+        "negatives": negatives.astype(np.int64),
+        "auc": auc,
+    }
+
+
+def fairness_threshold_curves(counts: dict, thresholds) -> dict:
+    """
+    DPD/EOD/DIR across thresholds from group_threshold_counts, plus
+    per-group selection rate and ROC points (FPR/TPR).
+    """
+    tp, fp = counts["tp"], counts["fp"]
+    size = (counts["positives"] + counts["negatives"])[:, None]
+
+    selection_rate = _safe_divide(tp + fp, size)
+    tpr = _safe_divide(tp, counts["positives"][:, None])
+    fpr = _safe_divide(fp, counts["negatives"][:, None])
+
+    sr_min, sr_max = selection_rate.min(axis=0), selection_rate.max(axis=0)
+
+    return {
+        "thresholds": np.asarray(thresholds, dtype=np.float64),
+        "dpd": sr_max - sr_min,
+        "eod": tpr.max(axis=0) - tpr.min(axis=0),
+        "dir": _safe_divide(sr_min, sr_max),
+        "selection_rate": selection_rate,
+        "true_positive_rate": tpr,
+        "false_positive_rate": fpr,
+    }
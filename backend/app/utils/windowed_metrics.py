@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.fairness_metrics import _safe_divide, rates_from_counts
+
+WINDOW_SECONDS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+# the epoch is a Thursday; shift so weekly buckets start on Monday
+_WEEK_OFFSET_SECONDS = 3 * 86400
+
+
+def time_buckets(timestamps: pd.Series, unit: str) -> tuple[np.ndarray, int]:
+    """
+    Integer bucket of every timestamp at hour/day/week granularity.
+    Returns (bucket index relative to the first bucket, first bucket).
+    """
+    seconds = timestamps.astype("datetime64[s, UTC]").astype(np.int64).to_numpy()
+    offset = _WEEK_OFFSET_SECONDS if unit == "week" else 0
+    buckets = (seconds + offset) // WINDOW_SECONDS[unit]
+    first = int(buckets.min())
+    return buckets - first, first
+
+
+def bucket_start(bucket, unit: str) -> pd.DatetimeIndex:
+    offset = _WEEK_OFFSET_SECONDS if unit == "week" else 0
+    seconds = np.asarray(bucket, dtype=np.int64) * WINDOW_SECONDS[unit] - offset
+    return pd.to_datetime(seconds, unit="s", utc=True)
+
+
+def bucket_group_counts(buckets, n_buckets: int, codes, n_groups: int, y_true, y_pred) -> np.ndarray:
+    """
+    Confusion counts per (time bucket, group) in one bincount.
+    Returns an int64 array of shape (n_buckets, n_groups, 4).
+    """
+    cell = 2 * (np.asarray(y_true) == 1) + (np.asarray(y_pred) == 1)
+    index = (np.asarray(buckets, dtype=np.int64) * n_groups + codes) * 4 + cell
+    flat = np.bincount(index, minlength=n_buckets * n_groups * 4)
+    return flat.reshape(n_buckets, n_groups, 4).astype(np.int64, copy=False)
+
+
+def rolling_window_counts(
+    bucket_counts: np.ndarray, size: int, occupied: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sum of every run of `size` consecutive buckets from one prefix sum.
+
+    bucket_counts holds one row per bucket id in `occupied` (sorted; all
+    buckets 0..n-1 when None), so a sparse log never allocates its empty
+    buckets. Windows start at buckets 0..last-size+1 and only those
+    covering an occupied bucket are returned; the counts of the window
+    starting at s are prefix[hi] - prefix[lo], with lo/hi the occupied
+    buckets in [s, s + size) found by searchsorted. size == 1 gives
+    tumbling windows of one bucket each. When there are fewer buckets than
+    size, a single window covers all of them.
+    Returns (window counts, first bucket of each window).
+    """
+    if occupied is None:
+        occupied = np.arange(len(bucket_counts))
+    n_buckets = int(occupied[-1]) + 1
+    prefix = np.concatenate(
+        [np.zeros((1, *bucket_counts.shape[1:]), dtype=np.int64), np.cumsum(bucket_counts, axis=0)]
+    )
+
+    if n_buckets <= size:
+        starts = np.zeros(1, dtype=np.int64)
+    else:
+        # windows starting up to size - 1 buckets before an occupied one
+        starts = np.unique((occupied[:, None] - np.arange(size)).ravel())
+        starts = starts[(starts >= 0) & (starts <= n_buckets - size)]
+    lo = np.searchsorted(occupied, starts, side="left")
+    hi = np.searchsorted(occupied, starts + size, side="left")
+    return prefix[hi] - prefix[lo], starts
+
+
+def window_fairness_metrics(window_counts: np.ndarray, min_group_size: int = 1) -> dict:
+    """
+    Vectorized rates and DPD/EOD/DIR for stacked (windows, groups, 4)
+    counts. Only groups with at least min_group_size rows in a window take
+    part; smaller ones are counted in "groups_skipped". Metrics are NaN for
+    windows with fewer than two such groups.
+    """
+    rates = rates_from_counts(window_counts)
+    observed = rates["count"] > 0
+    present = rates["count"] >= max(min_group_size, 1)
+    comparable = present.sum(axis=1) >= 2
+
+    def spread(values):
+        high = np.where(present, values, -np.inf).max(axis=1)
+        low = np.where(present, values, np.inf).min(axis=1)
+        return high, low
+
+    sr_max, sr_min = spread(rates["selection_rate"])
+    tpr_max, tpr_min = spread(rates["true_positive_rate"])
+
+    totals = window_counts.sum(axis=1)
+    rows = totals.sum(axis=1)
+
+    return {
+        "rows": rows,
+        "positive_rate": _safe_divide(totals[:, 1] + totals[:, 3], rows),
+        "accuracy": _safe_divide(totals[:, 0] + totals[:, 3], rows),
+        "group_counts": rates["count"],
+        "groups_skipped": (observed & ~present).sum(axis=1),
+        "selection_rate": np.where(observed, rates["selection_rate"], np.nan),
+        "dpd": np.where(comparable, sr_max - sr_min, np.nan),
+        "eod": np.where(comparable, tpr_max - tpr_min, np.nan),
+        "dir": np.where(comparable, _safe_divide(sr_min, np.where(comparable, sr_max, 1.0)), np.nan),
+    }
@@ -0,0 +1,83 @@
+"""
+Benchmark: per-group mask loop vs single-pass bincount group engine.
+
+Usage (from backend/):
+    python -m benchmarks.bench_group_metrics
+    python -m benchmarks.bench_group_metrics --rows 100000 1000000 --groups 2 50 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.utils.fairness_metrics import (
+    compute_group_metrics,
+    selection_rate,
+    true_positive_rate,
+)
+
+
+def mask_loop(groups: pd.Series, y_true: np.ndarray, y_pred: np.ndarray):
+    # the pre-engine implementation from run_bias_detection STEP 7
+    group_rates, group_tprs = {}, {}
+    for group in groups.value_counts(dropna=False).index:
+        mask = (groups == group).to_numpy()
+        group_rates[str(group)] = selection_rate(y_pred[mask])
+        group_tprs[str(group)] = true_positive_rate(y_true[mask], y_pred[mask])
+    return group_rates, group_tprs
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--groups", type=int, nargs="+", default=[2, 20, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{'rows':>10} {'groups':>7} {'mask_loop_s':>12} {'bincount_s':>11} {'speedup':>8}")
+    for n_rows in args.rows:
+        y_true = rng.integers(0, 2, n_rows)
+        y_pred = rng.integers(0, 2, n_rows)
+
+        for n_groups in args.groups:
+            groups = pd.Series(rng.integers(0, n_groups, n_rows)).map("g{}".format)
+
+            loop_s = best_of(lambda: mask_loop(groups, y_true, y_pred), args.repeat)
+            engine_s = best_of(
+                lambda: compute_group_metrics(groups, y_true, y_pred), args.repeat
+            )
+
+            # both paths must agree before timings mean anything
+            rates, tprs = mask_loop(groups, y_true, y_pred)
+            result = compute_group_metrics(groups, y_true, y_pred)
+            assert np.allclose(
+                [rates[g] for g in result["labels"]],
+                list(result["selection_rate"].values()),
+            )
+            assert np.allclose(
+                [tprs[g] for g in result["labels"]],
+                list(result["true_positive_rate"].values()),
+            )
+
+            print(
+                f"{n_rows:>10} {n_groups:>7} {loop_s:>12.4f} "
+                f"{engine_s:>11.4f} {loop_s / engine_s:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
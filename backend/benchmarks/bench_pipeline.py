@@ -0,0 +1,298 @@
+"""
+Benchmark: upload + bias detection pipeline on synthetic data.
+
+Times the pipeline building blocks (CSV validation, dataset health, target
+and feature encoding, bootstrap CIs) and the end-to-end /api/upload and
+/api/bias/detect requests through an in-process test client against a
+throwaway SQLite database. Per-stage audit timings come from the
+"timings" the API attaches to every audit. Results are written as JSON;
+pass --baseline to compare against an earlier run.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --rows 10000 100000 --groups 4 50 --output after.json
+    python -m benchmarks.bench_pipeline --baseline before.json --output after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from benchmarks.synthetic import (
+    MODEL_KINDS,
+    SENSITIVE_COLUMNS,
+    TARGET,
+    make_dataset,
+    train_model,
+    write_case,
+)
+
+
+def configure_environment(work_dir: Path):
+    # must run before app.config is imported: settings are read once
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{work_dir / 'bench.db'}"
+    os.environ["TEMP_DIR"] = str(work_dir / "uploads")
+    os.environ["MAX_CSV_SIZE_BYTES"] = str(1 << 40)
+    # measure the computation, not the result caches; fixed seed -> same CIs
+    os.environ["ENABLE_AUDIT_CACHE"] = "false"
+    os.environ["ENABLE_PREDICTION_CACHE"] = "false"
+    os.environ["BOOTSTRAP_SEED"] = "0"
+    os.environ["ENABLE_PROFILING"] = "true"
+
+
+def measure(fn, repeat: int) -> tuple[list[float], object]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def entry(case: str, name: str, timings: list[float], model: str | None = None) -> dict:
+    return {
+        "case": case,
+        "model": model,
+        "name": name,
+        "best_s": round(min(timings), 6),
+        "median_s": round(statistics.median(timings), 6),
+        "runs": [round(t, 6) for t in timings],
+    }
+
+
+def bench_stages(case: str, csv_path: Path, repeat: int) -> list[dict]:
+    from app.config import settings
+    from app.utils.bootstrap import bootstrap_fairness_ci
+    from app.utils.dataset_validation import validate_dataset_health
+    from app.utils.fairness_metrics import factorize_groups, group_confusion_counts
+    from app.utils.feature_encoder import FeatureEncoder, encode_features_for_inference
+    from app.utils.file_validation import validate_csv_file
+    from app.utils.target_encoder import encode_target_column
+
+    results = []
+
+    timings, _ = measure(lambda: validate_csv_file(csv_path), repeat)
+    results.append(entry(case, "validate_csv_file", timings))
+
+    timings, df = measure(lambda: pd.read_csv(csv_path), repeat)
+    results.append(entry(case, "read_csv", timings))
+
+    timings, _ = measure(lambda: validate_dataset_health(df), repeat)
+    results.append(entry(case, "validate_dataset_health", timings))
+
+    timings, (encoded, _) = measure(lambda: encode_target_column(df, TARGET), repeat)
+    results.append(entry(case, "encode_target_column", timings))
+
+    X = encoded.drop(columns=[TARGET])
+    timings, _ = measure(lambda: encode_features_for_inference(X), repeat)
+    results.append(entry(case, "encode_features_for_inference", timings))
+
+    timings, encoder = measure(lambda: FeatureEncoder().update(X), repeat)
+    results.append(entry(case, "feature_encoder_fit", timings))
+
+    timings, _ = measure(lambda: encoder.transform(X), repeat)
+    results.append(entry(case, "feature_encoder_transform", timings))
+
+    y_true = encoded[TARGET].to_numpy(dtype=int)
+    codes, labels = factorize_groups(encoded["group"])
+    counts = group_confusion_counts(codes, len(labels), y_true, 1 - y_true)
+    timings, _ = measure(
+        lambda: bootstrap_fairness_ci(
+            counts,
+            n_bootstrap=settings.BOOTSTRAP_SAMPLES,
+            ci=settings.BOOTSTRAP_CONFIDENCE,
+            seed=0,
+            batch_size=settings.BOOTSTRAP_BATCH_SIZE,
+            n_jobs=settings.BOOTSTRAP_WORKERS,
+        ),
+        repeat,
+    )
+    results.append(entry(case, "bootstrap_fairness_ci", timings))
+    return results
+
+
+def bench_api(case: str, csv_path: Path, model_paths: dict, repeat: int) -> list[dict]:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    results = []
+    with TestClient(app) as client:
+        for kind, model_path in model_paths.items():
+            upload_timings = []
+            for _ in range(repeat):
+                with open(csv_path, "rb") as ds, open(model_path, "rb") as md:
+                    start = time.perf_counter()
+                    response = client.post(
+                        "/api/upload",
+                        files={
+                            "dataset_file": (csv_path.name, ds, "text/csv"),
+                            "model_file": (model_path.name, md),
+                        },
+                    )
+                    upload_timings.append(time.perf_counter() - start)
+                response.raise_for_status()
+            results.append(entry(case, "api_upload", upload_timings, kind))
+
+            payload = {
+                "upload_id": _latest_upload_id(),
+                "target_column": TARGET,
+                "sensitive_columns": SENSITIVE_COLUMNS,
+            }
+
+            # the first audit also loads the model into the model cache
+            detect_timings = []
+            stage_runs: dict[str, list[float]] = {}
+            for _ in range(repeat + 1):
+                start = time.perf_counter()
+                response = client.post("/api/bias/detect", json=payload)
+                detect_timings.append(time.perf_counter() - start)
+                response.raise_for_status()
+                if len(detect_timings) == 1:
+                    continue
+                for name, stage in response.json().get("timings", {}).get("stages", {}).items():
+                    stage_runs.setdefault(name, []).append(stage["wall_ms"] / 1000)
+
+            results.append(entry(case, "api_detect_cold", detect_timings[:1], kind))
+            results.append(entry(case, "api_detect", detect_timings[1:], kind))
+            for name, runs in stage_runs.items():
+                results.append(entry(case, f"detect_stage.{name}", runs, kind))
+    return results
+
+
+def _latest_upload_id() -> int:
+    # /api/upload does not return the record id; read it from the bench DB
+    db_path = os.environ["DATABASE_URL"].split("///", 1)[1]
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT max(id) FROM upload_records").fetchone()[0]
+
+
+def environment_info() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float, min_seconds: float) -> list[dict]:
+    """
+    Median-time ratios against a baseline run; ratio > tolerance is a
+    regression unless both medians are below min_seconds (timer noise).
+    """
+    previous = {(r["case"], r["model"], r["name"]): r for r in baseline["results"]}
+    rows = []
+    for r in results:
+        before = previous.get((r["case"], r["model"], r["name"]))
+        if before is None or before["median_s"] <= 0:
+            continue
+        ratio = r["median_s"] / before["median_s"]
+        rows.append({**r, "baseline_median_s": before["median_s"], "ratio": round(ratio, 3),
+                     "regression": ratio > tolerance and r["median_s"] >= min_seconds})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--numeric-cols", type=int, default=5)
+    parser.add_argument("--categorical-cols", type=int, default=3)
+    parser.add_argument("--groups", type=int, nargs="+", default=[4])
+    parser.add_argument("--cardinality", type=int, nargs="+", default=[20])
+    parser.add_argument("--models", nargs="+", choices=MODEL_KINDS, default=list(MODEL_KINDS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-api", action="store_true", help="only time the stages")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--baseline", type=Path, help="earlier --output to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.2,
+                        help="median slowdown ratio reported as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="timings faster than this are never regressions")
+    parser.add_argument("--keep-data", action="store_true", help="keep the work directory")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="biasbuster-bench-"))
+    configure_environment(work_dir)
+
+    results = []
+    try:
+        for n_rows in args.rows:
+            for n_groups in args.groups:
+                for cardinality in args.cardinality:
+                    case = f"rows={n_rows},groups={n_groups},cardinality={cardinality}"
+                    print(f"# {case}", file=sys.stderr)
+
+                    df = make_dataset(
+                        n_rows, args.numeric_cols, args.categorical_cols,
+                        n_groups, cardinality, args.seed,
+                    )
+                    models = {kind: train_model(df, kind, args.seed) for kind in args.models}
+                    csv_path, model_paths = write_case(df, models, work_dir / "data" / case)
+
+                    results += bench_stages(case, csv_path, args.repeat)
+                    if not args.skip_api:
+                        results += bench_api(case, csv_path, model_paths, args.repeat)
+    finally:
+        if not args.keep_data:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "environment": environment_info(),
+        "config": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        "results": results,
+    }
+
+    print(f"{'case':<40} {'model':<9} {'name':<32} {'best_s':>9} {'median_s':>9}")
+    for r in results:
+        print(f"{r['case']:<40} {r['model'] or '-':<9} {r['name']:<32} "
+              f"{r['best_s']:>9.4f} {r['median_s']:>9.4f}")
+
+    exit_code = 0
+    if args.baseline:
+        comparison = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance, args.min_seconds
+        )
+        report["comparison"] = comparison
+        regressions = [r for r in comparison if r["regression"]]
+        print(f"\n{len(regressions)} of {len(comparison)} timings slower than "
+              f"{args.tolerance}x baseline")
+        for r in regressions:
+            print(f"  {r['case']} {r['model'] or '-'} {r['name']}: "
+                  f"{r['baseline_median_s']:.4f}s -> {r['median_s']:.4f}s ({r['ratio']}x)")
+        exit_code = 1 if regressions else 0
+
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nresults written to {args.output}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Offline synthetic datasets and models for the benchmarks.
+
+Nothing is downloaded: datasets are drawn from a seeded generator and the
+models are small sklearn estimators trained on a sample of the data.
+"""
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from app.utils.feature_encoder import encode_features_for_inference
+
+TARGET = "label"
+SENSITIVE_COLUMNS = ["sex", "group", "age"]
+MODEL_KINDS = ("logreg", "pipeline", "forest")
+
+# rows used to fit the models; prediction cost still scales with the dataset
+TRAIN_ROWS = 20_000
+
+
+def make_dataset(
+    rows: int,
+    numeric_cols: int = 5,
+    categorical_cols: int = 3,
+    n_groups: int = 4,
+    cardinality: int = 20,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Binary-target dataset with a built-in disparity between groups.
+
+    Columns: sex (2 groups), group (n_groups), age (numeric, binned by the
+    audit), num_0.. (float), cat_0.. (cardinality string levels) and label
+    ("yes"/"no", with ~0.5% "unknown" rows the audit drops).
+    """
+    rng = np.random.default_rng(seed)
+
+    data = {
+        "sex": rng.choice(["female", "male"], rows),
+        "group": rng.integers(0, n_groups, rows),
+        "age": rng.integers(18, 90, rows),
+    }
+    for i in range(numeric_cols):
+        data[f"num_{i}"] = rng.normal(0, 1, rows).round(4)
+    for i in range(categorical_cols):
+        data[f"cat_{i}"] = rng.integers(0, cardinality, rows)
+
+    df = pd.DataFrame(data)
+
+    logit = df[[f"num_{i}" for i in range(numeric_cols)]].sum(axis=1) / max(numeric_cols, 1) ** 0.5
+    logit += 0.5 * (df["sex"] == "male") - df["group"] / max(n_groups - 1, 1)
+    positive = rng.random(rows) < 1 / (1 + np.exp(-logit))
+
+    df["group"] = df["group"].map("g{}".format)
+    for i in range(categorical_cols):
+        df[f"cat_{i}"] = df[f"cat_{i}"].map("c{}".format)
+
+    label = np.where(positive, "yes", "no").astype(object)
+    label[rng.random(rows) < 0.005] = "unknown"
+    df[TARGET] = label
+    return df
+
+
+def train_model(df: pd.DataFrame, kind: str, seed: int = 0):
+    """
+    logreg / forest: plain estimators fitted on encode_features_for_inference
+    output (the audit's non-pipeline path). pipeline: OneHotEncoder +
+    StandardScaler + LogisticRegression on raw columns.
+    """
+    train = df[df[TARGET] != "unknown"]
+    train = train.sample(min(len(train), TRAIN_ROWS), random_state=seed)
+    X = train.drop(columns=[TARGET])
+    y = (train[TARGET] == "yes").astype(int)
+
+    if kind == "pipeline":
+        categorical = [c for c in X.columns if not pd.api.types.is_numeric_dtype(X[c])]
+        numeric = [c for c in X.columns if c not in categorical]
+        model = Pipeline(
+            [
+                (
+                    "pre",
+                    ColumnTransformer(
+                        [
+                            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical),
+                            ("num", StandardScaler(), numeric),
+                        ]
+                    ),
+                ),
+                ("clf", LogisticRegression(max_iter=500)),
+            ]
+        )
+        return model.fit(X, y)
+
+    X_encoded = encode_features_for_inference(X)
+    if kind == "logreg":
+        return LogisticRegression(max_iter=500).fit(X_encoded, y)
+    if kind == "forest":
+        return RandomForestClassifier(
+            n_estimators=50, max_depth=8, random_state=seed
+        ).fit(X_encoded, y)
+    raise ValueError(f"Unknown model kind '{kind}', expected one of {MODEL_KINDS}")
+
+
+def write_case(df: pd.DataFrame, models: dict, out_dir: Path) -> tuple[Path, dict]:
+    """Write the dataset CSV and joblib models; returns (csv path, kind -> path)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = out_dir / "dataset.csv"
+    df.to_csv(csv_path, index=False)
+
+    model_paths = {}
+    for kind, model in models.items():
+        model_paths[kind] = out_dir / f"{kind}.joblib"
+        joblib.dump(model, model_paths[kind])
+    return csv_path, model_paths
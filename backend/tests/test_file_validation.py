@@ -0,0 +1,21 @@
+import pandas as pd
+
+from app.config import settings
+from app.utils.file_validation import validate_csv_file
+
+
+def test_nulls_only_in_later_chunks_widen_dtypes(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CSV_CHUNK_ROWS", 50)
+    rows = ["x,flag,label"]
+    for i in range(500):
+        gap = 300 <= i < 400
+        rows.append(f"{'' if gap else i},{'' if gap else bool(i % 2)},{i % 2}")
+    path = tmp_path / "data.csv"
+    path.write_text("\n".join(rows) + "\n")
+
+    dtypes = validate_csv_file(path)["dtypes"]
+
+    assert dtypes == {c: str(t) for c, t in pd.read_csv(path).dtypes.items()}
+    assert dtypes["x"] == "float64"
+    # the typed pass must accept the inferred dtypes
+    pd.read_csv(path, dtype=dtypes)
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from app.config import settings
+from app.services import incremental_audit
+from app.services.audit_state import INTERSECTIONAL_TABLE, group_tables_from_result
+from app.services.bias_service import finalize_audit, intersectional_codes, sensitive_group_codes
+from app.services.incremental_audit import compute_audit_append
+from app.utils.fairness_metrics import group_confusion_counts
+from app.utils.target_encoder import target_labels
+
+SENSITIVE = ["sex", "race"]
+
+
+def _audit(df: pd.DataFrame, model) -> dict:
+    y_true, _, target_info = target_labels(df["label"])
+    y_true = y_true.astype(int)
+    y_pred = model.predict(df[["x"]]).astype(int)
+
+    groups = sensitive_group_codes(df, SENSITIVE, {})
+    tables = {
+        col: (group_confusion_counts(codes, len(labels), y_true, y_pred), labels)
+        for col, (codes, labels) in groups.items()
+    }
+    labels = {col: labels for col, (_, labels) in groups.items()}
+    codes, n_subgroups = intersectional_codes({c: g[0] for c, g in groups.items()}, labels)
+
+    return finalize_audit(
+        tables,
+        positive_rate=float(y_pred.mean()),
+        total_rows=len(df),
+        dataset_health={},
+        target_info=target_info,
+        sensitive_info={
+            col: {"unique_gropus": len(labels[col]), "groups": labels[col]} for col in SENSITIVE
+        },
+        intersectional=(group_confusion_counts(codes, n_subgroups, y_true, y_pred), labels),
+        sensitive_bins={},
+    )
+
+
+def test_append_keeps_intersectional_audit(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_BOOTSTRAP_CI", False)
+    monkeypatch.setattr(settings, "MIN_GROUP_SIZE", 5)
+
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame(
+        {
+            "x": rng.normal(size=n),
+            "sex": rng.choice(["F", "M"], n),
+            "race": rng.choice(["a", "b", "c"], n),
+        }
+    )
+    df["label"] = (df["x"] + rng.normal(size=n) > 0).astype(int)
+    # a subgroup and a race that only appear in the appended rows
+    df.loc[1500:1549, "race"] = "d"
+
+    model = make_pipeline(StandardScaler(), LogisticRegression()).fit(df[["x"]], df["label"])
+    monkeypatch.setattr(incremental_audit, "load_base_model", lambda upload: model)
+
+    base, delta = df.iloc[:1400], df.iloc[1400:]
+    first = _audit(base, model)
+    state = {
+        "target_column": "label",
+        "sensitive_columns": SENSITIVE,
+        "target_info": first["target_info"],
+        "sensitive_info": first["sensitive_attributes"],
+        "dataset_health": {},
+        "group_tables": group_tables_from_result(first),
+        "intersectional": True,
+        "intersectional_table": first[INTERSECTIONAL_TABLE],
+        "total_rows": len(base),
+        "predicted_positives": int(model.predict(base[["x"]]).sum()),
+        "sensitive_bins": {},
+    }
+    path = tmp_path / "delta.csv"
+    delta.to_csv(path, index=False)
+    upload = {"dataset_columns": list(df.columns), "dataset_dtypes": None}
+
+    update = compute_audit_append(upload, state, path)
+
+    full = _audit(df, model)
+    merged = update["result"]["intersectional_audit"]
+    for key in ["dpd", "eod", "dir", "subgroups_observed", "subgroups_audited", "biased"]:
+        assert merged[key] == full["intersectional_audit"][key]
+    assert merged["most_advantaged"] == full["intersectional_audit"]["most_advantaged"]
+    assert update["result"]["bias_severity_score"] == full["bias_severity_score"]
+
+    table = update["intersectional_table"]
+    assert set(table["labels"]["race"]) == {"a", "b", "c", "d"}
+    assert sum(map(sum, table["counts"])) == len(df)
+    assert INTERSECTIONAL_TABLE not in update["result"]
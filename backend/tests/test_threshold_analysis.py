@@ -0,0 +1,51 @@
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from app.utils.threshold_analysis import group_threshold_counts, threshold_grid
+
+
+def brute_force(codes, n_groups, y_true, scores, thresholds):
+    tp = np.zeros((n_groups, len(thresholds)), dtype=np.int64)
+    fp = np.zeros_like(tp)
+    for g in range(n_groups):
+        in_group = codes == g
+        for j, t in enumerate(thresholds):
+            predicted = in_group & (scores >= t)
+            tp[g, j] = np.sum(predicted & (y_true == 1))
+            fp[g, j] = np.sum(predicted & (y_true == 0))
+    return tp, fp
+
+
+def test_grid_aligned_scores_count_the_same_in_every_group():
+    # identical scores k/10 in every group: counts must not depend on the group
+    scores = np.tile(np.arange(11) / 10, 4)
+    codes = np.repeat(np.arange(4), 11)
+    y_true = np.ones(len(scores), dtype=int)
+    thresholds = threshold_grid(101)
+
+    counts = group_threshold_counts(codes, 4, y_true, scores, thresholds)
+    tp, fp = brute_force(codes, 4, y_true, scores, thresholds)
+
+    np.testing.assert_array_equal(counts["tp"], tp)
+    np.testing.assert_array_equal(counts["fp"], fp)
+    assert (counts["tp"] == counts["tp"][0]).all()
+
+
+def test_matches_brute_force_on_tree_scores():
+    # random-forest style scores: multiples of 1/n_trees, many on the grid
+    rng = np.random.default_rng(0)
+    n, n_groups = 5000, 7
+    scores = rng.integers(0, 51, n) / 50
+    codes = rng.integers(0, n_groups, n)
+    y_true = (rng.random(n) < scores).astype(int)
+    thresholds = threshold_grid(101)
+
+    counts = group_threshold_counts(codes, n_groups, y_true, scores, thresholds)
+    tp, fp = brute_force(codes, n_groups, y_true, scores, thresholds)
+
+    np.testing.assert_array_equal(counts["tp"], tp)
+    np.testing.assert_array_equal(counts["fp"], fp)
+    np.testing.assert_array_equal(counts["positives"], np.bincount(codes, weights=y_true, minlength=n_groups))
+    for g in range(n_groups):
+        in_group = codes == g
+        assert np.isclose(counts["auc"][g], roc_auc_score(y_true[in_group], scores[in_group]))
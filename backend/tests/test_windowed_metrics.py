@@ -0,0 +1,21 @@
+import numpy as np
+
+from app.utils.windowed_metrics import window_fairness_metrics
+
+
+def test_small_groups_are_skipped():
+    # [tn, fp, fn, tp] per group; window 0 has one large and two tiny groups
+    counts = np.array(
+        [
+            [[20, 20, 0, 0], [0, 3, 0, 0], [2, 0, 0, 0]],
+            [[20, 20, 0, 0], [30, 10, 0, 0], [2, 0, 0, 0]],
+        ]
+    )
+
+    metrics = window_fairness_metrics(counts, min_group_size=30)
+
+    assert np.isnan(metrics["dpd"][0]) and np.isnan(metrics["dir"][0])
+    assert metrics["dpd"][1] == 0.5 - 0.25
+    assert metrics["groups_skipped"].tolist() == [2, 1]
+    # without a minimum every observed group is compared
+    assert window_fairness_metrics(counts)["dpd"][0] == 1.0